@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+class AgentPool:
+    """
+    Pool of ready-to-use specialist agent wrappers keyed by agent class.
+
+    Agents carry heavy state (instructions, knowledge base handle, model
+    client), so request paths borrow an existing instance instead of
+    constructing a new one. A new instance is only built when every pooled
+    instance of that class is in use.
+
+    Concurrency control:
+    - One asyncio.Semaphore per model provider (OpenAI, Anthropic, ...)
+    - Bounds in-flight calls to respect provider rate limits
+    - Limit configurable via AGENT_POOL_MAX_CONCURRENCY
+
+    Usage:
+        async with agent_pool.acquire(NutritionAgent) as nutrition:
+            await nutrition.agent.arun(prompt)
+    """
+
+    def __init__(self, max_concurrency_per_provider: int = 16):
+        self.max_concurrency_per_provider = max_concurrency_per_provider
+        self._idle: Dict[type, List[Any]] = defaultdict(list)
+        self._factories: Dict[type, Callable[[], Any]] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def register(self, instance: Any):
+        """
+        Add an existing agent wrapper to the pool
+        """
+        self._idle[type(instance)].append(instance)
+
+    def set_factory(self, agent_cls: type, factory: Callable[[], Any]):
+        """
+        Configure how new instances are built for classes that need constructor arguments
+        """
+        self._factories[agent_cls] = factory
+
+    def prewarm(self, min_idle: int = 1):
+        """
+        Build instances ahead of time so every known agent class has at least `min_idle` idle
+        """
+        for agent_cls in set(self._idle) | set(self._factories):
+            while len(self._idle[agent_cls]) < min_idle:
+                self._idle[agent_cls].append(self._build(agent_cls))
+
+    @asynccontextmanager
+    async def acquire(self, agent_cls: type):
+        """
+        Borrow an agent instance, waiting for a free provider slot
+        """
+        idle = self._idle[agent_cls]
+        instance = idle.pop() if idle else self._build(agent_cls)
+
+        try:
+            async with self._semaphore_for(instance):
+                yield instance
+        finally:
+            self.release(instance)
+
+    def release(self, instance: Any):
+        """
+        Return an agent instance to the pool
+        """
+        self._idle[type(instance)].append(instance)
+
+    def _build(self, agent_cls: type) -> Any:
+        logger.debug(f"Building new pooled instance of {agent_cls.__name__}")
+        factory = self._factories.get(agent_cls, agent_cls)
+        return factory()
+
+    def _semaphore_for(self, instance: Any) -> asyncio.Semaphore:
+        provider = getattr(instance.agent.model, "provider", None) or "default"
+        if provider not in self._semaphores:
+            self._semaphores[provider] = asyncio.Semaphore(self.max_concurrency_per_provider)
+        return self._semaphores[provider]
+
+# Global agent pool instance
+agent_pool = AgentPool(int(os.getenv("AGENT_POOL_MAX_CONCURRENCY", "16")))
@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+
+from agents.specialized.onboarding import OnboardingAgent
+from agents.specialized.data_sync import DataSyncAgent
+from agents.specialized.training_planner import TrainingPlannerAgent
+from agents.specialized.training_analyzer import TrainingAnalyzerAgent
+from agents.specialized.health_analyzer import HealthAnalyzerAgent
+from agents.specialized.recovery import RecoveryAgent
+from agents.specialized.nutrition import NutritionAgent
+from agents.specialized.goal_manager import GoalManagerAgent
+
+@dataclass
+class AgentRegistry:
+    """
+    One instance of every specialized agent, shared by the teams and workflows.
+
+    Agents carry model clients, tools and prompts; building the registry once
+    per process and injecting it keeps teams from constructing duplicates.
+    """
+
+    onboarding: OnboardingAgent
+    data_sync: DataSyncAgent
+    training_planner: TrainingPlannerAgent
+    training_analyzer: TrainingAnalyzerAgent
+    health_analyzer: HealthAnalyzerAgent
+    recovery: RecoveryAgent
+    nutrition: NutritionAgent
+    goal_manager: GoalManagerAgent
+
+    @classmethod
+    def build(cls, knowledge_base=None) -> "AgentRegistry":
+        return cls(
+            onboarding=OnboardingAgent(),
+            data_sync=DataSyncAgent(),
+            training_planner=TrainingPlannerAgent(knowledge_base),
+            training_analyzer=TrainingAnalyzerAgent(knowledge_base),
+            health_analyzer=HealthAnalyzerAgent(),
+            recovery=RecoveryAgent(),
+            nutrition=NutritionAgent(),
+            goal_manager=GoalManagerAgent()
+        )
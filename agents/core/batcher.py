@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Matches the "N) " prefix that starts each answer in a batched reply
+_ITEM_PATTERN = re.compile(r"^\s*(\d+)\)\s*", re.MULTILINE)
+
+class BatchCoordinator:
+    """
+    Micro-batching facade in front of a single specialist agent.
+
+    Queries submitted within a short window are row-marshaled into one
+    numbered prompt and sent as a single LLM call. The reply is split back
+    into items by index and each caller's future is resolved with its own
+    answer.
+
+    Batching behaviour:
+    - Flushes when `max_batch` queries are queued
+    - Flushes after `max_wait_ms` even if the batch is not full
+    - Single-query batches are sent unchanged (no numbering overhead)
+    - Items missing from a batched reply fail only their own caller
+
+    Best suited for short classification-style prompts where the per-call
+    overhead dominates the generation time.
+    """
+
+    def __init__(self, agent, max_batch: int = 8, max_wait_ms: float = 30.0):
+        self.agent = agent
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, prompt: str) -> str:
+        """
+        Queue a prompt for the next batch and wait for its individual answer
+        """
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((prompt, future))
+        return await future
+
+    async def close(self):
+        """
+        Stop the background flush task
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[str, asyncio.Future]]):
+        prompts = [prompt for prompt, _ in batch]
+        futures = [future for _, future in batch]
+
+        try:
+            if len(batch) == 1:
+                response = await self.agent.arun(prompts[0])
+                answers = {1: response.content}
+            else:
+                response = await self.agent.arun(self._compose(prompts))
+                answers = self._split(response.content)
+        except Exception as e:
+            logger.error(f"Batched call failed for {len(batch)} queries: {e}")
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for index, future in enumerate(futures, start=1):
+            if future.done():
+                continue
+            if index in answers:
+                future.set_result(answers[index])
+            else:
+                future.set_exception(LookupError(f"No answer for item {index} in batched reply"))
+
+    @staticmethod
+    def _compose(prompts: List[str]) -> str:
+        items = "\n".join(f"{i}) {prompt}" for i, prompt in enumerate(prompts, start=1))
+        return (
+            "Answer each numbered item independently. Start every answer on a new line "
+            "with the same number followed by ')'.\n"
+            f"{items}\n"
+        )
+
+    @staticmethod
+    def _split(content: str) -> Dict[int, str]:
+        matches = list(_ITEM_PATTERN.finditer(content or ""))
+        answers = {}
+        for current, following in zip(matches, matches[1:] + [None]):
+            end = following.start() if following else len(content)
+            answers[int(current.group(1))] = content[current.end():end].strip()
+        return answers
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into one in-flight task.
+
+    The first caller for a key starts the work; callers arriving with the
+    same key before it finishes await the same result instead of issuing
+    their own provider requests. Nothing is kept after completion, so later
+    calls always run fresh. A caller that is cancelled does not cancel the
+    shared task for the others.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def run(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
@@ -1,6 +1,56 @@
+import asyncio
+import json
+import logging
+import os
+import re
+from datetime import date
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
-from agno.models.anthropic import Claude
+from pydantic import BaseModel, Field
+
+from agents.core.agent_pool import AgentPool, agent_pool
+from agents.core.history import HISTORY_RUNS, get_summary_manager
+from agents.core.model_registry import get_model
+from agents.core.outputs import SpecialistReport
+from agents.core.prompts import COORDINATOR_INSTRUCTIONS, ROUTER_INSTRUCTIONS
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for a single specialist call so one slow branch cannot stall the aggregate
+SPECIALIST_TIMEOUT_SECONDS = float(os.getenv("SPECIALIST_TIMEOUT_SECONDS", "30"))
+
+# Unambiguous intents that map 1:1 to a specialist and don't need an LLM routing call
+INTENT_PATTERNS = {
+    "data_sync": re.compile(r"\b(sync|synchroni[sz]e|garmin|connect my (watch|device))\b", re.IGNORECASE),
+    "nutrition": re.compile(r"\b(breakfast|lunch|dinner|snack|meal|calories|protein|carbs|diet|nutrition)\b", re.IGNORECASE),
+    "health_analyzer": re.compile(r"\b(sleep|slept|hrv|heart rate variability|stress|resting heart rate)\b", re.IGNORECASE),
+    "recovery": re.compile(r"\b(recover|recovery|rest day|sore|soreness|foam roll)\w*\b", re.IGNORECASE),
+    "training_planner": re.compile(r"\b(training plan|plan my|schedule my|workout plan)\b", re.IGNORECASE),
+    "training_analyzer": re.compile(r"\b(how did my|analy[sz]e my) (run|ride|swim|workout|session)\b", re.IGNORECASE),
+    "goal_manager": re.compile(r"\b(goal|goals|milestone|my progress)\b", re.IGNORECASE),
+    "onboarding": re.compile(r"\b(get started|getting started|set up my profile|i'm new|i am new)\b", re.IGNORECASE),
+}
+
+def match_intents(user_input: str) -> List[str]:
+    """
+    Return every specialist whose intent pattern matches, in INTENT_PATTERNS order
+    """
+    return [name for name, pattern in INTENT_PATTERNS.items() if pattern.search(user_input)]
+
+def match_intent(user_input: str) -> Optional[str]:
+    """
+    Return the single specialist whose intent pattern matches, or None if zero or several match
+    """
+    matches = match_intents(user_input)
+    return matches[0] if len(matches) == 1 else None
+
+class RoutingDecision(BaseModel):
+    """
+    Structured routing output produced by the lightweight router model
+    """
+    agents: List[str] = Field(default_factory=list)
+    prompts: Dict[str, str] = Field(default_factory=dict)
 
 class CoordinatorAgent:
     """
@@ -16,46 +66,238 @@ class CoordinatorAgent:
     - Response aggregation and formatting
     - Session management and context preservation
     - Error handling and graceful degradation
+
+    Specialists selected by routing are dispatched concurrently, so the
+    latency of a multi-agent query is bounded by the slowest specialist
+    rather than the sum of all of them.
+
+    Routing is classified by a small, fast model. Specialists return
+    structured reports that are rendered to markdown deterministically; the
+    expensive model is only used to merge answers that came back as free text.
     """
 
-    def __init__(self):
+    def __init__(self, specialists: Optional[Dict[str, Any]] = None, pool: Optional[AgentPool] = None):
+        # Specialist wrappers keyed by agent name (see ModelConfig.AGENT_MODELS)
+        self.specialists = specialists or {}
+
+        # Specialists are borrowed from the pool so concurrent queries don't share one instance
+        self.pool = pool or agent_pool
+        for specialist in self.specialists.values():
+            self.pool.register(specialist)
+
         self.agent = Agent(
             name="Health Coach Coordinator",
-            model=Claude(id="claude-3-5-sonnet-20241022"),
+            model=get_model("anthropic", "claude-3-5-sonnet-20241022"),
             description="Main orchestrator for health coaching system",
-            instructions="""
-            You are the main coordinator for a comprehensive health coaching system.
-            Your role is to:
-            1. Understand user intent and route to appropriate specialized agents
-            2. Provide cohesive responses that integrate multiple agent outputs
-            3. Maintain conversation context and user state
-            4. Ensure smooth user experience across all interactions
-
-            Available specialized agents:
-            - Onboarding: New user setup and profile creation
-            - Data Sync: Garmin data integration and synchronization
-            - Training Planner: Personalized workout plan creation
-            - Training Analyzer: Post-workout analysis and insights
-            - Health Analyzer: Health metrics monitoring (HRV, sleep, stress)
-            - Recovery: Rest and recovery management
-            - Nutrition: Dietary advice and meal planning
-            - Goal Manager: Progress tracking and goal adjustment
-            """,
+            instructions=COORDINATOR_INSTRUCTIONS,
             add_history_to_context=True,
-            add_datetime_to_context=True,
+            num_history_runs=HISTORY_RUNS,
+            enable_session_summaries=True,
+            add_session_summary_to_context=True,
+            session_summary_manager=get_summary_manager(),
             markdown=True
         )
 
-    async def route_query(self, user_input: str, user_context: dict):
+        # Cheap classifier used only for routing decisions
+        self.router = Agent(
+            name="Health Coach Router",
+            model=get_model("openai", "gpt-4o-mini"),
+            description="Intent classifier that selects specialist agents",
+            instructions=ROUTER_INSTRUCTIONS,
+            output_schema=RoutingDecision,
+            use_json_mode=True
+        )
+
+    async def handle_query(self, user_input: str, user_context: dict):
+        """
+        Route a query, run the selected specialists concurrently and
+        aggregate their answers into a single response
+        """
+        speculative = self._speculate(user_input)
+        try:
+            plan = await self.route_query(user_input, user_context)
+        except BaseException:
+            if speculative is not None:
+                speculative[1].cancel()
+            raise
+
+        # The speculative call answers the raw input; drop it unless the router sends
+        # that specialist the same prompt (routed prompts may be rewritten)
+        if speculative is not None and plan.get(speculative[0]) != user_input:
+            speculative[1].cancel()
+            speculative = None
+
+        # No specialist fits (small talk, general questions, unparseable routing): answer directly
+        if not plan:
+            response = await self.agent.arun(user_input)
+            return response.content
+
+        agent_responses = await self._dispatch(plan, speculative)
+        return await self.coordinate_response(agent_responses)
+
+    def _speculate(self, user_input: str) -> Optional[Tuple[str, asyncio.Task]]:
+        """
+        Start the most likely specialist while the router is still classifying
+        Only used when several intents match; a single match skips the router entirely
+        """
+        matches = [name for name in match_intents(user_input) if name in self.specialists]
+        if len(matches) < 2:
+            return None
+
+        # At most one speculative call per query to bound wasted tokens
+        name = matches[0]
+        task = asyncio.create_task(
+            asyncio.wait_for(self._run_specialist(name, user_input), timeout=SPECIALIST_TIMEOUT_SECONDS)
+        )
+        return name, task
+
+    async def stream_query(self, user_input: str, user_context: dict) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Stream specialist output as it is generated
+        Yields (agent_name, chunk) pairs from whichever specialist produces tokens first
+        """
+        plan = await self.route_query(user_input, user_context)
+        if not plan:
+            response = await self.agent.arun(user_input)
+            yield "coordinator", response.content
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        tasks = [
+            asyncio.create_task(self._stream_specialist(name, prompt, queue))
+            for name, prompt in plan.items()
+        ]
+
+        try:
+            remaining = len(tasks)
+            while remaining:
+                name, chunk = await queue.get()
+                if chunk is None:
+                    remaining -= 1
+                    continue
+                yield name, chunk
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _stream_specialist(self, name: str, prompt: str, queue: asyncio.Queue):
+        async def forward():
+            async with self.pool.acquire(type(self.specialists[name])) as specialist:
+                await self._prepare(specialist)
+                async for event in specialist.agent.arun(prompt, stream=True):
+                    content = getattr(event, "content", None)
+                    if content:
+                        await queue.put((name, self._render(content)))
+
+        try:
+            await asyncio.wait_for(forward(), timeout=SPECIALIST_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.error(f"Specialist '{name}' stream failed: {e!r}")
+        finally:
+            # None marks the end of this specialist's stream
+            await queue.put((name, None))
+
+    async def route_query(self, user_input: str, user_context: dict) -> Dict[str, str]:
         """
         Analyze user input and determine which agents to engage
-        Returns routing decisions and coordination strategy
+        Returns routing decisions as a mapping of agent name to the prompt it should receive
         """
-        pass
+        # Deterministic fast path: skip the router call when exactly one intent matches
+        intent = match_intent(user_input)
+        if intent in self.specialists:
+            return {intent: user_input}
+
+        routing_prompt = (
+            f"User context: {json.dumps(user_context or {}, default=str)}\n"
+            f"User query: {user_input}"
+        )
+
+        try:
+            response = await self.router.arun(routing_prompt)
+            decision = response.content
+            if not isinstance(decision, RoutingDecision):
+                decision = RoutingDecision.model_validate_json(decision)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Could not parse routing decision, falling back to coordinator: {e}")
+            decision = RoutingDecision()
+
+        return {
+            name: decision.prompts.get(name, user_input)
+            for name in decision.agents
+            if name in self.specialists
+        }
+
+    async def _dispatch(
+        self, plan: Dict[str, str], speculative: Optional[Tuple[str, asyncio.Task]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run every routed specialist concurrently
+        Failed or timed-out specialists are returned as exceptions instead of aborting the batch
+        A speculative call already in flight for the same prompt is reused instead of being started again
+        """
+        names = list(plan)
+        calls = []
+        for name in names:
+            if speculative is not None and speculative[0] == name:
+                calls.append(speculative[1])
+            else:
+                calls.append(
+                    asyncio.wait_for(self._run_specialist(name, plan[name]), timeout=SPECIALIST_TIMEOUT_SECONDS)
+                )
+
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        return dict(zip(names, results))
+
+    async def _run_specialist(self, name: str, prompt: str):
+        async with self.pool.acquire(type(self.specialists[name])) as specialist:
+            await self._prepare(specialist)
+            response = await specialist.agent.arun(prompt)
+
+        metrics = getattr(response, "metrics", None)
+        logger.debug(f"Specialist '{name}' prompt cache read tokens: {getattr(metrics, 'cache_read_tokens', None)}")
+        return response
+
+    @staticmethod
+    async def _prepare(specialist):
+        # Knowledge-backed specialists open their vector index lazily
+        ensure_knowledge = getattr(specialist, "ensure_knowledge", None)
+        if ensure_knowledge is not None:
+            await ensure_knowledge()
 
     async def coordinate_response(self, agent_responses: dict):
         """
         Aggregate and format responses from multiple agents
         Ensure coherent and helpful final response
         """
-        pass
\ No newline at end of file
+        answers: Dict[str, Any] = {}
+        for name, response in agent_responses.items():
+            if isinstance(response, BaseException):
+                logger.error(f"Specialist '{name}' failed: {response!r}")
+                continue
+            answers[name] = response.content
+
+        # Only reached when specialists were dispatched and every one of them failed
+        if not answers:
+            response = await self.agent.arun(
+                "None of the specialists could answer. Apologise briefly and ask the user to rephrase."
+            )
+            return response.content
+
+        # Structured reports (or a single answer) are composed without another LLM call
+        if len(answers) == 1 or all(isinstance(a, SpecialistReport) for a in answers.values()):
+            return "\n\n".join(self._render(answer) for answer in answers.values())
+
+        # The date goes into the user turn rather than the system message to keep the prefix cacheable
+        sections = [f"[{name}]\n{self._render(answer)}" for name, answer in answers.items()]
+        response = await self.agent.arun(
+            f"Today is {date.today().isoformat()}.\n"
+            "Combine the following specialist answers into one coherent reply for the user:\n\n"
+            + "\n\n".join(sections)
+        )
+        return response.content
+
+    @staticmethod
+    def _render(content: Any) -> str:
+        if isinstance(content, SpecialistReport):
+            return content.to_markdown()
+        return str(content)
@@ -0,0 +1,255 @@
+"""
+Persistent embedding cache for the knowledge base.
+
+Knowledge sources are re-added on every start, and without a cache each
+chunk is sent to the embeddings API again even though its text has not
+changed. Vectors are stored in SQLite keyed by SHA-256 of (model id, text),
+so unchanged chunks never leave the process.
+
+Vectors are kept int8-quantized with one scale per vector (1 byte per
+dimension instead of 4), both on disk and in the in-memory LRU, and are
+dequantized to float32 on the way out. For unit-length embeddings the
+cosine error is far below the gap between relevant and irrelevant chunks.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from agno.knowledge.embedder.openai import OpenAIEmbedder
+
+logger = logging.getLogger(__name__)
+
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", "./data/embed_cache.db")
+
+# Concurrent async cache misses arriving within this window share one embeddings request
+EMBED_BATCH_WAIT_MS = float(os.getenv("EMBED_BATCH_WAIT_MS", "20"))
+
+# Recently used vectors kept in memory; repeated chat queries skip the SQLite read too
+EMBED_HOT_CACHE_SIZE = int(os.getenv("EMBED_HOT_CACHE_SIZE", "4096"))
+
+class EmbeddingCache:
+    """
+    SQLite-backed map of content hash -> int8-quantized vector, fronted by an in-memory LRU
+    """
+
+    def __init__(self, path: str = EMBED_CACHE_PATH, hot_size: int = EMBED_HOT_CACHE_SIZE):
+        self.path = path
+        self.hot_size = hot_size
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._hot: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS embedding_cache_int8 "
+                "(key TEXT PRIMARY KEY, scale REAL NOT NULL, vec BLOB NOT NULL)"
+            )
+        return self._connection
+
+    @staticmethod
+    def _quantize(vector: List[float]) -> Tuple[float, bytes]:
+        values = np.asarray(vector, dtype=np.float32)
+        scale = float(np.abs(values).max()) or 1.0
+        return scale, np.round(values / scale * 127).astype(np.int8).tobytes()
+
+    @staticmethod
+    def _dequantize(scale: float, data: bytes) -> List[float]:
+        return (np.frombuffer(data, dtype=np.int8).astype(np.float32) * (scale / 127)).tolist()
+
+    @staticmethod
+    def _generate_cache_key(model_id: str, text: str) -> str:
+        return hashlib.sha256(f"{model_id}|{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """
+        Cached vectors for the given keys; missing keys are absent from the result
+        """
+        found: Dict[str, Tuple[float, bytes]] = {}
+        with self._lock:
+            for key in keys:
+                entry = self._hot.get(key)
+                if entry is not None:
+                    self._hot.move_to_end(key)
+                    found[key] = entry
+
+            cold = [key for key in keys if key not in found]
+            if cold:
+                placeholders = ",".join("?" * len(cold))
+                rows = self._connect().execute(
+                    f"SELECT key, scale, vec FROM embedding_cache_int8 WHERE key IN ({placeholders})", cold
+                ).fetchall()
+                loaded = {key: (scale, vec) for key, scale, vec in rows}
+                self._remember(loaded)
+                found.update(loaded)
+        return {key: self._dequantize(*entry) for key, entry in found.items()}
+
+    def set_many(self, items: Dict[str, List[float]]):
+        if not items:
+            return
+        quantized = {key: self._quantize(vector) for key, vector in items.items()}
+        rows = [(key, scale, data) for key, (scale, data) in quantized.items()]
+        with self._lock:
+            connection = self._connect()
+            connection.executemany(
+                "INSERT OR REPLACE INTO embedding_cache_int8 (key, scale, vec) VALUES (?, ?, ?)", rows
+            )
+            connection.commit()
+            self._remember(quantized)
+
+    def _remember(self, entries: Dict[str, Tuple[float, bytes]]):
+        # Caller holds self._lock
+        for key, entry in entries.items():
+            self._hot[key] = entry
+            self._hot.move_to_end(key)
+        while len(self._hot) > self.hot_size:
+            self._hot.popitem(last=False)
+
+    def find_uncached_texts(self, model_id: str, texts: List[str]) -> Tuple[List[str], Dict[str, List[float]]]:
+        """
+        Split texts into cache keys and the vectors already cached for them
+        """
+        keys = [self._generate_cache_key(model_id, text) for text in texts]
+        return keys, self.get_many(list(set(keys)))
+
+embedding_cache = EmbeddingCache()
+
+class _MissBatcher:
+    """
+    Merges the cache misses of concurrent async callers into one API request.
+
+    Knowledge sources are added concurrently and each embeds its own chunks;
+    this turns those parallel requests into a single input=[...] call.
+    """
+
+    def __init__(self, embed_batch, max_inputs: int, max_wait_ms: float = EMBED_BATCH_WAIT_MS):
+        self.embed_batch = embed_batch
+        self.max_inputs = max_inputs
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    async def embed(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((texts, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+
+            while size < self.max_inputs:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[List[str], asyncio.Future]]):
+        texts = [text for request_texts, _ in batch for text in request_texts]
+        try:
+            embeddings, usages = await self.embed_batch(texts)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        start = 0
+        for request_texts, future in batch:
+            end = start + len(request_texts)
+            if not future.done():
+                future.set_result((embeddings[start:end], usages[start:end]))
+            start = end
+
+class CachedOpenAIEmbedder(OpenAIEmbedder):
+    """
+    OpenAIEmbedder that answers from the persistent cache and only sends misses to the API.
+
+    Usage is reported as None for cache hits since no tokens were billed.
+    """
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        key = embedding_cache._generate_cache_key(self.id, text)
+        cached = embedding_cache.get_many([key])
+        if key in cached:
+            return cached[key], None
+
+        embedding, usage = super().get_embedding_and_usage(text)
+        if embedding:
+            embedding_cache.set_many({key: embedding})
+        return embedding, usage
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embedding_and_usage(text)[0]
+
+    async def async_get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        key = embedding_cache._generate_cache_key(self.id, text)
+        cached = embedding_cache.get_many([key])
+        if key in cached:
+            return cached[key], None
+
+        embedding, usage = await super().async_get_embedding_and_usage(text)
+        if embedding:
+            embedding_cache.set_many({key: embedding})
+        return embedding, usage
+
+    async def async_get_embedding(self, text: str) -> List[float]:
+        return (await self.async_get_embedding_and_usage(text))[0]
+
+    def get_embeddings_batch_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        keys, cached = embedding_cache.find_uncached_texts(self.id, texts)
+        misses = [i for i, key in enumerate(keys) if key not in cached]
+        if misses:
+            embeddings, usages = super().get_embeddings_batch_and_usage([texts[i] for i in misses])
+            self._store_misses(keys, misses, embeddings, cached)
+        return self._assemble(keys, misses, cached, usages if misses else [])
+
+    async def async_get_embeddings_batch_and_usage(
+        self, texts: List[str]
+    ) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        keys, cached = embedding_cache.find_uncached_texts(self.id, texts)
+        misses = [i for i, key in enumerate(keys) if key not in cached]
+        if misses:
+            embeddings, usages = await self._miss_batcher().embed([texts[i] for i in misses])
+            self._store_misses(keys, misses, embeddings, cached)
+        return self._assemble(keys, misses, cached, usages if misses else [])
+
+    def _miss_batcher(self) -> _MissBatcher:
+        batcher = self.__dict__.get("_batcher")
+        if batcher is None:
+            # Bound to the parent implementation so batched misses go straight to the API
+            batcher = _MissBatcher(super().async_get_embeddings_batch_and_usage, self.batch_size)
+            self.__dict__["_batcher"] = batcher
+        return batcher
+
+    @staticmethod
+    def _store_misses(keys: List[str], misses: List[int], embeddings: List[List[float]], cached: Dict):
+        fresh = {keys[i]: embedding for i, embedding in zip(misses, embeddings) if embedding}
+        embedding_cache.set_many(fresh)
+        cached.update(fresh)
+
+    @staticmethod
+    def _assemble(keys: List[str], misses: List[int], cached: Dict, usages: List) -> Tuple[List[List[float]], List]:
+        usage_by_index = dict(zip(misses, usages))
+        return [cached.get(key, []) for key in keys], [usage_by_index.get(i) for i in range(len(keys))]
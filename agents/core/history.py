@@ -0,0 +1,25 @@
+"""
+Conversation history limits shared by every agent.
+
+Agents only replay the last HISTORY_RUNS runs verbatim, so the prompt size
+stops growing with session length. The coordinator, which owns the
+conversation, also keeps a rolling session summary of older turns produced
+by a cheap model.
+"""
+
+import functools
+import os
+
+from agno.session.summary import SessionSummaryManager
+
+from agents.core.model_registry import get_model
+
+# Number of previous runs replayed verbatim into each agent call
+HISTORY_RUNS = int(os.getenv("AGENT_HISTORY_RUNS", "3"))
+
+@functools.lru_cache(maxsize=None)
+def get_summary_manager() -> SessionSummaryManager:
+    """
+    Shared session summarizer backed by a small, fast model
+    """
+    return SessionSummaryManager(model=get_model("openai", "gpt-4o-mini"))
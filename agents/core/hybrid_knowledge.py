@@ -0,0 +1,162 @@
+"""
+Hybrid knowledge retrieval: LanceDB for vectors, SQLite FTS5 for keywords.
+
+The keyword leg runs BM25 over an inverted index kept in SQLite next to the
+vector table, and both ranked lists are merged with reciprocal rank fusion.
+The FTS index is rebuilt from the LanceDB table whenever the knowledge
+manifest digest it was built for changes, so LanceDB stays the single source
+of truth even when a re-ingested document keeps its chunk count.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from agno.knowledge.document import Document
+from agno.knowledge.knowledge import Knowledge
+
+logger = logging.getLogger(__name__)
+
+KEYWORD_INDEX_PATH = os.getenv("KNOWLEDGE_KEYWORD_INDEX_PATH", "./data/knowledge_fts.db")
+
+# Standard RRF damping constant; larger values flatten the weight of top ranks
+RRF_K = 60
+
+# Candidates fetched from each leg per requested result
+CANDIDATE_FACTOR = 5
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+class KeywordIndex:
+    """
+    BM25 keyword search over knowledge chunks (SQLite FTS5)
+    """
+
+    def __init__(self, path: str = KEYWORD_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_fts USING fts5("
+                "content, name UNINDEXED, meta_data UNINDEXED, tokenize = 'porter unicode61')"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS knowledge_fts_source (id INTEGER PRIMARY KEY, digest TEXT)"
+            )
+        return self._connection
+
+    def manifest_digest(self) -> Optional[str]:
+        """
+        Knowledge manifest digest the current contents were built for, if any
+        """
+        with self._lock:
+            row = self._connect().execute("SELECT digest FROM knowledge_fts_source WHERE id = 1").fetchone()
+        return row[0] if row else None
+
+    def rebuild(self, rows: List[Tuple[str, Optional[str], str]], manifest_digest: Optional[str] = None):
+        """
+        Replace the index contents with (content, name, meta_data JSON) rows built for `manifest_digest`
+        """
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM knowledge_fts")
+                connection.executemany("INSERT INTO knowledge_fts (content, name, meta_data) VALUES (?, ?, ?)", rows)
+                connection.execute("INSERT INTO knowledge_fts (knowledge_fts) VALUES ('optimize')")
+                connection.execute("INSERT OR REPLACE INTO knowledge_fts_source (id, digest) VALUES (1, ?)", (manifest_digest,))
+
+    def search(self, query: str, limit: int) -> List[Document]:
+        # Quote every term so user punctuation can't be parsed as FTS5 syntax
+        terms = _TOKEN_RE.findall(query)
+        if not terms:
+            return []
+        match = " OR ".join(f'"{term}"' for term in terms)
+
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT content, name, meta_data FROM knowledge_fts WHERE knowledge_fts MATCH ? "
+                "ORDER BY bm25(knowledge_fts) LIMIT ?",
+                (match, limit)
+            ).fetchall()
+        return [Document(content=content, name=name, meta_data=json.loads(meta_data or "{}")) for content, name, meta_data in rows]
+
+keyword_index = KeywordIndex()
+
+def reciprocal_rank_fusion(*ranked_lists: List[Document], k: int = RRF_K) -> List[Document]:
+    """
+    Merge ranked document lists by sum of 1 / (k + rank), deduplicated by content
+    """
+    scores: Dict[str, float] = {}
+    documents: Dict[str, Document] = {}
+    for ranked in ranked_lists:
+        for rank, document in enumerate(ranked, start=1):
+            scores[document.content] = scores.get(document.content, 0.0) + 1.0 / (k + rank)
+            documents.setdefault(document.content, document)
+    return [documents[content] for content in sorted(scores, key=scores.get, reverse=True)]
+
+class HybridKnowledge(Knowledge):
+    """
+    Knowledge base whose searches fuse LanceDB vector hits with FTS5 keyword hits.
+
+    Configure the LanceDb with SearchType.vector; the keyword leg replaces
+    LanceDB's own full-text search. Searches with metadata filters use the
+    vector leg only, since the keyword index doesn't store filterable fields.
+    """
+
+    def sync_keyword_index(self, manifest_digest: Optional[str] = None):
+        """
+        Rebuild the keyword index from the vector table unless it was built for `manifest_digest` (blocking)
+
+        A None digest (sources only partly loaded) always rebuilds.
+        """
+        table = getattr(self.vector_db, "table", None)
+        if table is None:
+            return
+        if manifest_digest is not None and keyword_index.manifest_digest() == manifest_digest:
+            return
+
+        rows = []
+        for record in table.to_arrow().select(["payload"]).to_pylist():
+            payload = json.loads(record["payload"])
+            rows.append((payload.get("content", ""), payload.get("name"), json.dumps(payload.get("meta_data") or {})))
+        keyword_index.rebuild(rows, manifest_digest)
+        logger.info(f"Rebuilt keyword index over {len(rows)} knowledge chunks")
+
+    def _candidates(self, max_results: Optional[int]) -> Tuple[int, int]:
+        limit = max_results or self.max_results
+        return limit, limit * CANDIDATE_FACTOR
+
+    def search(
+        self, query: str, max_results: Optional[int] = None, filters: Optional[Dict[str, Any]] = None, **kwargs
+    ) -> List[Document]:
+        limit, candidates = self._candidates(max_results)
+        vector_hits = super().search(query, max_results=candidates, filters=filters, **kwargs)
+        if filters:
+            return vector_hits[:limit]
+
+        keyword_hits = keyword_index.search(query, candidates)
+        return reciprocal_rank_fusion(vector_hits, keyword_hits)[:limit]
+
+    async def async_search(
+        self, query: str, max_results: Optional[int] = None, filters: Optional[Dict[str, Any]] = None, **kwargs
+    ) -> List[Document]:
+        limit, candidates = self._candidates(max_results)
+        if filters:
+            vector_hits = await super().async_search(query, max_results=candidates, filters=filters, **kwargs)
+            return vector_hits[:limit]
+
+        vector_hits, keyword_hits = await asyncio.gather(
+            super().async_search(query, max_results=candidates, filters=filters, **kwargs),
+            asyncio.to_thread(keyword_index.search, query, candidates)
+        )
+        return reciprocal_rank_fusion(vector_hits, keyword_hits)[:limit]
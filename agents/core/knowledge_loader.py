@@ -0,0 +1,179 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Documents placed here are added to the coaching knowledge base at startup
+KNOWLEDGE_SOURCES_DIR = Path(os.getenv("KNOWLEDGE_SOURCES_DIR", "./data/knowledge_sources"))
+
+# SHA-256 of every source at the last successful load; unchanged sources are not re-added
+KNOWLEDGE_MANIFEST_PATH = Path(os.getenv("KNOWLEDGE_MANIFEST_PATH", "./data/knowledge/.manifest.json"))
+
+# Below this many chunks an exhaustive (flat) scan is fast and exact, so no ANN index is built
+ANN_INDEX_MIN_ROWS = int(os.getenv("KNOWLEDGE_ANN_MIN_ROWS", "10000"))
+HNSW_M = int(os.getenv("KNOWLEDGE_HNSW_M", "24"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("KNOWLEDGE_HNSW_EF_CONSTRUCTION", "128"))
+
+def discover_knowledge_sources(directory: Path = KNOWLEDGE_SOURCES_DIR) -> List[Dict]:
+    """
+    One source per file in the knowledge sources directory, named after the file
+    """
+    if not directory.is_dir():
+        return []
+    return [{"name": path.stem, "path": path} for path in sorted(directory.iterdir()) if path.is_file()]
+
+def source_digests(sources: List[Dict]) -> Dict[str, str]:
+    """
+    SHA-256 of each source file, keyed by source name
+    """
+    digests = {}
+    for source in sources:
+        digest = hashlib.sha256()
+        with open(source["path"], "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        digests[source["name"]] = digest.hexdigest()
+    return digests
+
+def manifest_digest(digests: Dict[str, str]) -> str:
+    """
+    Single digest of a manifest; derived indexes record it to detect content changes
+    """
+    return hashlib.sha256(json.dumps(digests, sort_keys=True).encode("utf-8")).hexdigest()
+
+def read_manifest(path: Path = KNOWLEDGE_MANIFEST_PATH) -> Dict[str, str]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+def write_manifest(digests: Dict[str, str], path: Path = KNOWLEDGE_MANIFEST_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(digests, indent=2, sort_keys=True))
+
+async def load_knowledge_sources(
+    knowledge_base, sources: Optional[List[Dict]] = None, force: bool = False
+) -> Dict[str, str]:
+    """
+    Add every source to the knowledge base concurrently
+
+    Reading and embedding each source is network-bound, so the calls overlap
+    instead of running back to back. A failing source is logged and reported
+    without aborting the others. Returns error messages by source name.
+
+    When the sources match the manifest written by the last complete load
+    (e.g. by scripts/build_knowledge.py), nothing is re-added unless `force`.
+    """
+    if sources is None:
+        sources = discover_knowledge_sources()
+    if not sources:
+        return {}
+
+    failures = {}
+    digests = await asyncio.to_thread(source_digests, sources)
+    if not force and read_manifest() == digests:
+        logger.info(f"Knowledge base is current with its {len(sources)} sources; skipping load")
+    else:
+        results = await asyncio.gather(
+            *(
+                knowledge_base.add_content_async(name=source["name"], path=str(source["path"]), skip_if_exists=True)
+                for source in sources
+            ),
+            return_exceptions=True
+        )
+
+        for source, result in zip(sources, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to load knowledge source {source['name']}: {result}")
+                failures[source["name"]] = str(result)
+
+        logger.info(f"Loaded {len(sources) - len(failures)}/{len(sources)} knowledge sources")
+        if not failures:
+            write_manifest(digests)
+
+    await asyncio.to_thread(ensure_vector_index, knowledge_base.vector_db)
+    if hasattr(knowledge_base, "sync_keyword_index"):
+        # Keyed on the content that was loaded; after a partial load the keyword index is always rebuilt
+        digest = None if failures else manifest_digest(digests)
+        await asyncio.to_thread(knowledge_base.sync_keyword_index, digest)
+    return failures
+
+def ensure_vector_index(vector_db):
+    """
+    Build a cosine IVF_HNSW_SQ index once the knowledge table outgrows flat search
+
+    Small corpora keep exact brute-force search. The index is built once;
+    chunks added later are still found (LanceDB scans unindexed rows) until
+    the index is rebuilt.
+    """
+    table = getattr(vector_db, "table", None)
+    if table is None:
+        return
+
+    rows = table.count_rows()
+    if rows < ANN_INDEX_MIN_ROWS:
+        logger.info(f"Knowledge table has {rows} chunks; using flat vector search")
+        return
+
+    vector_column = getattr(vector_db, "_vector_col", "vector")
+    if any(vector_column in index.columns for index in table.list_indices()):
+        return
+
+    # ~sqrt(N) IVF partitions keeps each HNSW graph small enough to build quickly
+    num_partitions = max(1, int(rows ** 0.5))
+    table.create_index(
+        metric="cosine",
+        vector_column_name=vector_column,
+        index_type="IVF_HNSW_SQ",
+        num_partitions=num_partitions,
+        m=HNSW_M,
+        ef_construction=HNSW_EF_CONSTRUCTION
+    )
+    logger.info(f"Built IVF_HNSW_SQ index over {rows} chunks ({num_partitions} partitions, m={HNSW_M})")
+
+class LazyKnowledgeMixin:
+    """
+    Defers attaching a knowledge base to an agent until it is first needed.
+
+    Opening the vector index is blocking I/O, so the async path runs it in a
+    worker thread instead of stalling the event loop. Classes using the mixin
+    call `_init_knowledge(knowledge_base)` in `__init__` and create their
+    Agent without `knowledge`; `ensure_knowledge()` attaches it on first use.
+    """
+
+    def _init_knowledge(self, knowledge_base):
+        self.knowledge_base = knowledge_base
+        self._knowledge_ready = knowledge_base is None
+        self._knowledge_lock = asyncio.Lock()
+
+    def load_knowledge(self):
+        """
+        Open the vector index and attach the knowledge base (blocking)
+        Used for pre-warming at startup
+        """
+        if self._knowledge_ready:
+            return
+
+        vector_db = getattr(self.knowledge_base, "vector_db", None)
+        if vector_db is not None and not vector_db.exists():
+            vector_db.create()
+
+        self.agent.knowledge = self.knowledge_base
+        self._knowledge_ready = True
+        logger.debug(f"Knowledge base attached to {type(self).__name__}")
+
+    async def ensure_knowledge(self):
+        """
+        Attach the knowledge base without blocking the event loop
+        """
+        if self._knowledge_ready:
+            return
+
+        async with self._knowledge_lock:
+            if not self._knowledge_ready:
+                await asyncio.to_thread(self.load_knowledge)
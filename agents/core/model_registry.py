@@ -0,0 +1,33 @@
+import functools
+
+import httpx
+from agno.models.openai import OpenAIChat
+from agno.models.anthropic import Claude
+
+# Connection pool shared by every model client in the process
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=64, max_connections=128)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+@functools.lru_cache(maxsize=None)
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Process-wide HTTP/2 client so all agents reuse the same keep-alive pool
+    """
+    return httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
+@functools.lru_cache(maxsize=None)
+def get_model(provider: str, model_id: str):
+    """
+    Get the shared model instance for a provider and model id
+
+    provider: "openai" or "anthropic"
+
+    Claude models mark the system prompt with cache_control so the static
+    instructions are served from Anthropic's prompt cache. OpenAI applies
+    prefix caching automatically as long as the instructions stay identical.
+    """
+    if provider == "openai":
+        return OpenAIChat(id=model_id, http_client=get_http_client())
+    if provider == "anthropic":
+        return Claude(id=model_id, http_client=get_http_client(), cache_system_prompt=True)
+    raise ValueError(f"Unknown model provider: {provider}")
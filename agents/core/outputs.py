@@ -0,0 +1,120 @@
+"""
+Structured output schemas for the specialist agents.
+
+Specialists answer with these models instead of free text, so the
+coordinator can merge several answers by rendering their fields directly
+rather than asking an LLM to parse and normalise prose.
+"""
+
+from typing import ClassVar, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+def _bullets(label: str, items: List[str]) -> str:
+    if not items:
+        return ""
+    return f"**{label}**\n" + "\n".join(f"- {item}" for item in items)
+
+class SpecialistReport(BaseModel):
+    """
+    Fields shared by every specialist answer
+    """
+    title: ClassVar[str] = "Coach"
+
+    summary: str = Field(..., description="Direct answer to the user's question in 1-3 sentences")
+    recommendations: List[str] = Field(default_factory=list, description="Concrete, actionable next steps")
+    cautions: List[str] = Field(default_factory=list, description="Safety notes or reasons to see a professional")
+
+    def details(self) -> List[str]:
+        """
+        Specialist-specific markdown blocks shown between summary and recommendations
+        """
+        return []
+
+    def to_markdown(self) -> str:
+        blocks = [f"### {self.title}", self.summary, *self.details()]
+        blocks.append(_bullets("Recommendations", self.recommendations))
+        blocks.append(_bullets("Cautions", self.cautions))
+        return "\n\n".join(block for block in blocks if block)
+
+class ProfileAssessment(SpecialistReport):
+    title: ClassVar[str] = "Getting Started"
+
+    fitness_level: Optional[str] = Field(None, description="beginner, intermediate or advanced")
+    suggested_goals: List[str] = Field(default_factory=list)
+
+    def details(self) -> List[str]:
+        level = f"Fitness level: {self.fitness_level}" if self.fitness_level else ""
+        return [level, _bullets("Suggested goals", self.suggested_goals)]
+
+class DataSyncReport(SpecialistReport):
+    title: ClassVar[str] = "Data Sync"
+
+    synced_data_types: List[str] = Field(default_factory=list)
+    issues: List[str] = Field(default_factory=list)
+
+    def details(self) -> List[str]:
+        synced = f"Synced: {', '.join(self.synced_data_types)}" if self.synced_data_types else ""
+        return [synced, _bullets("Issues", self.issues)]
+
+class TrainingPlan(SpecialistReport):
+    title: ClassVar[str] = "Training Plan"
+
+    phase: Optional[str] = Field(None, description="Current periodisation phase")
+    sessions: List[str] = Field(default_factory=list, description="One line per session, e.g. 'Tue: 45 min Z2 run'")
+
+    def details(self) -> List[str]:
+        phase = f"Phase: {self.phase}" if self.phase else ""
+        return [phase, _bullets("Sessions", self.sessions)]
+
+class WorkoutAnalysis(SpecialistReport):
+    title: ClassVar[str] = "Workout Analysis"
+
+    quality: Optional[str] = Field(None, description="excellent, good or poor")
+    key_metrics: Dict[str, str] = Field(default_factory=dict)
+
+    def details(self) -> List[str]:
+        quality = f"Workout quality: {self.quality}" if self.quality else ""
+        metrics = [f"{name}: {value}" for name, value in self.key_metrics.items()]
+        return [quality, _bullets("Key metrics", metrics)]
+
+class HealthAssessment(SpecialistReport):
+    title: ClassVar[str] = "Health"
+
+    readiness: Optional[str] = Field(None, description="ready, caution or rest")
+    key_findings: List[str] = Field(default_factory=list)
+
+    def details(self) -> List[str]:
+        readiness = f"Training readiness: {self.readiness}" if self.readiness else ""
+        return [readiness, _bullets("Findings", self.key_findings)]
+
+class RecoveryProtocol(SpecialistReport):
+    title: ClassVar[str] = "Recovery"
+
+    recovery_hours: Optional[int] = Field(None, description="Recommended hours before the next hard session")
+    modalities: List[str] = Field(default_factory=list)
+
+    def details(self) -> List[str]:
+        hours = f"Recovery time: {self.recovery_hours} h" if self.recovery_hours is not None else ""
+        return [hours, _bullets("Protocol", self.modalities)]
+
+class NutritionPlan(SpecialistReport):
+    title: ClassVar[str] = "Nutrition"
+
+    daily_calories: Optional[int] = None
+    macros_g: Dict[str, int] = Field(default_factory=dict, description="Grams per day for protein, carbs and fat")
+    fuelling: List[str] = Field(default_factory=list, description="Pre/during/post-workout guidance")
+
+    def details(self) -> List[str]:
+        calories = f"Daily energy: {self.daily_calories} kcal" if self.daily_calories else ""
+        macros = ", ".join(f"{name} {grams} g" for name, grams in self.macros_g.items())
+        return [calories, f"Macros: {macros}" if macros else "", _bullets("Fuelling", self.fuelling)]
+
+class GoalUpdate(SpecialistReport):
+    title: ClassVar[str] = "Goals"
+
+    goals: List[str] = Field(default_factory=list, description="SMART goals")
+    milestones: List[str] = Field(default_factory=list)
+
+    def details(self) -> List[str]:
+        return [_bullets("Goals", self.goals), _bullets("Milestones", self.milestones)]
@@ -0,0 +1,146 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import orjson
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+class TTLCache:
+    """
+    In-process LRU cache whose entries expire after a fixed time-to-live
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+_local_cache = TTLCache()
+_redis_client = None
+
+def _get_redis():
+    global _redis_client
+    if _redis_client is None and REDIS_URL:
+        import redis.asyncio as redis
+        _redis_client = redis.from_url(REDIS_URL)
+    return _redis_client
+
+def _normalize(value: Any) -> Any:
+    # Collapse whitespace so retyped or re-sent prompts hash identically
+    if isinstance(value, str):
+        return " ".join(value.split())
+    return value
+
+def _encode(value: Any) -> bytes:
+    """
+    JSON envelope for Redis; structured outputs are stored as their model's name plus fields
+    """
+    if isinstance(value, BaseModel):
+        return orjson.dumps({"schema": type(value).__name__, "value": value.model_dump(mode="json")})
+    return orjson.dumps({"schema": None, "value": value})
+
+def _decode(raw: bytes, output_schema) -> Optional[Any]:
+    """
+    Rebuild a cached value; only the calling agent's own output schema is ever instantiated
+    Returns None (a miss) for entries that don't match it
+    """
+    envelope = orjson.loads(raw)
+    schema = envelope.get("schema")
+    if schema is None:
+        return envelope.get("value")
+    if output_schema is None or schema != output_schema.__name__:
+        return None
+    return output_schema.model_validate(envelope["value"])
+
+def make_cache_key(agent_name: str, model_id: Optional[str], args: tuple, kwargs: dict) -> str:
+    """
+    Build a stable cache key from the agent, its model and the call arguments
+    """
+    payload = json.dumps(
+        {
+            "agent": agent_name,
+            "model": model_id,
+            "args": [_normalize(a) for a in args],
+            "kwargs": {k: _normalize(v) for k, v in kwargs.items()}
+        },
+        sort_keys=True,
+        default=str
+    )
+    return "llm:" + hashlib.blake2b(payload.encode("utf-8"), digest_size=20).hexdigest()
+
+def cached_llm(ttl: int = 3600):
+    """
+    Cache the result of an async agent method keyed by (agent, model id, arguments)
+
+    Results are kept in an in-process LRU and, when REDIS_URL is set, shared
+    through Redis with SET NX EX so concurrent workers don't overwrite each
+    other. Redis holds JSON, never pickles: structured outputs are rebuilt
+    through the agent's own output_schema. The model id is part of the key, so switching an agent to another
+    model invalidates its cached answers. None results are never cached.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            agent = getattr(self, "agent", None)
+            model = getattr(agent, "model", None)
+            key = make_cache_key(
+                f"{type(self).__name__}.{func.__name__}", getattr(model, "id", None), args, kwargs
+            )
+
+            cached = _local_cache.get(key)
+            if cached is not None:
+                return cached
+
+            redis_client = _get_redis()
+            if redis_client is not None:
+                try:
+                    raw = await redis_client.get(key)
+                    if raw is not None:
+                        value = _decode(raw, getattr(agent, "output_schema", None))
+                        if value is not None:
+                            _local_cache.set(key, value, ttl)
+                            return value
+                except Exception as e:
+                    logger.warning(f"Redis cache lookup failed: {e}")
+
+            result = await func(self, *args, **kwargs)
+            if result is None:
+                return result
+
+            _local_cache.set(key, result, ttl)
+            if redis_client is not None:
+                try:
+                    await redis_client.set(key, _encode(result), nx=True, ex=ttl)
+                except Exception as e:
+                    logger.warning(f"Redis cache store failed: {e}")
+
+            return result
+        return wrapper
+    return decorator
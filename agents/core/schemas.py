@@ -0,0 +1,75 @@
+"""
+Typed input records passed to the specialist agents.
+
+msgspec structs replace the loose dict/list signatures: they use slots,
+validate shape once at the boundary, and encode to JSON far faster than the
+stdlib when building LLM prompts.
+"""
+
+from typing import List, Optional
+
+import msgspec
+
+class HRVSample(msgspec.Struct, frozen=True):
+    """
+    Single HRV reading
+    """
+    ts: int  # Unix timestamp in seconds
+    rmssd: float  # Milliseconds
+    sdnn: Optional[float] = None
+
+class StressSample(msgspec.Struct, frozen=True):
+    """
+    Single stress reading (Garmin scale 0-100)
+    """
+    ts: int
+    level: int
+
+class SleepSummary(msgspec.Struct, frozen=True):
+    """
+    One night of sleep
+    """
+    date: str  # ISO date of the evening the sleep started
+    duration_minutes: int
+    deep_minutes: int = 0
+    light_minutes: int = 0
+    rem_minutes: int = 0
+    awake_minutes: int = 0
+    efficiency: Optional[float] = None  # Percentage
+    score: Optional[float] = None  # 0-100
+
+class WorkoutSummary(msgspec.Struct, frozen=True):
+    """
+    Completed workout with optional per-second heart rate stream
+    """
+    activity_type: str
+    start_ts: int
+    duration_seconds: int
+    distance_meters: Optional[float] = None
+    avg_heart_rate: Optional[int] = None
+    max_heart_rate: Optional[int] = None
+    training_stress_score: Optional[float] = None
+    heart_rate_samples: List[int] = []
+
+class AthleteProfile(msgspec.Struct, frozen=True):
+    """
+    Physiological profile used for zones, load and nutrition calculations
+    """
+    user_id: str
+    age: Optional[int] = None
+    gender: Optional[str] = None
+    weight_kg: Optional[float] = None
+    height_cm: Optional[float] = None
+    activity_level: Optional[str] = None
+    max_heart_rate: Optional[int] = None
+    resting_heart_rate: Optional[int] = None
+    lactate_threshold_hr: Optional[int] = None
+    ftp_watts: Optional[int] = None
+
+_encoder = msgspec.json.Encoder()
+
+def encode_for_prompt(obj) -> str:
+    """
+    Serialize a struct (or list of structs) to compact JSON for an LLM prompt
+    """
+    return _encoder.encode(obj).decode("utf-8")
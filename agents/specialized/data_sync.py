@@ -1,5 +1,42 @@
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import httpx
+import numpy as np
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
+
+from agents.core.history import HISTORY_RUNS
+from agents.core.model_registry import get_model
+from agents.core.outputs import DataSyncReport
+from agents.core.prompts import DATA_SYNC_INSTRUCTIONS
+from tools.garmin.garmin_data_tool import LARGE_PAYLOAD_BYTES, RETRY_STATUSES, GarminDataTool
+from tools.health.time_series import SENSOR_RANGES, compact_sensor_streams
+
+logger = logging.getLogger(__name__)
+
+# Conditional-request entries kept per process; least recently used are evicted
+GARMIN_ETAG_CACHE_SIZE = int(os.getenv("GARMIN_ETAG_CACHE_SIZE", "512"))
+
+# Garmin Health API endpoint per synchronized data type
+GARMIN_ENDPOINTS = {
+    "activities": "/wellness-api/rest/activities",
+    "dailies": "/wellness-api/rest/dailies",
+    "sleep": "/wellness-api/rest/sleeps",
+    "stress": "/wellness-api/rest/stressDetails",
+    "hrv": "/wellness-api/rest/hrv",
+    "body_composition": "/wellness-api/rest/bodyComps"
+}
+
+def _is_retryable(error: BaseException) -> bool:
+    """
+    Rate limiting (429), server errors (5xx) and transport failures are worth retrying later
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRY_STATUSES
+    return isinstance(error, httpx.TransportError)
 
 class DataSyncAgent:
     """
@@ -25,49 +62,108 @@ class DataSyncAgent:
     - Device sync delays
     """
 
-    def __init__(self):
+    def __init__(self, garmin: Optional[GarminDataTool] = None):
         self.agent = Agent(
             name="Data Synchronization Specialist",
-            model=OpenAIChat(id="gpt-4o-mini"),
+            model=get_model("openai", "gpt-4o-mini"),
             description="Manages Garmin data integration and synchronization",
-            instructions="""
-            You are responsible for all data synchronization between Garmin devices and our platform.
-
-            Your core functions:
-            1. Establish and maintain Garmin API connections
-            2. Perform regular data synchronization cycles
-            3. Validate and clean incoming data
-            4. Handle synchronization errors gracefully
-            5. Notify other agents of new data availability
-
-            Data priorities:
-            - Real-time: Heart rate, GPS during activities
-            - Daily: Sleep, HRV, stress, steps, calories
-            - Weekly: Body composition, training load trends
-            - Monthly: Fitness age, VO2 max changes
-
-            Always ensure data integrity and user privacy compliance.
-            Log all sync activities for troubleshooting and optimization.
-            """,
-            add_history_to_context=True
+            instructions=DATA_SYNC_INSTRUCTIONS,
+            add_history_to_context=True,
+            num_history_runs=HISTORY_RUNS,
+            output_schema=DataSyncReport
         )
 
+        # Requests go through the tool's authenticated client, rate limiter and retry policy
+        if garmin is None:
+            garmin = GarminDataTool(os.getenv("GARMIN_CLIENT_ID", ""), os.getenv("GARMIN_CLIENT_SECRET", ""))
+            garmin.access_token = os.getenv("GARMIN_ACCESS_TOKEN")
+            garmin.refresh_token = os.getenv("GARMIN_REFRESH_TOKEN")
+        self.garmin = garmin
+
+        # LRU of (user_id, data_type) -> (etag, last_modified, parsed payload); large payloads are not kept
+        self.etag_cache: "OrderedDict[Tuple[str, str], Tuple[Optional[str], Optional[str], Any]]" = OrderedDict()
+
     async def sync_garmin_data(self, user_id: str, data_types: list):
         """
         Perform comprehensive data sync from Garmin
         """
-        pass
+        fetched = await asyncio.gather(
+            *(self._fetch_endpoint(user_id, data_type) for data_type in data_types),
+            return_exceptions=True
+        )
+
+        sync_results = {"results": {}, "errors": {}}
+        for data_type, result in zip(data_types, fetched):
+            if isinstance(result, Exception):
+                sync_results["errors"][data_type] = await self.handle_sync_errors(
+                    {"user_id": user_id, "data_type": data_type, "error": result}
+                )
+            else:
+                sync_results["results"][data_type] = result
+
+        return sync_results
+
+    async def _fetch_endpoint(self, user_id: str, data_type: str) -> Any:
+        """
+        Fetch one Garmin endpoint with a conditional request
+        Unchanged data (304) is served from the cached payload
+        """
+        key = (user_id, data_type)
+        cached = self.etag_cache.get(key)
+        if cached is not None:
+            self.etag_cache.move_to_end(key)
+        etag, last_modified, _ = cached or (None, None, None)
+
+        result = await self.garmin.get_json_conditional(
+            GARMIN_ENDPOINTS[data_type], params={"userId": user_id}, etag=etag, last_modified=last_modified
+        )
+        if not result.modified:
+            logger.debug(f"Garmin {data_type} unchanged for user {user_id}")
+            return cached[2]
+
+        # Only modest payloads are worth keeping in memory for a 304 later
+        if (result.etag or result.last_modified) and result.size <= LARGE_PAYLOAD_BYTES:
+            self.etag_cache[key] = (result.etag, result.last_modified, result.payload)
+            self.etag_cache.move_to_end(key)
+            while len(self.etag_cache) > GARMIN_ETAG_CACHE_SIZE:
+                self.etag_cache.popitem(last=False)
+        else:
+            self.etag_cache.pop(key, None)
+
+        return result.payload
 
     async def validate_data_integrity(self, raw_data: dict):
         """
         Check data quality and completeness
         Flag anomalies for review
         """
-        pass
+        streams = compact_sensor_streams(raw_data)
+        report = {"is_valid": True, "missing": [], "out_of_range": {}}
+
+        for name, (low, high) in SENSOR_RANGES.items():
+            samples = streams.get(name)
+            if samples is None or samples.size == 0:
+                report["missing"].append(name)
+                continue
+
+            invalid = int(np.count_nonzero((samples < low) | (samples > high)))
+            if invalid:
+                report["out_of_range"][name] = invalid
+                report["is_valid"] = False
+
+        return report
 
     async def handle_sync_errors(self, error_details: dict):
         """
         Manage API errors, timeouts, and data issues
         Implement retry logic and fallback strategies
         """
-        pass
\ No newline at end of file
+        # Transient failures were already retried with backoff by GarminDataTool
+        error = error_details.get("error")
+        data_type = error_details.get("data_type")
+        logger.warning(f"Garmin sync failed for {data_type} (user {error_details.get('user_id')}): {error}")
+
+        return {
+            "error": str(error),
+            "retryable": isinstance(error, Exception) and _is_retryable(error)
+        }
\ No newline at end of file
@@ -1,5 +1,9 @@
 from agno.agent import Agent
-from agno.models.anthropic import Claude
+
+from agents.core.history import HISTORY_RUNS
+from agents.core.model_registry import get_model
+from agents.core.outputs import GoalUpdate
+from agents.core.prompts import GOAL_MANAGER_INSTRUCTIONS
 
 class GoalManagerAgent:
     """
@@ -39,37 +43,12 @@ class GoalManagerAgent:
     def __init__(self):
         self.agent = Agent(
             name="Goal Management Specialist",
-            model=Claude(id="claude-3-5-haiku-20241022"),
+            model=get_model("anthropic", "claude-3-5-haiku-20241022"),
             description="Expert in goal setting, progress tracking, and adaptive planning",
-            instructions="""
-            You are a goal management specialist focused on helping users achieve their health and fitness objectives.
-
-            Your expertise includes:
-            1. SMART goal methodology and behavior change science
-            2. Progress tracking and measurement strategies
-            3. Motivation psychology and adherence optimization
-            4. Adaptive planning and goal adjustment techniques
-            5. Performance prediction and timeline management
-
-            Goal management framework:
-            1. Initial goal assessment and refinement
-            2. Measurable milestone establishment
-            3. Progress tracking system implementation
-            4. Regular review and adjustment cycles
-            5. Success celebration and motivation maintenance
-
-            Key principles:
-            - Goals should be specific, measurable, and time-bound
-            - Process goals often lead to better outcomes than outcome goals
-            - Regular adjustment keeps goals realistic and motivating
-            - Small wins build momentum for larger achievements
-            - External accountability improves success rates
-
-            Focus on maintaining motivation while ensuring goals remain challenging yet achievable.
-            Help users develop intrinsic motivation and sustainable habits.
-            """,
+            instructions=GOAL_MANAGER_INSTRUCTIONS,
             add_history_to_context=True,
-            markdown=True
+            num_history_runs=HISTORY_RUNS,
+            output_schema=GoalUpdate
         )
 
     async def set_smart_goals(self, user_aspirations: dict, current_status: dict):
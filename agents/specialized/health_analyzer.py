@@ -1,5 +1,15 @@
+import json
+from typing import List
+
 from agno.agent import Agent
-from agno.models.anthropic import Claude
+
+from agents.core.history import HISTORY_RUNS
+from agents.core.model_registry import get_model
+from agents.core.outputs import HealthAssessment
+from agents.core.prompts import HEALTH_ANALYZER_INSTRUCTIONS
+from agents.core.response_cache import cached_llm
+from agents.core.schemas import HRVSample, SleepSummary, StressSample
+from tools.health.time_series import MetricSeries
 
 class HealthAnalyzerAgent:
     """
@@ -31,58 +41,47 @@ class HealthAnalyzerAgent:
     def __init__(self):
         self.agent = Agent(
             name="Health Analytics Specialist",
-            model=Claude(id="claude-3-5-sonnet-20241022"),
+            model=get_model("anthropic", "claude-3-5-sonnet-20241022"),
             description="Expert in health metrics analysis and wellness monitoring",
-            instructions="""
-            You are a health analytics specialist with expertise in wearable device data interpretation.
-
-            Your specializations include:
-            1. Heart rate variability analysis and autonomic nervous system assessment
-            2. Sleep science and circadian rhythm optimization
-            3. Stress physiology and recovery monitoring
-            4. Cardiovascular health indicators
-            5. Wellness trend analysis and early warning systems
-
-            Monitoring priorities:
-            1. HRV baseline establishment and deviation detection
-            2. Sleep quality metrics and optimization recommendations
-            3. Stress level tracking and management strategies
-            4. Recovery readiness assessment for training
-            5. Health trend identification and risk factor analysis
-
-            Analysis approach:
-            - Establish individual baselines for all metrics
-            - Monitor short-term variations and long-term trends
-            - Correlate health metrics with training load and lifestyle
-            - Provide evidence-based recommendations for improvement
-            - Alert to concerning patterns requiring medical attention
-
-            Always prioritize user safety and recommend medical consultation when appropriate.
-            """,
+            instructions=HEALTH_ANALYZER_INSTRUCTIONS,
             add_history_to_context=True,
-            markdown=True
+            num_history_runs=HISTORY_RUNS,
+            output_schema=HealthAssessment
         )
 
-    async def analyze_hrv_trends(self, hrv_data: list, timeframe: str):
+    @cached_llm(ttl=3600)
+    async def analyze_hrv_trends(self, hrv_data: List[HRVSample], timeframe: str):
         """
         Analyze HRV patterns and recovery status
         Detect deviations from baseline
         """
-        pass
+        summary = MetricSeries.from_records(hrv_data, "rmssd").summarize(window=7)
+        response = await self.agent.arun(
+            f"HRV (RMSSD, ms) summary for {timeframe}: {json.dumps(summary)}\n"
+            "Assess recovery status and any meaningful deviation from baseline."
+        )
+        return response.content
 
-    async def evaluate_sleep_quality(self, sleep_data: dict):
+    @cached_llm(ttl=3600)
+    async def evaluate_sleep_quality(self, sleep_data: SleepSummary):
         """
         Assess sleep stages, efficiency, and quality
         Provide sleep optimization recommendations
         """
         pass
 
-    async def monitor_stress_levels(self, stress_data: list, context_data: dict):
+    async def monitor_stress_levels(self, stress_data: List[StressSample], context_data: dict):
         """
         Track stress patterns and identify triggers
         Recommend stress management strategies
         """
-        pass
+        summary = MetricSeries.from_records(stress_data, "level").summarize(window=24)
+        response = await self.agent.arun(
+            f"Stress level (0-100) summary: {json.dumps(summary)}\n"
+            f"Context: {json.dumps(context_data, default=str)}\n"
+            "Identify stress patterns and likely triggers, and recommend management strategies."
+        )
+        return response.content
 
     async def assess_overall_wellness(self, health_metrics: dict):
         """
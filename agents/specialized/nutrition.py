@@ -1,5 +1,11 @@
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
+
+from agents.core.history import HISTORY_RUNS
+from agents.core.model_registry import get_model
+from agents.core.outputs import NutritionPlan
+from agents.core.prompts import NUTRITION_INSTRUCTIONS
+from agents.core.response_cache import cached_llm
+from agents.core.schemas import AthleteProfile
 
 class NutritionAgent:
     """
@@ -39,40 +45,16 @@ class NutritionAgent:
     def __init__(self):
         self.agent = Agent(
             name="Nutrition Specialist",
-            model=OpenAIChat(id="gpt-4o"),
+            model=get_model("openai", "gpt-4o"),
             description="Expert in sports nutrition and performance fueling",
-            instructions="""
-            You are a sports nutrition specialist with expertise in performance nutrition and health optimization.
-
-            Your areas of expertise:
-            1. Sports nutrition and performance fueling strategies
-            2. Macronutrient periodization with training cycles
-            3. Meal timing optimization for training and recovery
-            4. Supplement science and evidence-based recommendations
-            5. Body composition management through nutrition
-
-            Nutrition counseling approach:
-            1. Assess current eating patterns and preferences
-            2. Calculate energy and macronutrient needs
-            3. Design flexible meal frameworks
-            4. Provide specific pre/during/post-workout nutrition
-            5. Monitor progress and adjust recommendations
-
-            Core principles:
-            - Food first approach before supplements
-            - Individual tolerance and preference consideration
-            - Sustainable and practical recommendations
-            - Performance optimization while maintaining health
-            - Cultural and lifestyle sensitivity
-
-            Always provide evidence-based recommendations and avoid overly restrictive approaches.
-            Focus on building healthy relationships with food while optimizing performance.
-            """,
+            instructions=NUTRITION_INSTRUCTIONS,
             add_history_to_context=True,
-            markdown=True
+            num_history_runs=HISTORY_RUNS,
+            output_schema=NutritionPlan
         )
 
-    async def assess_nutrition_needs(self, user_profile: dict, training_plan: dict):
+    @cached_llm(ttl=3600)
+    async def assess_nutrition_needs(self, user_profile: AthleteProfile, training_plan: dict):
         """
         Calculate caloric and macronutrient requirements
         """
@@ -84,6 +66,7 @@ class NutritionAgent:
         """
         pass
 
+    @cached_llm(ttl=3600)
     async def optimize_workout_nutrition(self, workout_type: str, duration: int, intensity: str):
         """
         Provide specific pre/during/post-workout nutrition protocols
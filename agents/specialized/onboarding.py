@@ -1,7 +1,13 @@
+import json
+
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
 from agno.knowledge.knowledge import Knowledge
 
+from agents.core.history import HISTORY_RUNS
+from agents.core.model_registry import get_model
+from agents.core.outputs import ProfileAssessment
+from agents.core.prompts import ONBOARDING_INSTRUCTIONS, QUESTION_BANK
+
 class OnboardingAgent:
     """
     Guides new users through initial setup and profile creation:
@@ -23,31 +29,12 @@ class OnboardingAgent:
     def __init__(self):
         self.agent = Agent(
             name="Onboarding Specialist",
-            model=OpenAIChat(id="gpt-4o"),
+            model=get_model("openai", "gpt-4o"),
             description="Specialist in user onboarding and profile creation",
-            instructions="""
-            You are an expert onboarding specialist for a health coaching platform.
-            Your mission is to create a welcoming, thorough, and efficient onboarding experience.
-
-            Core responsibilities:
-            1. Conduct comprehensive health and fitness assessment
-            2. Help users define realistic and achievable goals
-            3. Guide through Garmin device setup and data sync
-            4. Create detailed user profile with preferences
-            5. Explain platform features and set expectations
-
-            Assessment areas:
-            - Current fitness level and exercise history
-            - Health conditions and limitations
-            - Available time for training
-            - Equipment access and preferences
-            - Motivation factors and barriers
-            - Past diet and nutrition patterns
-
-            Always maintain encouraging, professional tone while gathering thorough information.
-            """,
+            instructions=ONBOARDING_INSTRUCTIONS,
             add_history_to_context=True,
-            markdown=True
+            num_history_runs=HISTORY_RUNS,
+            output_schema=ProfileAssessment
         )
 
     async def start_onboarding(self, user_data: dict):
@@ -61,7 +48,17 @@ class OnboardingAgent:
         Process health and fitness assessment responses
         Create initial user profile
         """
-        pass
+        # Questions are already in the system prompt; only send the answers
+        answers = {
+            qid: user_responses[qid]
+            for qid in QUESTION_BANK
+            if user_responses.get(qid) not in (None, "")
+        }
+        response = await self.agent.arun(
+            "Assessment answers: " + json.dumps(answers, separators=(",", ":")) + "\n"
+            "Build the initial user profile and suggest realistic first goals."
+        )
+        return response.content
 
     async def setup_garmin_integration(self, user_id: str):
         """
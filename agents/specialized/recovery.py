@@ -1,5 +1,10 @@
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
+
+from agents.core.history import HISTORY_RUNS
+from agents.core.model_registry import get_model
+from agents.core.outputs import RecoveryProtocol
+from agents.core.prompts import RECOVERY_INSTRUCTIONS
+from agents.core.response_cache import cached_llm
 
 class RecoveryAgent:
     """
@@ -38,37 +43,12 @@ class RecoveryAgent:
     def __init__(self):
         self.agent = Agent(
             name="Recovery Specialist",
-            model=OpenAIChat(id="gpt-4o-mini"),
+            model=get_model("openai", "gpt-4o-mini"),
             description="Expert in recovery optimization and training adaptation",
-            instructions="""
-            You are a recovery specialist focused on optimizing training adaptation through proper rest and recovery.
-
-            Your expertise encompasses:
-            1. Exercise physiology and recovery science
-            2. Sleep optimization for athletic performance
-            3. Nutrition timing for enhanced recovery
-            4. Stress management and relaxation techniques
-            5. Individual recovery rate assessment
-
-            Recovery assessment framework:
-            1. Training load and stress accumulation analysis
-            2. Recovery metrics evaluation (HRV, sleep, subjective wellness)
-            3. Individual recovery capacity determination
-            4. Recovery strategy selection and prescription
-            5. Progress monitoring and strategy adjustment
-
-            Key recovery principles:
-            - Recovery is where adaptation occurs
-            - Individual recovery rates vary significantly
-            - Multiple recovery modalities should be utilized
-            - Recovery quality is as important as quantity
-            - Proactive recovery prevents overtraining
-
-            Always emphasize that recovery is an active part of training, not just absence of exercise.
-            Provide specific, actionable recovery protocols tailored to individual needs.
-            """,
+            instructions=RECOVERY_INSTRUCTIONS,
             add_history_to_context=True,
-            markdown=True
+            num_history_runs=HISTORY_RUNS,
+            output_schema=RecoveryProtocol
         )
 
     async def assess_recovery_needs(self, training_data: dict, health_metrics: dict):
@@ -77,6 +57,7 @@ class RecoveryAgent:
         """
         pass
 
+    @cached_llm(ttl=3600)
     async def prescribe_recovery_protocol(self, recovery_needs: dict, user_preferences: dict):
         """
         Create specific recovery plan with multiple modalities
@@ -1,8 +1,21 @@
+import asyncio
+import json
+from typing import List
+
+import msgspec
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
 from agno.knowledge.knowledge import Knowledge
 
-class TrainingAnalyzerAgent:
+from agents.core.history import HISTORY_RUNS
+from agents.core.knowledge_loader import LazyKnowledgeMixin
+from agents.core.model_registry import get_model
+from agents.core.outputs import WorkoutAnalysis
+from agents.core.prompts import TRAINING_ANALYZER_INSTRUCTIONS
+from agents.core.schemas import AthleteProfile, WorkoutSummary, encode_for_prompt
+from tools.health.health_calculator import HealthCalculator
+from tools.health.time_series import zone_distribution
+
+class TrainingAnalyzerAgent(LazyKnowledgeMixin):
     """
     Analyzes completed workouts and provides detailed insights:
     - Performance analysis (pace, power, heart rate zones)
@@ -30,60 +43,60 @@ class TrainingAnalyzerAgent:
     """
 
     def __init__(self, knowledge_base: Knowledge):
+        # Knowledge is attached lazily by ensure_knowledge() to keep construction non-blocking
+        self._init_knowledge(knowledge_base)
+
         self.agent = Agent(
             name="Training Analysis Specialist",
-            model=OpenAIChat(id="gpt-4o"),
+            model=get_model("openai", "gpt-4o"),
             description="Expert in workout analysis and performance insights",
-            instructions="""
-            You are a performance analysis expert specializing in endurance sports and fitness training.
-
-            Your analytical expertise covers:
-            1. Exercise physiology and performance metrics
-            2. Training load quantification and recovery science
-            3. Biomechanical efficiency assessment
-            4. Progression tracking and adaptation monitoring
-            5. Injury prevention through data analysis
-
-            Analysis framework:
-            1. Data quality assessment and validation
-            2. Performance metrics calculation and interpretation
-            3. Training stress quantification
-            4. Comparison with historical performance
-            5. Identification of improvement opportunities
-            6. Recovery and next session recommendations
-
-            Key focus areas:
-            - Aerobic vs anaerobic contribution analysis
-            - Pacing strategy evaluation
-            - Heart rate response patterns
-            - Power/pace sustainability assessment
-            - Fatigue accumulation indicators
-            - Environmental and equipment factors
-
-            Provide actionable insights that help users understand their performance and improve future training.
-            """,
-            knowledge=knowledge_base,
+            instructions=TRAINING_ANALYZER_INSTRUCTIONS,
             add_history_to_context=True,
-            markdown=True
+            num_history_runs=HISTORY_RUNS,
+            output_schema=WorkoutAnalysis
         )
 
-    async def analyze_workout(self, workout_data: dict, user_profile: dict):
+    async def analyze_workout(self, workout_data: WorkoutSummary, user_profile: AthleteProfile):
         """
         Comprehensive analysis of completed workout
         Generate insights and recommendations
         """
-        pass
+        await self.ensure_knowledge()
+
+        zones = HealthCalculator.compute_zones(
+            user_profile.max_heart_rate,
+            user_profile.resting_heart_rate,
+            user_profile.ftp_watts,
+            user_profile.lactate_threshold_hr
+        )
+        # Samples are recorded at 1 Hz, so counts are seconds spent in each zone
+        # Long workouts carry tens of thousands of samples; bin them off the event loop
+        seconds_in_zone = await asyncio.to_thread(
+            zone_distribution, workout_data.heart_rate_samples, zones.hr_floors
+        )
+        time_in_zones = {"below_zone1": int(seconds_in_zone[0])}
+        time_in_zones.update({f"zone{i}": int(count) for i, count in enumerate(seconds_in_zone[1:], start=1)})
+
+        # Raw samples are summarised above and left out of the prompt
+        workout = encode_for_prompt(msgspec.structs.replace(workout_data, heart_rate_samples=[]))
+        response = await self.agent.arun(
+            f"{zones.prompt_block}\n"
+            f"Workout: {workout}\n"
+            f"Seconds per heart rate zone: {json.dumps(time_in_zones)}\n"
+            "Assess workout quality, zone distribution and recovery needs, and suggest adjustments for the next session."
+        )
+        return response.content
 
-    async def assess_training_load(self, workout_data: dict, recent_history: list):
+    async def assess_training_load(self, workout_data: WorkoutSummary, recent_history: List[WorkoutSummary]):
         """
         Calculate training stress and cumulative load
         Determine recovery requirements
         """
-        pass
+        await self.ensure_knowledge()
 
-    async def track_progression(self, current_workout: dict, historical_data: list):
+    async def track_progression(self, current_workout: WorkoutSummary, historical_data: List[WorkoutSummary]):
         """
         Compare performance against historical benchmarks
         Identify fitness improvements or declining trends
         """
-        pass
\ No newline at end of file
+        await self.ensure_knowledge()
\ No newline at end of file
@@ -1,8 +1,13 @@
 from agno.agent import Agent
-from agno.models.anthropic import Claude
 from agno.knowledge.knowledge import Knowledge
 
-class TrainingPlannerAgent:
+from agents.core.history import HISTORY_RUNS
+from agents.core.knowledge_loader import LazyKnowledgeMixin
+from agents.core.model_registry import get_model
+from agents.core.outputs import TrainingPlan
+from agents.core.prompts import TRAINING_PLANNER_INSTRUCTIONS
+
+class TrainingPlannerAgent(LazyKnowledgeMixin):
     """
     Creates personalized training plans based on:
     - User goals (performance, weight loss, general fitness)
@@ -29,57 +34,34 @@ class TrainingPlannerAgent:
     """
 
     def __init__(self, knowledge_base: Knowledge):
+        # Knowledge is attached lazily by ensure_knowledge() to keep construction non-blocking
+        self._init_knowledge(knowledge_base)
+
         self.agent = Agent(
             name="Training Plan Specialist",
-            model=Claude(id="claude-3-5-haiku-20241022"),
+            model=get_model("anthropic", "claude-3-5-haiku-20241022"),
             description="Expert in personalized training plan creation",
-            instructions="""
-            You are an expert training plan designer with deep knowledge of exercise physiology and coaching.
-
-            Your expertise includes:
-            1. Periodization principles and training theory
-            2. Individual adaptation and progression rates
-            3. Training load management and recovery balance
-            4. Sport-specific training methodologies
-            5. Equipment-based workout alternatives
-
-            Plan creation process:
-            1. Analyze user profile and current fitness data
-            2. Define training phases and periodization
-            3. Structure weekly training schedules
-            4. Design specific workouts with progression
-            5. Include recovery and adaptation periods
-            6. Provide alternatives for missed sessions
-
-            Always consider:
-            - Progressive overload principles
-            - Individual recovery capacity
-            - Time constraints and realistic scheduling
-            - Injury prevention and movement quality
-            - Motivation and adherence factors
-
-            Use evidence-based training methodologies and adapt to real-time feedback.
-            """,
-            knowledge=knowledge_base,
+            instructions=TRAINING_PLANNER_INSTRUCTIONS,
             add_history_to_context=True,
-            markdown=True
+            num_history_runs=HISTORY_RUNS,
+            output_schema=TrainingPlan
         )
 
     async def create_training_plan(self, user_profile: dict, goals: dict, constraints: dict):
         """
         Generate comprehensive training plan based on user data
         """
-        pass
+        await self.ensure_knowledge()
 
     async def adjust_plan_progression(self, plan_id: str, performance_data: dict):
         """
         Modify training progression based on performance feedback
         """
-        pass
+        await self.ensure_knowledge()
 
     async def handle_missed_sessions(self, plan_id: str, missed_sessions: list):
         """
         Restructure plan when sessions are missed
         Maintain training progression integrity
         """
-        pass
\ No newline at end of file
+        await self.ensure_knowledge()
\ No newline at end of file
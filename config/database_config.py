@@ -1,8 +1,146 @@
+import functools
+import hashlib
 import os
-from typing import Dict, Any, Optional
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, Any, Optional, Tuple
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, delete, event, exc, insert, select, text
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool, StaticPool
+
+# Resolved once at import so forked workers don't re-read the environment
+DEV_DATABASE_URL = os.getenv("DEV_DATABASE_URL", "sqlite:///./coach_dev.db")
+STAGING_DATABASE_URL = os.getenv("STAGING_DATABASE_URL")
+PROD_DATABASE_URL = os.getenv("PROD_DATABASE_URL")
+_BACKUP_LOCATION = os.getenv("BACKUP_LOCATION", "./backups")
+_DB_SSL_CERT = os.getenv("DB_SSL_CERT")
+_DB_SSL_KEY = os.getenv("DB_SSL_KEY")
+_DB_SSL_ROOT_CERT = os.getenv("DB_SSL_ROOT_CERT")
+
+# SQL statement logging is opt-in; formatting every statement is expensive
+SQL_ECHO = os.getenv("SQL_ECHO", "0") == "1"
+
+# Rows per multi-row INSERT statement; PostgreSQL throughput plateaus around 1000
+INSERT_BATCH_SIZE = int(os.getenv("INSERT_BATCH_SIZE", "1000"))
+
+# Pre-ping costs a round-trip per checkout; recycling stale connections usually suffices
+DB_PREPING = os.getenv("DB_PREPING", "0") == "1"
+
+# Fail fast when the pool is exhausted instead of queueing requests for 30s
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "5"))
+
+# Circuit breaker: this many pool timeouts within the window marks the database unhealthy
+DB_CIRCUIT_THRESHOLD = int(os.getenv("DB_CIRCUIT_THRESHOLD", "5"))
+DB_CIRCUIT_WINDOW_SEC = float(os.getenv("DB_CIRCUIT_WINDOW_SEC", "30"))
+
+# Health check results are reused for this many seconds
+HEALTH_TTL_SEC = float(os.getenv("HEALTH_TTL_SEC", "5"))
+
+# Applied to every connection of the agent session store (SqliteDb): WAL lets reads run
+# alongside the writer, NORMAL syncs at checkpoints instead of every commit, 64MB page cache
+SESSION_STORE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456"
+)
+
+# Compiled once and reused by every health probe
+_HEALTH_PING = text("SELECT 1")
+
+# Records the hash of the schema last created by initialize_database
+_SCHEMA_META = Table(
+    "_schema_meta", MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("schema_hash", String(64), nullable=False)
+)
+
+@functools.lru_cache(maxsize=None)
+def _ssl_args() -> Dict[str, Optional[str]]:
+    """
+    SSL connect arguments, built once per process
+    """
+    return {
+        "sslmode": "require",
+        "sslcert": _DB_SSL_CERT,
+        "sslkey": _DB_SSL_KEY,
+        "sslrootcert": _DB_SSL_ROOT_CERT
+    }
+
+# Identifies the logical request that owns the current scoped session
+_request_id: ContextVar[Optional[str]] = ContextVar("db_request_id", default=None)
+
+def _current_request_id():
+    # Outside a request scope, sessions are scoped to the calling thread
+    return _request_id.get() or threading.get_ident()
+
+def _compute_pool_sizing() -> Dict[str, int]:
+    """
+    Size the connection pool from the number of worker processes
+
+    workers comes from WEB_CONCURRENCY or HUEY_WORKERS, defaulting to the CPU
+    count. pool_size = max(5, workers * 2) and max_overflow = workers * 3,
+    clamped so one engine never opens more than MAX_DB_CONNECTIONS (keep this
+    below Postgres' max_connections divided by the number of processes).
+    """
+    workers = int(os.getenv("WEB_CONCURRENCY") or os.getenv("HUEY_WORKERS") or os.cpu_count() or 1)
+    max_connections = int(os.getenv("MAX_DB_CONNECTIONS", "100"))
+
+    pool_size = min(max(5, workers * 2), max_connections)
+    max_overflow = max(0, min(workers * 3, max_connections - pool_size))
+    return {"pool_size": pool_size, "max_overflow": max_overflow}
+
+_POOL_SIZING = _compute_pool_sizing()
+
+# Database configurations for the different environments
+_ENV_CONFIGS: Dict[str, Dict[str, Any]] = {
+    "development": {
+        "database_url": DEV_DATABASE_URL,
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": 3600,
+        "echo": SQL_ECHO,  # Set SQL_ECHO=1 for SQL logging in development
+        "backup_enabled": False
+    },
+
+    "testing": {
+        "database_url": "sqlite:///:memory:",
+        "pool_size": 1,
+        "max_overflow": 0,
+        "pool_timeout": 30,
+        "pool_recycle": -1,
+        "echo": False,
+        "backup_enabled": False
+    },
+
+    "staging": {
+        "database_url": STAGING_DATABASE_URL,
+        **_POOL_SIZING,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": 3600,
+        "echo": False,
+        "backup_enabled": True,
+        "backup_schedule": "daily"
+    },
+
+    "production": {
+        "database_url": PROD_DATABASE_URL,
+        **_POOL_SIZING,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": 300,  # Below typical server/proxy idle timeouts
+        "echo": False,
+        "backup_enabled": True,
+        "backup_schedule": "hourly",
+        "ssl_required": True,
+        "connection_encryption": True
+    }
+}
 
 class DatabaseConfig:
     """
@@ -23,66 +161,25 @@ class DatabaseConfig:
 
     def __init__(self):
         self.environment = os.getenv("ENVIRONMENT", "development")
-        self.database_configs = self._load_database_configs()
+        self.database_configs = _ENV_CONFIGS
+        # Selected once; unknown environments fall back to development
+        self._active_config = _ENV_CONFIGS.get(self.environment, _ENV_CONFIGS["development"])
+        self._database_url = self._active_config["database_url"]
+        # Credentials stripped once for health reports
+        self._sanitized_url = self._database_url.rsplit("@", 1)[-1] if self._database_url else None
         self.engine = None
         self.session_factory = None
 
-    def _load_database_configs(self) -> Dict[str, Dict[str, Any]]:
-        """
-        Load database configurations for different environments
-        """
-        return {
-            "development": {
-                "database_url": os.getenv("DEV_DATABASE_URL", "sqlite:///./coach_dev.db"),
-                "pool_size": 5,
-                "max_overflow": 10,
-                "pool_timeout": 30,
-                "pool_recycle": 3600,
-                "echo": True,  # SQL logging for development
-                "backup_enabled": False
-            },
-
-            "testing": {
-                "database_url": "sqlite:///:memory:",
-                "pool_size": 1,
-                "max_overflow": 0,
-                "pool_timeout": 30,
-                "pool_recycle": -1,
-                "echo": False,
-                "backup_enabled": False
-            },
-
-            "staging": {
-                "database_url": os.getenv("STAGING_DATABASE_URL"),
-                "pool_size": 10,
-                "max_overflow": 20,
-                "pool_timeout": 30,
-                "pool_recycle": 3600,
-                "echo": False,
-                "backup_enabled": True,
-                "backup_schedule": "daily"
-            },
-
-            "production": {
-                "database_url": os.getenv("PROD_DATABASE_URL"),
-                "pool_size": 20,
-                "max_overflow": 40,
-                "pool_timeout": 30,
-                "pool_recycle": 3600,
-                "echo": False,
-                "backup_enabled": True,
-                "backup_schedule": "hourly",
-                "ssl_required": True,
-                "connection_encryption": True
-            }
-        }
+        self._health_ttl = HEALTH_TTL_SEC
+        self._health_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._last_checkin = float("-inf")
+        self._pool_timeouts: Deque[float] = deque()
 
     def get_database_url(self) -> str:
         """
         Get database URL for current environment
         """
-        config = self.database_configs.get(self.environment, self.database_configs["development"])
-        return config["database_url"]
+        return self._database_url
 
     def create_engine(self, database_url: Optional[str] = None):
         """
@@ -91,7 +188,7 @@ class DatabaseConfig:
         if database_url is None:
             database_url = self.get_database_url()
 
-        config = self.database_configs.get(self.environment, self.database_configs["development"])
+        config = self._active_config
 
         # Engine configuration based on database type
         if database_url.startswith("sqlite"):
@@ -103,61 +200,157 @@ class DatabaseConfig:
                     "timeout": 30
                 }
             }
+
+            if ":memory:" in database_url:
+                # One shared connection so every session sees the same in-memory schema
+                engine_kwargs["poolclass"] = StaticPool
+            else:
+                # SQLite serializes writes itself; pooling file connections only adds bookkeeping
+                engine_kwargs["poolclass"] = NullPool
         else:
             # PostgreSQL and other database configuration
             engine_kwargs = {
                 "echo": config.get("echo", False),
                 "poolclass": QueuePool,
-                "pool_size": config.get("pool_size", 10),
-                "max_overflow": config.get("max_overflow", 20),
-                "pool_timeout": config.get("pool_timeout", 30),
-                "pool_recycle": config.get("pool_recycle", 3600),
-                "pool_pre_ping": True  # Verify connections before use
+                **self.get_pool_configuration(),
+                "pool_pre_ping": DB_PREPING,
+                # Reuse the most recently returned connection so a small hot set stays warm
+                "pool_use_lifo": True
             }
 
             # Add SSL configuration for production
             if config.get("ssl_required", False):
-                engine_kwargs["connect_args"] = {
-                    "sslmode": "require",
-                    "sslcert": os.getenv("DB_SSL_CERT"),
-                    "sslkey": os.getenv("DB_SSL_KEY"),
-                    "sslrootcert": os.getenv("DB_SSL_ROOT_CERT")
-                }
+                engine_kwargs["connect_args"] = dict(_ssl_args())
+
+        # executemany() of INSERTs is sent as multi-row VALUES pages of this size
+        engine_kwargs["insertmanyvalues_page_size"] = INSERT_BATCH_SIZE
 
         self.engine = create_engine(database_url, **engine_kwargs)
-        self.session_factory = sessionmaker(bind=self.engine)
+        self.session_factory = scoped_session(sessionmaker(bind=self.engine), scopefunc=_current_request_id)
+        event.listen(self.engine, "checkin", self._record_checkin)
+
+        # Under pytest (ENVIRONMENT=testing) any relationship access without an explicit loader raises
+        if self.environment == "testing":
+            from database.models.query_utils import enable_strict_loading
+            enable_strict_loading()
 
         return self.engine
 
     def get_session(self):
         """
         Get database session for transactions
+        Calls within the same request scope share one session
         """
+        if self.circuit_open():
+            raise exc.TimeoutError("Database circuit open after repeated connection pool timeouts")
+
         if self.session_factory is None:
             self.create_engine()
         return self.session_factory()
 
+    def record_pool_timeout(self):
+        """
+        Count a connection pool timeout towards the circuit breaker
+        """
+        self._pool_timeouts.append(time.monotonic())
+
+    def circuit_open(self) -> bool:
+        """
+        True while recent pool timeouts exceed DB_CIRCUIT_THRESHOLD
+        """
+        cutoff = time.monotonic() - DB_CIRCUIT_WINDOW_SEC
+        while self._pool_timeouts and self._pool_timeouts[0] < cutoff:
+            self._pool_timeouts.popleft()
+        return len(self._pool_timeouts) >= DB_CIRCUIT_THRESHOLD
+
+    def remove_session(self):
+        """
+        Close the current scope's session and return its connection to the pool
+        """
+        if self.session_factory is not None:
+            self.session_factory.remove()
+
+    @contextmanager
+    def request_scope(self, request_id: str):
+        """
+        Share one session for the duration of a request and release it at the end
+        """
+        token = _request_id.set(request_id)
+        try:
+            yield self.get_session()
+        except exc.TimeoutError:
+            self.record_pool_timeout()
+            raise
+        finally:
+            self.remove_session()
+            _request_id.reset(token)
+
     def initialize_database(self):
         """
         Initialize database schema and create tables
+        Skipped when the stored schema hash matches the current models
         """
-        from database.models.user_models import Base as UserBase
-        from database.models.training_models import Base as TrainingBase
-        from database.models.health_models import Base as HealthBase
+        # Model modules register their tables on the shared Base when imported
+        import database.models.health_models  # noqa: F401
+        import database.models.training_models  # noqa: F401
+        import database.models.user_models  # noqa: F401
+        from database.models.base import Base
+        from database.partitions import ensure_monthly_partitions
+        from database.storage import compress_json_columns, set_fillfactors
+        from database.triggers import TRIGGER_DDL, create_triggers
+        from database.views import MATERIALIZED_VIEWS, VIEWS, create_views
 
         if self.engine is None:
             self.create_engine()
 
-        # Create all tables
-        UserBase.metadata.create_all(self.engine)
-        TrainingBase.metadata.create_all(self.engine)
-        HealthBase.metadata.create_all(self.engine)
+        schema_hash = self._schema_hash(
+            Base.metadata, (*VIEWS.values(), *MATERIALIZED_VIEWS.values(), *TRIGGER_DDL)
+        )
+
+        with self.engine.begin() as connection:
+            _SCHEMA_META.create(connection, checkfirst=True)
+            stored_hash = connection.execute(select(_SCHEMA_META.c.schema_hash)).scalar()
+
+            # Per-table existence checks only run when the schema changed
+            if stored_hash != schema_hash:
+                Base.metadata.create_all(connection)
+                compress_json_columns(connection, Base.metadata)
+                set_fillfactors(connection)
+                create_views(connection)
+                create_triggers(connection)
+                connection.execute(delete(_SCHEMA_META))
+                connection.execute(insert(_SCHEMA_META).values(id=1, schema_hash=schema_hash))
+
+            # Runs on every start so upcoming months always have a partition
+            ensure_monthly_partitions(connection)
+
+    def _schema_hash(self, metadata: MetaData, extra_ddl: Tuple[str, ...] = ()) -> str:
+        # DDL compiled for the active dialect, so column, type and index changes all alter the hash;
+        # view and trigger SQL is appended so edits to it are applied to existing databases too
+        dialect = self.engine.dialect
+        ddl = list(extra_ddl)
+        for table in sorted(metadata.tables.values(), key=lambda t: t.name):
+            ddl.append(str(CreateTable(table).compile(dialect=dialect)))
+            ddl.extend(sorted(str(CreateIndex(index).compile(dialect=dialect)) for index in table.indexes))
+        return hashlib.sha1("\n".join(ddl).encode("utf-8")).hexdigest()
+
+    def get_pool_configuration(self) -> Dict[str, Any]:
+        """
+        Connection pool sizing for current environment, shared by the sync and async engines
+        """
+        config = self._active_config
+        return {
+            "pool_size": config.get("pool_size", 10),
+            "max_overflow": config.get("max_overflow", 20),
+            "pool_timeout": config.get("pool_timeout", 30),
+            "pool_recycle": config.get("pool_recycle", 3600)
+        }
 
     def get_backup_configuration(self) -> Dict[str, Any]:
         """
         Get backup configuration for current environment
         """
-        config = self.database_configs.get(self.environment, {})
+        config = self._active_config
 
         if not config.get("backup_enabled", False):
             return {"enabled": False}
@@ -166,7 +359,7 @@ class DatabaseConfig:
             "enabled": True,
             "schedule": config.get("backup_schedule", "daily"),
             "retention_days": config.get("backup_retention_days", 30),
-            "backup_location": os.getenv("BACKUP_LOCATION", "./backups"),
+            "backup_location": _BACKUP_LOCATION,
             "compression": config.get("backup_compression", True),
             "encryption": config.get("backup_encryption", False)
         }
@@ -183,38 +376,94 @@ class DatabaseConfig:
             "migration_timeout": 300  # 5 minutes
         }
 
+    def _record_checkin(self, dbapi_connection, connection_record):
+        # A connection returned to the pool means the database answered recently
+        self._last_checkin = time.monotonic()
+
     def health_check(self) -> Dict[str, Any]:
         """
         Perform database health check
+
+        Results are cached for HEALTH_TTL_SEC, and the SELECT 1 probe is
+        skipped while pool traffic shows the database is in use, so frequent
+        liveness probes don't compete with real queries for pool slots.
         """
+        now = time.monotonic()
+        if self._health_cache is not None and now - self._health_cache[0] < self._health_ttl:
+            return self._health_cache[1]
+
+        # Don't queue another connection attempt behind an exhausted pool
+        if self.circuit_open():
+            return {
+                "status": "unhealthy",
+                "error": "connection pool exhausted (circuit open)",
+                "environment": self.environment
+            }
+
         try:
             if self.engine is None:
                 self.create_engine()
 
-            # Test connection
-            with self.engine.connect() as connection:
-                result = connection.execute("SELECT 1")
-                result.fetchone()
+            # Test connection only when there has been no recent pool activity
+            if now - self._last_checkin >= self._health_ttl:
+                with self.engine.connect() as connection:
+                    connection.execute(_HEALTH_PING).scalar()
 
             # Get connection pool status
             pool = self.engine.pool
 
-            return {
+            payload = {
                 "status": "healthy",
-                "database_url": self.get_database_url().split("@")[-1] if "@" in self.get_database_url() else self.get_database_url(),
+                "database_url": self._sanitized_url,
                 "environment": self.environment,
-                "pool_size": getattr(pool, "size", None),
-                "checked_in": getattr(pool, "checkedin", None),
-                "checked_out": getattr(pool, "checkedout", None),
-                "overflow": getattr(pool, "overflow", None)
+                "pool_size": self._pool_stat(pool, "size"),
+                "checked_in": self._pool_stat(pool, "checkedin"),
+                "checked_out": self._pool_stat(pool, "checkedout"),
+                "overflow": self._pool_stat(pool, "overflow")
             }
 
         except Exception as e:
-            return {
+            if isinstance(e, exc.TimeoutError):
+                self.record_pool_timeout()
+            payload = {
                 "status": "unhealthy",
                 "error": str(e),
                 "environment": self.environment
             }
 
+        self._health_cache = (now, payload)
+        return payload
+
+    @staticmethod
+    def _pool_stat(pool, name: str) -> Optional[int]:
+        # QueuePool exposes these counters as methods; other pool classes may not have them
+        stat = getattr(pool, name, None)
+        return stat() if callable(stat) else stat
+
+def _apply_session_store_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SESSION_STORE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+def create_session_store_engine(db_file: str):
+    """
+    SQLite engine for agno's session store, tuned with SESSION_STORE_PRAGMAS on connect
+    """
+    os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+    # One connection held for the life of the process: SQLite serializes writers anyway,
+    # and reopening the file would re-read the WAL index and rerun the PRAGMAs
+    engine = create_engine(
+        f"sqlite:///{db_file}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        poolclass=QueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=30,
+        pool_pre_ping=False
+    )
+    event.listen(engine, "connect", _apply_session_store_pragmas)
+    return engine
+
 # Global database instance
 db_config = DatabaseConfig()
\ No newline at end of file
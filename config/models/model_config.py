@@ -1,6 +1,47 @@
-from typing import Dict, List, Optional
-from agno.models.openai import OpenAIChat
-from agno.models.anthropic import Claude
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Optional
+
+# Model ids used by the keys below; instances come from ModelConfig.get_shared
+_MODEL_IDS = MappingProxyType({
+    "claude_sonnet": "claude-3-5-sonnet-20241022",
+    "claude_haiku": "claude-3-5-haiku-20241022",
+    "gpt4o": "gpt-4o",
+    "gpt4o_mini": "gpt-4o-mini",
+    "gpt5_mini": "gpt-5-mini"
+})
+
+# Read-only lookup tables built once per interpreter
+_COMPLEXITY_MAP = MappingProxyType({
+    "simple": "gpt4o_mini",
+    "moderate": "claude_haiku",
+    "complex": "claude_sonnet",
+    "analytical": "gpt4o"
+})
+
+_PRIORITY_MAP = MappingProxyType({
+    "real_time": "gpt4o_mini",
+    "fast": "claude_haiku",
+    "standard": "gpt4o",
+    "deep_analysis": "claude_sonnet"
+})
+
+@dataclass(frozen=True, slots=True)
+class TeamModels:
+    """
+    Model keys for the roles of a team
+    """
+    lead_model: str
+    fallback_model: str
+
+@dataclass(frozen=True, slots=True)
+class WorkflowModels:
+    """
+    Model keys for the stages of a workflow
+    """
+    primary: str
+    analysis: Optional[str] = None
+    assessment: Optional[str] = None
 
 class ModelConfig:
     """
@@ -19,46 +60,8 @@ class ModelConfig:
     - GPT-4o-mini: Lightweight tasks, high-frequency operations
     """
 
-    # Model instances for different use cases
-    MODELS = {
-        # Primary models for complex reasoning
-        "claude_sonnet": Claude(
-            id="claude-3-5-sonnet-20241022",
-            name="Claude Sonnet",
-            provider="Anthropic"
-        ),
-
-        # Fast response models
-        "claude_haiku": Claude(
-            id="claude-3-5-haiku-20241022",
-            name="Claude Haiku",
-            provider="Anthropic"
-        ),
-
-        # Structured output and planning
-        "gpt4o": OpenAIChat(
-            id="gpt-4o",
-            name="GPT-4o",
-            provider="OpenAI"
-        ),
-
-        # Lightweight and frequent operations
-        "gpt4o_mini": OpenAIChat(
-            id="gpt-4o-mini",
-            name="GPT-4o Mini",
-            provider="OpenAI"
-        ),
-
-        # Specialized for analysis tasks
-        "gpt5_mini": OpenAIChat(
-            id="gpt-5-mini",
-            name="GPT-5 Mini",
-            provider="OpenAI"
-        )
-    }
-
-    # Agent-specific model assignments
-    AGENT_MODELS = {
+    # Agent-specific model assignments (read-only)
+    AGENT_MODELS = MappingProxyType({
         # Core coordination - needs complex reasoning
         "coordinator": "claude_sonnet",
 
@@ -85,57 +88,65 @@ class ModelConfig:
 
         # Goal management - tracking and motivation
         "goal_manager": "claude_haiku"
-    }
-
-    # Team-specific model configurations
-    TEAM_MODELS = {
-        "main_coaching_team": {
-            "lead_model": "claude_sonnet",
-            "fallback_model": "gpt4o"
-        },
-        "analysis_team": {
-            "lead_model": "gpt4o",
-            "fallback_model": "claude_sonnet"
-        }
-    }
-
-    # Workflow-specific model configurations
-    WORKFLOW_MODELS = {
-        "daily_checkin": {
-            "primary": "gpt4o_mini",  # Fast daily operations
-            "analysis": "claude_sonnet"  # Deep analysis when needed
-        },
-        "onboarding": {
-            "primary": "gpt4o",  # Structured conversation flow
-            "assessment": "claude_sonnet"  # Complex evaluation
-        }
-    }
+    })
+
+    # Team-specific model configurations (read-only)
+    TEAM_MODELS = MappingProxyType({
+        "main_coaching_team": TeamModels(lead_model="claude_sonnet", fallback_model="gpt4o"),
+        "analysis_team": TeamModels(lead_model="gpt4o", fallback_model="claude_sonnet")
+    })
+
+    # Workflow-specific model configurations (read-only)
+    WORKFLOW_MODELS = MappingProxyType({
+        "daily_checkin": WorkflowModels(
+            primary="gpt4o_mini",  # Fast daily operations
+            analysis="claude_sonnet"  # Deep analysis when needed
+        ),
+        "onboarding": WorkflowModels(
+            primary="gpt4o",  # Structured conversation flow
+            assessment="claude_sonnet"  # Complex evaluation
+        )
+    })
+
+    @staticmethod
+    def get_shared(model_id: str):
+        """
+        The process-wide model instance for a model id
+
+        Agents, teams and workflows asking for the same model id get the same
+        client, so they share one connection pool and warm TLS sessions.
+        """
+        from agents.core.model_registry import get_model
+        provider = "anthropic" if model_id.startswith("claude") else "openai"
+        return get_model(provider, model_id)
+
+    @classmethod
+    def _get(cls, model_key: str):
+        model_id = _MODEL_IDS.get(model_key)
+        return cls.get_shared(model_id) if model_id else None
 
     @classmethod
     def get_model_for_agent(cls, agent_name: str):
         """
         Get the configured model for a specific agent
         """
-        model_key = cls.AGENT_MODELS.get(agent_name, "claude_sonnet")
-        return cls.MODELS.get(model_key)
+        return cls._get(cls.AGENT_MODELS.get(agent_name, "claude_sonnet"))
 
     @classmethod
     def get_model_for_team(cls, team_name: str, role: str = "lead_model"):
         """
         Get the configured model for a team role
         """
-        team_config = cls.TEAM_MODELS.get(team_name, {})
-        model_key = team_config.get(role, "claude_sonnet")
-        return cls.MODELS.get(model_key)
+        model_key = getattr(cls.TEAM_MODELS.get(team_name), role, None)
+        return cls._get(model_key or "claude_sonnet")
 
     @classmethod
     def get_model_for_workflow(cls, workflow_name: str, stage: str = "primary"):
         """
         Get the configured model for a workflow stage
         """
-        workflow_config = cls.WORKFLOW_MODELS.get(workflow_name, {})
-        model_key = workflow_config.get(stage, "claude_sonnet")
-        return cls.MODELS.get(model_key)
+        model_key = getattr(cls.WORKFLOW_MODELS.get(workflow_name), stage, None)
+        return cls._get(model_key or "claude_sonnet")
 
     @classmethod
     def get_cost_optimized_model(cls, task_complexity: str):
@@ -144,15 +155,7 @@ class ModelConfig:
 
         task_complexity: "simple", "moderate", "complex", "analytical"
         """
-        complexity_mapping = {
-            "simple": "gpt4o_mini",
-            "moderate": "claude_haiku",
-            "complex": "claude_sonnet",
-            "analytical": "gpt4o"
-        }
-
-        model_key = complexity_mapping.get(task_complexity, "claude_sonnet")
-        return cls.MODELS.get(model_key)
+        return cls._get(_COMPLEXITY_MAP.get(task_complexity, "claude_sonnet"))
 
     @classmethod
     def get_response_time_optimized_model(cls, priority: str):
@@ -161,12 +164,4 @@ class ModelConfig:
 
         priority: "real_time", "fast", "standard", "deep_analysis"
         """
-        priority_mapping = {
-            "real_time": "gpt4o_mini",
-            "fast": "claude_haiku",
-            "standard": "gpt4o",
-            "deep_analysis": "claude_sonnet"
-        }
-
-        model_key = priority_mapping.get(priority, "claude_sonnet")
-        return cls.MODELS.get(model_key)
\ No newline at end of file
+        return cls._get(_PRIORITY_MAP.get(priority, "claude_sonnet"))
\ No newline at end of file
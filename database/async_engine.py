@@ -0,0 +1,196 @@
+"""
+Async ingest path for Garmin sync fan-in (PostgreSQL + asyncpg).
+
+Sync tasks put rows on a queue and return to their next HTTP request while
+a single writer task drains the queue and streams each batch with asyncpg's
+binary COPY. Network latency to Garmin and write latency to the database
+overlap instead of alternating. Transient database errors are retried; batches
+that still fail go to an optional error sink and are raised from close().
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import JSON
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from config.database_config import INSERT_BATCH_SIZE, db_config
+from database.models.bulk import _copy_plan
+from database.models.health_models import HealthMetric
+from database.view_refresher import view_refresher
+
+logger = logging.getLogger(__name__)
+
+# Attempts per batch for transient errors, backing off exponentially from INGEST_RETRY_BASE_SEC
+INGEST_MAX_ATTEMPTS = int(os.getenv("INGEST_MAX_ATTEMPTS", "5"))
+INGEST_RETRY_BASE_SEC = 0.5
+
+# SQLSTATE classes worth retrying: connection exceptions, transaction rollback
+# (serialization failure, deadlock), insufficient resources, operator intervention
+_TRANSIENT_SQLSTATE_CLASSES = ("08", "40", "53", "57")
+
+Batch = List[Tuple[Any, Dict[str, Any]]]
+
+class IngestError(RuntimeError):
+    """
+    Raised by AsyncIngestWriter.close() for batches that could not be written
+    """
+
+    def __init__(self, failed: List[Tuple[Batch, BaseException]]):
+        self.failed = failed
+        rows = sum(len(batch) for batch, _ in failed)
+        super().__init__(f"{rows} queued rows in {len(failed)} batches were not written: {failed[-1][1]}")
+
+def _is_transient(error: BaseException) -> bool:
+    if isinstance(error, (OSError, asyncio.TimeoutError)):
+        return True
+    if isinstance(error, DBAPIError):
+        if error.connection_invalidated:
+            return True
+        error = error.orig
+    sqlstate = getattr(error, "sqlstate", None) or ""
+    return sqlstate[:2] in _TRANSIENT_SQLSTATE_CLASSES
+
+_async_engine: Optional[AsyncEngine] = None
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Shared asyncpg engine for the configured PostgreSQL database
+    """
+    global _async_engine
+    if _async_engine is None:
+        url = make_url(db_config.get_database_url()).set(drivername="postgresql+asyncpg")
+        _async_engine = create_async_engine(url, **db_config.get_pool_configuration(), pool_pre_ping=False)
+    return _async_engine
+
+@lru_cache(maxsize=None)
+def _record_plan(model_cls) -> Tuple[Tuple[str, ...], Tuple[Any, ...], Tuple[bool, ...]]:
+    # asyncpg's binary COPY takes native datetimes and UUIDs; only JSON needs text
+    columns, _, defaults = _copy_plan(model_cls)
+    table_columns = model_cls.__table__.columns
+    json_flags = tuple(isinstance(table_columns[name].type, JSON) for name in columns)
+    return columns, defaults, json_flags
+
+def _to_record(model_cls, row: Dict[str, Any]) -> tuple:
+    columns, defaults, json_flags = _record_plan(model_cls)
+    record = []
+    for name, default, is_json in zip(columns, defaults, json_flags):
+        value = row.get(name)
+        if value is None and default is not None:
+            value = default()
+        if is_json and value is not None:
+            value = json.dumps(value, default=str)
+        record.append(value)
+    return tuple(record)
+
+class AsyncIngestWriter:
+    """
+    Queue-fed writer that COPYs rows in batches.
+
+    - Flushes when `batch_size` rows are queued or `max_wait_sec` has passed
+    - Rows of different models in one batch are written in one transaction
+    - New health metrics mark the readiness materialized view stale
+    - Each batch is one transaction, so a transient failure is retried whole;
+      batches that still fail are passed to `error_sink` and raised from close()
+    """
+
+    def __init__(self, batch_size: int = INSERT_BATCH_SIZE, max_wait_sec: float = 1.0,
+                 error_sink: Optional[Callable[[Batch, BaseException], None]] = None):
+        self.batch_size = batch_size
+        self.max_wait = max_wait_sec
+        self.error_sink = error_sink
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=batch_size * 10)
+        self._worker: Optional[asyncio.Task] = None
+        self._failed: List[Tuple[Batch, BaseException]] = []
+
+    async def put(self, model_cls, row: Dict[str, Any]):
+        """
+        Queue one row (dict keyed by column name) for the next batch
+        """
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        await self._queue.put((model_cls, row))
+
+    async def close(self):
+        """
+        Write everything still queued, then stop the writer task
+
+        Raises IngestError if any batch failed since the last close()
+        """
+        if self._worker is not None:
+            await self._queue.join()
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        if self._failed:
+            failed, self._failed = self._failed, []
+            raise IngestError(failed)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._flush_with_retry(batch)
+            except Exception as e:
+                logger.error(f"Async ingest of {len(batch)} rows failed: {e}")
+                self._failed.append((batch, e))
+                if self.error_sink is not None:
+                    try:
+                        self.error_sink(batch, e)
+                    except Exception as sink_error:
+                        logger.error(f"Async ingest error sink failed: {sink_error}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush_with_retry(self, batch: Batch):
+        for attempt in range(1, INGEST_MAX_ATTEMPTS + 1):
+            try:
+                await self._flush(batch)
+                return
+            except Exception as e:
+                if attempt == INGEST_MAX_ATTEMPTS or not _is_transient(e):
+                    raise
+                delay = INGEST_RETRY_BASE_SEC * 2 ** (attempt - 1)
+                logger.warning(f"Async ingest attempt {attempt} failed, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+
+    async def _flush(self, batch: Batch):
+        by_model = defaultdict(list)
+        for model_cls, row in batch:
+            by_model[model_cls].append(_to_record(model_cls, row))
+
+        async with get_async_engine().begin() as connection:
+            raw = await connection.get_raw_connection()
+            for model_cls, records in by_model.items():
+                await raw.driver_connection.copy_records_to_table(
+                    model_cls.__tablename__, records=records, columns=list(_record_plan(model_cls)[0])
+                )
+
+        if HealthMetric in by_model:
+            view_refresher.notify_health_metrics()
+
+ingest_writer = AsyncIngestWriter()
@@ -0,0 +1,21 @@
+import os
+import time
+import uuid
+
+from sqlalchemy.orm import declarative_base
+
+# Single declarative root so every model shares one MetaData and mapper registry
+Base = declarative_base()
+
+def new_id() -> uuid.UUID:
+    """
+    Time-ordered UUID (version 7): 48-bit millisecond timestamp followed by random bits
+
+    Keys generated in sequence sort in insertion order, so primary key
+    inserts on append-heavy tables land on the rightmost B-tree leaf
+    instead of a random page.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76  # version 7
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 4122 variant
+    return uuid.UUID(int=value)
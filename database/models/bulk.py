@@ -0,0 +1,156 @@
+"""
+Bulk ingest helpers for append-heavy time-series tables.
+
+Garmin syncs write health metrics, stress events and workouts in bursts.
+Large batches are streamed to PostgreSQL with COPY FROM STDIN, which avoids
+per-row statement overhead; smaller batches and other backends use
+executemany INSERTs, which SQLAlchemy sends as multi-row VALUES pages.
+"""
+
+import csv
+import enum
+import io
+import json
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from sqlalchemy import JSON, DateTime, Enum, insert
+from sqlalchemy.orm import Session
+
+from config.database_config import INSERT_BATCH_SIZE
+from database.models.base import Base
+from database.models.health_models import HealthMetric, SleepSession, StressEvent
+from database.models.training_models import PerformanceMetric, TrainingLoad, Workout
+from database.view_refresher import mark_health_metrics_written
+
+# Below this many rows a multi-row INSERT is cheaper than setting up COPY
+COPY_THRESHOLD = 100
+
+# NULL marker used in the COPY stream
+_COPY_NULL = "\\N"
+
+# Built once; the engine's compiled cache then reuses the rendered SQL across sessions
+_INSERT_STMTS = {
+    model_cls: insert(model_cls)
+    for model_cls in (HealthMetric, SleepSession, StressEvent, Workout, TrainingLoad, PerformanceMetric)
+}
+
+def _encode_json(value: Any) -> str:
+    return json.dumps(value, default=str)
+
+def _encode_datetime(value: Any) -> str:
+    return value.isoformat()
+
+def _encode_enum(value: Any) -> str:
+    return value.value if isinstance(value, enum.Enum) else value
+
+@lru_cache(maxsize=None)
+def _copy_plan(model_cls) -> Tuple[Tuple[str, ...], Tuple[Optional[Callable], ...], Tuple[Optional[Callable], ...]]:
+    """
+    Column names, per-column encoders and Python-side defaults for a model
+
+    Built once per model so rows are serialized without per-value type checks.
+    COPY bypasses the ORM, so client-side defaults (e.g. generated ids) are
+    applied here. Server-filled columns (e.g. created_at) are left out of the
+    column list so PostgreSQL applies their defaults.
+    """
+    columns, encoders, defaults = [], [], []
+    for column in model_cls.__table__.columns:
+        if column.server_default is not None:
+            continue
+        columns.append(column.name)
+
+        if isinstance(column.type, JSON):
+            encoders.append(_encode_json)
+        elif isinstance(column.type, DateTime):
+            encoders.append(_encode_datetime)
+        elif isinstance(column.type, Enum):
+            encoders.append(_encode_enum)
+        else:
+            encoders.append(None)
+
+        default = column.default
+        if default is None:
+            defaults.append(None)
+        elif default.is_callable:
+            # SQLAlchemy wraps default callables to accept an execution context
+            defaults.append(lambda arg=default.arg: arg(None))
+        else:
+            defaults.append(lambda value=default.arg: value)
+
+    return tuple(columns), tuple(encoders), tuple(defaults)
+
+def bulk_insert(session: Session, model_cls, rows: Iterable[Dict[str, Any]],
+                batch_size: int = INSERT_BATCH_SIZE) -> int:
+    """
+    Insert rows with executemany in chunks of `batch_size`
+
+    Rows are consumed lazily, so large generators are never fully
+    materialized. Returns the number of rows written.
+    """
+    statement = _INSERT_STMTS.get(model_cls)
+    if statement is None:
+        statement = insert(model_cls)
+    if model_cls is HealthMetric:
+        # Core inserts skip the ORM flush hooks; readiness is refreshed once the session commits
+        mark_health_metrics_written(session)
+    iterator = iter(rows)
+    written = 0
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return written
+        session.execute(statement, batch)
+        written += len(batch)
+
+def bulk_copy_insert(session: Session, model_cls, rows: Sequence[Dict[str, Any]],
+                     threshold: int = COPY_THRESHOLD) -> int:
+    """
+    Insert rows (dicts keyed by column name) into the model's table
+
+    Uses COPY on PostgreSQL for batches of at least `threshold` rows and
+    bulk_insert otherwise. Returns the number of rows written.
+    """
+    if not rows:
+        return 0
+
+    if len(rows) < threshold or session.get_bind().dialect.name != "postgresql":
+        return bulk_insert(session, model_cls, rows)
+
+    columns, encoders, defaults = _copy_plan(model_cls)
+    plan = tuple(zip(columns, encoders, defaults))
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter="\t", lineterminator="\n")
+    for row in rows:
+        record = []
+        for name, encode, default in plan:
+            value = row.get(name)
+            if value is None and default is not None:
+                value = default()
+            if value is None:
+                record.append(_COPY_NULL)
+            else:
+                record.append(encode(value) if encode else value)
+        writer.writerow(record)
+    buffer.seek(0)
+
+    statement = (
+        f"COPY {model_cls.__tablename__} ({', '.join(columns)}) "
+        "FROM STDIN WITH (FORMAT csv, DELIMITER E'\\t', NULL '\\N')"
+    )
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(statement, buffer)
+    finally:
+        cursor.close()
+
+    if model_cls is HealthMetric:
+        mark_health_metrics_written(session)
+
+    return len(rows)
+
+# Build the COPY plans of every mapped model once at import, not on the first sync
+for _mapper in Base.registry.mappers:
+    _copy_plan(_mapper.class_)
@@ -0,0 +1,103 @@
+"""
+Closed vocabularies for low-cardinality categorical columns.
+
+Stored as native ENUM types on PostgreSQL (4 bytes per value) and as
+VARCHAR elsewhere. Members subclass str, so comparisons and assignments
+with the plain string values keep working.
+"""
+
+import enum
+import re
+
+from sqlalchemy import Enum
+
+class FitnessLevel(str, enum.Enum):
+    BEGINNER = "beginner"
+    INTERMEDIATE = "intermediate"
+    ADVANCED = "advanced"
+
+class ActivityLevel(str, enum.Enum):
+    SEDENTARY = "sedentary"
+    LIGHTLY_ACTIVE = "lightly_active"
+    MODERATELY_ACTIVE = "moderately_active"
+    VERY_ACTIVE = "very_active"
+    EXTREMELY_ACTIVE = "extremely_active"
+
+class CoachingStyle(str, enum.Enum):
+    SUPPORTIVE = "supportive"
+    DIRECT = "direct"
+    TECHNICAL = "technical"
+
+class Confidence(str, enum.Enum):
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+
+class TrendDirection(str, enum.Enum):
+    IMPROVING = "improving"
+    STABLE = "stable"
+    DECLINING = "declining"
+
+class RiskLevel(str, enum.Enum):
+    LOW = "low"
+    MODERATE = "moderate"
+    HIGH = "high"
+
+class StressCategory(str, enum.Enum):
+    REST = "rest"
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+
+class AlertSeverity(str, enum.Enum):
+    INFO = "info"
+    WARNING = "warning"
+    URGENT = "urgent"
+
+class AlertStatus(str, enum.Enum):
+    ACTIVE = "active"
+    ACKNOWLEDGED = "acknowledged"
+    RESOLVED = "resolved"
+
+class Sport(str, enum.Enum):
+    RUNNING = "running"
+    CYCLING = "cycling"
+    SWIMMING = "swimming"
+    STRENGTH = "strength"
+    OTHER = "other"
+
+class WorkoutType(str, enum.Enum):
+    EASY_RUN = "easy_run"
+    LONG_RUN = "long_run"
+    TEMPO = "tempo"
+    THRESHOLD = "threshold"
+    INTERVALS = "intervals"
+    STRENGTH = "strength"
+    RECOVERY = "recovery"
+    CROSS_TRAINING = "cross_training"
+
+class WorkoutStatus(str, enum.Enum):
+    PLANNED = "planned"
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    SKIPPED = "skipped"
+
+class WorkoutQuality(str, enum.Enum):
+    EXCELLENT = "excellent"
+    GOOD = "good"
+    AVERAGE = "average"
+    POOR = "poor"
+
+class PlanStatus(str, enum.Enum):
+    ACTIVE = "active"
+    PAUSED = "paused"
+    COMPLETED = "completed"
+    ARCHIVED = "archived"
+
+def db_enum(enum_cls) -> Enum:
+    """
+    Column type storing the member values, in a PostgreSQL type named after the class
+    e.g. WorkoutType -> workout_type_enum
+    """
+    name = re.sub(r"(?<!^)(?=[A-Z])", "_", enum_cls.__name__).lower() + "_enum"
+    return Enum(enum_cls, name=name, values_callable=lambda members: [member.value for member in members])
@@ -1,74 +1,107 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, JSON, ForeignKey
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, Integer, SmallInteger, String, Float, REAL, DateTime, Boolean, Text, ForeignKeyConstraint, Index, Uuid, func
 from sqlalchemy.orm import relationship
-from datetime import datetime
 
-Base = declarative_base()
+from database.models.base import Base, new_id
+from database.models.enums import AlertSeverity, AlertStatus, RiskLevel, StressCategory, TrendDirection, db_enum
+from database.models.types import JSONType
 
 class HealthMetric(Base):
     """
     Daily health and wellness metrics from wearable devices
     """
     __tablename__ = "health_metrics"
-
-    id = Column(String, primary_key=True)
+    __table_args__ = (
+        Index("ix_health_metrics_user_date", "user_id", "date"),
+        Index("ix_health_metrics_date_brin", "date", postgresql_using="brin"),
+        # Monthly range partitions on PostgreSQL, see database/partitions.py
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+
+    # The partition key must be part of the primary key
+    id = Column(Uuid, primary_key=True, default=new_id)
     user_id = Column(String, nullable=False)
-    date = Column(DateTime, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    date = Column(DateTime, primary_key=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Heart rate metrics
-    resting_heart_rate = Column(Integer)
+    resting_heart_rate = Column(SmallInteger)
     heart_rate_variability = Column(Float)  # RMSSD in milliseconds
-    max_heart_rate_today = Column(Integer)
-    avg_heart_rate_today = Column(Integer)
+    max_heart_rate_today = Column(SmallInteger)
+    avg_heart_rate_today = Column(SmallInteger)
 
     # Sleep metrics
-    sleep_duration_minutes = Column(Integer)
-    sleep_efficiency_percentage = Column(Float)
-    deep_sleep_minutes = Column(Integer)
-    light_sleep_minutes = Column(Integer)
-    rem_sleep_minutes = Column(Integer)
-    awake_minutes = Column(Integer)
-    sleep_score = Column(Float)  # Overall sleep quality score
+    sleep_duration_minutes = Column(SmallInteger)
+    sleep_efficiency_percentage = Column(REAL)
+    deep_sleep_minutes = Column(SmallInteger)
+    light_sleep_minutes = Column(SmallInteger)
+    rem_sleep_minutes = Column(SmallInteger)
+    awake_minutes = Column(SmallInteger)
+    sleep_score = Column(REAL)  # Overall sleep quality score
 
     # Stress and recovery
-    stress_level_avg = Column(Float)  # Average stress (0-100)
-    stress_level_max = Column(Float)  # Peak stress
-    body_battery_start = Column(Integer)  # Energy at day start
-    body_battery_end = Column(Integer)  # Energy at day end
-    body_battery_charged = Column(Integer)  # Energy gained during rest
-    body_battery_drained = Column(Integer)  # Energy consumed during activity
-
-    # Activity summary
+    stress_level_avg = Column(REAL)  # Average stress (0-100)
+    stress_level_max = Column(REAL)  # Peak stress
+    body_battery_start = Column(SmallInteger)  # Energy at day start
+    body_battery_end = Column(SmallInteger)  # Energy at day end
+    body_battery_charged = Column(SmallInteger)  # Energy gained during rest
+    body_battery_drained = Column(SmallInteger)  # Energy consumed during activity
+
+    # Activity summary read by dashboards; the rest is in HealthMetricExtended
     steps = Column(Integer)
-    floors_climbed = Column(Integer)
-    calories_burned = Column(Integer)
-    active_calories = Column(Integer)
-    distance_meters = Column(Float)
-    active_minutes = Column(Integer)
-    sedentary_minutes = Column(Integer)
+    active_minutes = Column(SmallInteger)
 
     # Additional wellness
     respiration_rate = Column(Float)  # Breaths per minute
-    pulse_ox = Column(Float)  # Blood oxygen saturation
+    pulse_ox = Column(REAL)  # Blood oxygen saturation
     hydration_level = Column(String)  # well_hydrated, adequate, dehydrated
 
+    # Rarely read columns live in health_metrics_extended to keep this row narrow
+    extended = relationship("HealthMetricExtended", back_populates="metric", uselist=False,
+                            cascade="all, delete-orphan")
+
+
+class HealthMetricExtended(Base):
+    """
+    Cold activity summary and data quality columns for a HealthMetric row
+    Shares the HealthMetric primary key; health_metrics_full joins the two
+    """
+    __tablename__ = "health_metrics_extended"
+    __table_args__ = (
+        ForeignKeyConstraint(["id", "date"], ["health_metrics.id", "health_metrics.date"], ondelete="CASCADE"),
+    )
+
+    id = Column(Uuid, primary_key=True)
+    date = Column(DateTime, primary_key=True)
+
+    # Activity summary
+    floors_climbed = Column(SmallInteger)
+    calories_burned = Column(Integer)
+    active_calories = Column(Integer)
+    distance_meters = Column(Float)
+    sedentary_minutes = Column(SmallInteger)
+
     # Data quality indicators
-    data_completeness = Column(Float)  # Percentage of complete data
-    device_wear_time = Column(Integer)  # Minutes device was worn
+    data_completeness = Column(REAL)  # Percentage of complete data
+    device_wear_time = Column(SmallInteger)  # Minutes device was worn
     sync_timestamp = Column(DateTime)
 
+    metric = relationship("HealthMetric", back_populates="extended")
+
 
 class SleepSession(Base):
     """
     Detailed sleep session data with stages and events
     """
     __tablename__ = "sleep_sessions"
+    __table_args__ = (
+        Index("ix_sleep_sessions_user_date", "user_id", "sleep_date"),
+        Index("ix_sleep_sessions_date_brin", "sleep_date", postgresql_using="brin"),
+    )
 
-    id = Column(String, primary_key=True)
+    id = Column(Uuid, primary_key=True, default=new_id)
     user_id = Column(String, nullable=False)
     sleep_date = Column(DateTime, nullable=False)  # Date of sleep (evening start)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Sleep timing
     bedtime = Column(DateTime)
@@ -77,36 +110,36 @@ class SleepSession(Base):
     get_up_time = Column(DateTime)  # When got out of bed
 
     # Sleep quality metrics
-    total_sleep_time = Column(Integer)  # Minutes of actual sleep
-    sleep_efficiency = Column(Float)  # TST / Time in bed
-    sleep_onset_latency = Column(Integer)  # Minutes to fall asleep
-    wake_after_sleep_onset = Column(Integer)  # Minutes awake during night
-    number_of_awakenings = Column(Integer)
+    total_sleep_time = Column(SmallInteger)  # Minutes of actual sleep
+    sleep_efficiency = Column(REAL)  # TST / Time in bed
+    sleep_onset_latency = Column(SmallInteger)  # Minutes to fall asleep
+    wake_after_sleep_onset = Column(SmallInteger)  # Minutes awake during night
+    number_of_awakenings = Column(SmallInteger)
 
     # Sleep stages (minutes)
-    light_sleep = Column(Integer)
-    deep_sleep = Column(Integer)
-    rem_sleep = Column(Integer)
-    awake_time = Column(Integer)
+    light_sleep = Column(SmallInteger)
+    deep_sleep = Column(SmallInteger)
+    rem_sleep = Column(SmallInteger)
+    awake_time = Column(SmallInteger)
 
     # Sleep stage percentages
-    light_sleep_percentage = Column(Float)
-    deep_sleep_percentage = Column(Float)
-    rem_sleep_percentage = Column(Float)
+    light_sleep_percentage = Column(REAL)
+    deep_sleep_percentage = Column(REAL)
+    rem_sleep_percentage = Column(REAL)
 
     # Sleep scoring and analysis
-    sleep_score = Column(Float)  # Overall quality score (0-100)
+    sleep_score = Column(REAL)  # Overall quality score (0-100)
     restfulness = Column(Float)  # How restful the sleep was
     timing_score = Column(Float)  # Consistency with sleep schedule
     duration_score = Column(Float)  # Adequacy of sleep duration
 
     # Environmental factors
     bedroom_temperature = Column(Float)
-    environmental_data = Column(JSON)  # Noise, light, etc.
+    environmental_data = Column(JSONType)  # Noise, light, etc.
 
     # Subjective measures
-    subjective_quality = Column(Integer)  # User-rated quality (1-5)
-    morning_energy = Column(Integer)  # Energy level on waking (1-5)
+    subjective_quality = Column(SmallInteger)  # User-rated quality (1-5)
+    morning_energy = Column(SmallInteger)  # Energy level on waking (1-5)
     sleep_notes = Column(Text)  # User notes about sleep
 
 
@@ -115,16 +148,21 @@ class StressEvent(Base):
     Stress monitoring and stress events throughout the day
     """
     __tablename__ = "stress_events"
+    __table_args__ = (
+        Index("ix_stress_events_user_timestamp", "user_id", "timestamp"),
+        Index("ix_stress_events_timestamp_brin", "timestamp", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
 
-    id = Column(String, primary_key=True)
+    id = Column(Uuid, primary_key=True, default=new_id)
     user_id = Column(String, nullable=False)
-    timestamp = Column(DateTime, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, primary_key=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Stress measurements
-    stress_level = Column(Float)  # Stress level (0-100)
-    stress_category = Column(String)  # rest, low, medium, high
-    duration_minutes = Column(Integer)  # How long stress lasted
+    stress_level = Column(REAL)  # Stress level (0-100)
+    stress_category = Column(db_enum(StressCategory))  # rest, low, medium, high
+    duration_minutes = Column(SmallInteger)  # How long stress lasted
 
     # Context information
     event_type = Column(String)  # work, exercise, personal, unknown
@@ -132,18 +170,18 @@ class StressEvent(Base):
     location_context = Column(String)  # Where user was
 
     # Physiological markers
-    heart_rate_during = Column(Integer)
+    heart_rate_during = Column(SmallInteger)
     hrv_during = Column(Float)
     respiration_rate = Column(Float)
 
     # Recovery information
-    recovery_time = Column(Integer)  # Minutes to return to baseline
+    recovery_time = Column(SmallInteger)  # Minutes to return to baseline
     recovery_complete = Column(Boolean, default=False)
 
     # User input
     stress_trigger = Column(String)  # User-identified cause
     coping_strategy = Column(String)  # How user handled stress
-    effectiveness_rating = Column(Integer)  # How well strategy worked (1-5)
+    effectiveness_rating = Column(SmallInteger)  # How well strategy worked (1-5)
 
 
 class WellnessAssessment(Base):
@@ -155,7 +193,7 @@ class WellnessAssessment(Base):
     id = Column(String, primary_key=True)
     user_id = Column(String, nullable=False)
     assessment_date = Column(DateTime, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Assessment period
     assessment_type = Column(String)  # daily, weekly, monthly
@@ -169,24 +207,24 @@ class WellnessAssessment(Base):
     energy_score = Column(Float)  # Energy levels (0-100)
 
     # Individual domain scores
-    sleep_score = Column(Float)
+    sleep_score = Column(REAL)
     stress_score = Column(Float)
     activity_score = Column(Float)
     hrv_score = Column(Float)
     nutrition_score = Column(Float)
 
     # Trend analysis
-    trend_direction = Column(String)  # improving, stable, declining
+    trend_direction = Column(db_enum(TrendDirection))  # improving, stable, declining
     trend_strength = Column(String)  # strong, moderate, weak
     trend_confidence = Column(Float)  # Statistical confidence
 
     # Recommendations
     primary_recommendation = Column(String)
-    secondary_recommendations = Column(JSON)
-    focus_areas = Column(JSON)  # Areas needing attention
+    secondary_recommendations = Column(JSONType)
+    focus_areas = Column(JSONType)  # Areas needing attention
 
     # Risk assessment
-    health_risk_level = Column(String)  # low, moderate, high
+    health_risk_level = Column(db_enum(RiskLevel))  # low, moderate, high
     overtraining_risk = Column(Float)  # Risk percentage
     illness_risk = Column(Float)  # Risk percentage
     injury_risk = Column(Float)  # Risk percentage
@@ -204,18 +242,18 @@ class HealthAlert(Base):
 
     id = Column(String, primary_key=True)
     user_id = Column(String, nullable=False)
-    alert_timestamp = Column(DateTime, default=datetime.utcnow)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    alert_timestamp = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Alert classification
     alert_type = Column(String)  # hrv_deviation, poor_sleep, high_stress
-    severity_level = Column(String)  # info, warning, urgent
+    severity_level = Column(db_enum(AlertSeverity))  # info, warning, urgent
     category = Column(String)  # recovery, performance, health
 
     # Alert content
     title = Column(String, nullable=False)
     message = Column(Text, nullable=False)
-    detailed_analysis = Column(JSON)
+    detailed_analysis = Column(JSONType)
 
     # Data that triggered alert
     trigger_metric = Column(String)
@@ -224,12 +262,12 @@ class HealthAlert(Base):
     deviation_magnitude = Column(Float)
 
     # Recommendations
-    immediate_actions = Column(JSON)
-    lifestyle_adjustments = Column(JSON)
+    immediate_actions = Column(JSONType)
+    lifestyle_adjustments = Column(JSONType)
     medical_consultation = Column(Boolean, default=False)
 
     # Status tracking
-    status = Column(String, default="active")  # active, acknowledged, resolved
+    status = Column(db_enum(AlertStatus), default=AlertStatus.ACTIVE)  # active, acknowledged, resolved
     acknowledged_at = Column(DateTime)
     resolved_at = Column(DateTime)
     user_response = Column(Text)
@@ -0,0 +1,62 @@
+"""
+Read query helpers that keep relationship loading explicit.
+
+Queries built with safe_query eager-load exactly the relationships they name
+and raise on any other relationship access, so a new lazy load (and the N+1
+query pattern it brings) fails loudly instead of silently adding queries.
+"""
+
+from functools import lru_cache
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, raiseload, selectinload
+
+from database.models.user_models import User, UserSession
+
+def safe_query(model, *loads):
+    """
+    select(model) that loads `loads` eagerly and forbids every other lazy load
+    """
+    return select(model).options(*loads, raiseload("*"))
+
+def load_user_dashboard(session: Session, user_id: str):
+    """
+    User with profile, baselines and active sessions in three queries total
+    """
+    statement = safe_query(
+        User,
+        selectinload(User.profile),
+        selectinload(User.baselines),
+        selectinload(User.sessions.and_(UserSession.is_active == True))
+    ).where(User.id == user_id)
+    return session.execute(statement).scalar_one_or_none()
+
+@lru_cache(maxsize=None)
+def _lazy_raiseloads(mapper) -> tuple:
+    # Only relationships left on the default lazy "select" strategy; mapper-level
+    # eager defaults (selectin, joined) load the same way they do in production
+    return tuple(
+        raiseload(relationship.class_attribute)
+        for relationship in mapper.relationships
+        if relationship.lazy in ("select", True)
+    )
+
+def _raise_on_lazy_load(orm_execute_state):
+    # Loader-issued queries (selectin, column refreshes) are what the options asked for
+    if orm_execute_state.is_select and not (
+        orm_execute_state.is_relationship_load or orm_execute_state.is_column_load
+    ):
+        options = [option for mapper in orm_execute_state.all_mappers for option in _lazy_raiseloads(mapper)]
+        if options:
+            orm_execute_state.statement = orm_execute_state.statement.options(*options)
+
+def enable_strict_loading():
+    """
+    Make lazily loaded relationships raise for every ORM select in the process
+
+    Used in the testing environment so that relationship access not covered
+    by an explicit loader option fails the test. Relationships declared eager
+    on the mapper are left alone, so tests load exactly what production does.
+    """
+    if not event.contains(Session, "do_orm_execute", _raise_on_lazy_load):
+        event.listen(Session, "do_orm_execute", _raise_on_lazy_load)
@@ -0,0 +1,158 @@
+"""
+In-process cache of workout templates.
+
+Templates are reference data: their content only changes through admin
+edits, while plan generation looks them up constantly. The whole table is
+loaded once and indexed by id, by (sport, workout_type) and by tag. Writers
+call notify_templates_changed() in their transaction; on PostgreSQL a
+LISTEN thread then drops the cache so the next lookup reloads it.
+"""
+
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, text, update
+from sqlalchemy.orm import Session
+
+from config.database_config import db_config
+from database.models.training_models import WorkoutTemplate
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_CHANNEL = "workout_templates_changed"
+
+# Seconds between LISTEN reconnection attempts after the connection drops
+LISTEN_RETRY_SEC = 5.0
+
+def notify_templates_changed(session: Session):
+    """
+    Invalidate every process's template cache once the session commits
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        # Delivered by PostgreSQL only at commit
+        session.execute(text(f"NOTIFY {TEMPLATE_CHANNEL}"))
+    else:
+        # Dropping the snapshot before commit would let a concurrent lookup reload the old rows
+        event.listen(session, "after_commit", lambda _: template_cache.invalidate(), once=True)
+
+def record_template_usage(session: Session, template_id: str):
+    """
+    Bump usage_count in the database without touching the cached template body
+    """
+    session.execute(
+        update(WorkoutTemplate)
+        .where(WorkoutTemplate.id == template_id)
+        .values(usage_count=WorkoutTemplate.usage_count + 1)
+    )
+
+class TemplateCache:
+    """
+    Lazily loaded, read-only snapshot of the workout_templates table.
+
+    Cached templates are detached ORM instances; treat them as immutable
+    and write changes through a session instead.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_id: Optional[Dict[str, WorkoutTemplate]] = None
+        self._by_type: Dict[Tuple[str, str], List[WorkoutTemplate]] = {}
+        self._by_tag: Dict[str, List[WorkoutTemplate]] = {}
+        self._listener: Optional[threading.Thread] = None
+
+    def get(self, template_id: str) -> Optional[WorkoutTemplate]:
+        return self._snapshot()[0].get(template_id)
+
+    def by_type(self, sport: str, workout_type: str) -> List[WorkoutTemplate]:
+        return self._snapshot()[1].get((sport, workout_type), [])
+
+    def with_tag(self, tag: str) -> List[WorkoutTemplate]:
+        return self._snapshot()[2].get(tag, [])
+
+    def invalidate(self):
+        """
+        Drop the snapshot; the next lookup reloads the table
+        """
+        with self._lock:
+            self._by_id = None
+
+    def _snapshot(self):
+        with self._lock:
+            if self._by_id is None:
+                self._load()
+            return self._by_id, self._by_type, self._by_tag
+
+    def _load(self):
+        if db_config.engine is None:
+            db_config.create_engine()
+
+        # expire_on_commit=False keeps attributes readable after the session closes
+        with Session(db_config.engine, expire_on_commit=False) as session:
+            templates = session.query(WorkoutTemplate).all()
+
+        by_type = defaultdict(list)
+        by_tag = defaultdict(list)
+        for template in templates:
+            by_type[(template.sport, template.workout_type)].append(template)
+            for tag in template.tags or []:
+                by_tag[tag].append(template)
+
+        self._by_id = {template.id: template for template in templates}
+        self._by_type = dict(by_type)
+        self._by_tag = dict(by_tag)
+        logger.info(f"Loaded {len(templates)} workout templates into cache")
+
+    def start_listener(self):
+        """
+        Invalidate on NOTIFY from other processes (PostgreSQL only)
+        """
+        if self._listener is not None or not db_config.get_database_url().startswith("postgresql"):
+            return
+        self._listener = threading.Thread(target=self._listen, name="template-cache-listener", daemon=True)
+        self._listener.start()
+
+    def _listen(self):
+        """
+        LISTEN loop; reconnects after any connection error for the life of the process
+        """
+        while True:
+            connection = None
+            try:
+                connection = self._listen_connection()
+                # Notifications sent while disconnected are lost, so start from a fresh snapshot
+                self.invalidate()
+                while True:
+                    if select.select([connection], [], [], 60.0) == ([], [], []):
+                        continue
+                    connection.poll()
+                    if connection.notifies:
+                        connection.notifies.clear()
+                        self.invalidate()
+            except Exception as e:
+                logger.error(f"Template cache listener lost its connection, retrying in {LISTEN_RETRY_SEC}s: {e}")
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+                time.sleep(LISTEN_RETRY_SEC)
+
+    @staticmethod
+    def _listen_connection():
+        if db_config.engine is None:
+            db_config.create_engine()
+
+        # Detached from the pool: the pool regains the slot and the connection is ours to keep
+        pooled = db_config.engine.raw_connection()
+        pooled.detach()
+        connection = pooled.driver_connection
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {TEMPLATE_CHANNEL}")
+        return connection
+
+template_cache = TemplateCache()
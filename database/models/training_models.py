@@ -1,9 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, JSON, ForeignKey
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, Integer, SmallInteger, String, Float, DateTime, Boolean, Text, ForeignKey, Index, UniqueConstraint, Uuid, func
 from sqlalchemy.orm import relationship
-from datetime import datetime
 
-Base = declarative_base()
+from database.models.base import Base, new_id
+from database.models.enums import Confidence, FitnessLevel, PlanStatus, Sport, TrendDirection, WorkoutQuality, WorkoutStatus, WorkoutType, db_enum
+from database.models.types import JSONType
 
 class TrainingPlan(Base):
     """
@@ -13,79 +13,89 @@ class TrainingPlan(Base):
 
     id = Column(String, primary_key=True)
     user_id = Column(String, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Plan metadata
     name = Column(String, nullable=False)
     description = Column(Text)
     plan_type = Column(String)  # base_building, race_prep, general_fitness
-    duration_weeks = Column(Integer)
-    difficulty_level = Column(String)  # beginner, intermediate, advanced
+    duration_weeks = Column(SmallInteger)
+    difficulty_level = Column(db_enum(FitnessLevel))  # beginner, intermediate, advanced
 
     # Plan structure
-    phases = Column(JSON)  # Training phases and periodization
-    weekly_structure = Column(JSON)  # Days per week, session types
-    progression_strategy = Column(JSON)  # How plan progresses over time
+    phases = Column(JSONType)  # Training phases and periodization
+    weekly_structure = Column(JSONType)  # Days per week, session types
+    progression_strategy = Column(JSONType)  # How plan progresses over time
 
     # Goals and targets
     primary_goal = Column(String)
-    target_events = Column(JSON)  # Races or events this plan targets
-    performance_targets = Column(JSON)  # Specific performance goals
+    target_events = Column(JSONType)  # Races or events this plan targets
+    performance_targets = Column(JSONType)  # Specific performance goals
 
     # Plan status
-    status = Column(String, default="active")  # active, paused, completed, archived
+    status = Column(db_enum(PlanStatus), default=PlanStatus.ACTIVE)  # active, paused, completed, archived
     start_date = Column(DateTime)
     end_date = Column(DateTime)
     completion_percentage = Column(Float, default=0.0)
 
     # Adaptations and modifications
     original_plan_id = Column(String)  # If adapted from another plan
-    adaptations_made = Column(JSON)  # Record of plan modifications
+    adaptations_made = Column(JSONType)  # Record of plan modifications
     adherence_rate = Column(Float)  # Percentage of workouts completed
 
+    # Children are loaded with one IN (...) query per plan batch
+    workouts = relationship("Workout", back_populates="training_plan", lazy="selectin",
+                            order_by="Workout.planned_date")
+
 
 class Workout(Base):
     """
     Individual workout sessions within a training plan
     """
     __tablename__ = "workouts"
+    __table_args__ = (
+        Index("ix_workouts_user_planned_status", "user_id", "planned_date", "status"),
+    )
 
-    id = Column(String, primary_key=True)
+    id = Column(Uuid, primary_key=True, default=new_id)
     training_plan_id = Column(String, ForeignKey("training_plans.id"))
-    user_id = Column(String, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Workout planning
     planned_date = Column(DateTime)
-    workout_type = Column(String)  # easy_run, intervals, strength, recovery
-    sport = Column(String)  # running, cycling, swimming, strength
+    workout_type = Column(db_enum(WorkoutType))  # easy_run, intervals, strength, recovery
+    sport = Column(db_enum(Sport))  # running, cycling, swimming, strength
     category = Column(String)  # endurance, speed, strength, recovery
 
     # Workout structure
     name = Column(String, nullable=False)
     description = Column(Text)
     instructions = Column(Text)
-    workout_structure = Column(JSON)  # Detailed workout steps/intervals
+    workout_structure = Column(JSONType)  # Detailed workout steps/intervals
     estimated_duration = Column(Integer)  # Minutes
     estimated_tss = Column(Float)  # Training Stress Score
 
     # Execution tracking
-    status = Column(String, default="planned")  # planned, in_progress, completed, skipped
+    status = Column(db_enum(WorkoutStatus), default=WorkoutStatus.PLANNED)  # planned, in_progress, completed, skipped
     actual_date = Column(DateTime)
     actual_duration = Column(Integer)
     completion_notes = Column(Text)
 
     # Performance data (populated after completion)
     garmin_activity_id = Column(String)
-    performance_data = Column(JSON)  # Detailed performance metrics
-    perceived_exertion = Column(Integer)  # RPE 1-10
-    workout_quality = Column(String)  # excellent, good, average, poor
+    performance_data = Column(JSONType)  # Detailed performance metrics
+    perceived_exertion = Column(SmallInteger)  # RPE 1-10
+    workout_quality = Column(db_enum(WorkoutQuality))  # excellent, good, average, poor
 
     # Analysis results
     actual_tss = Column(Float)
-    training_zones_distribution = Column(JSON)  # Time in each zone
-    performance_analysis = Column(JSON)  # Analysis from TrainingAnalyzer
+    training_zones_distribution = Column(JSONType)  # Time in each zone
+    performance_analysis = Column(JSONType)  # Analysis from TrainingAnalyzer
+
+    training_plan = relationship("TrainingPlan", back_populates="workouts", lazy="joined")
+    performance_metrics = relationship("PerformanceMetric", back_populates="workout", lazy="selectin")
 
 
 class WorkoutTemplate(Base):
@@ -93,34 +103,39 @@ class WorkoutTemplate(Base):
     Reusable workout templates for consistent training
     """
     __tablename__ = "workout_templates"
+    __table_args__ = (
+        # Serves containment filters such as tags @> '["tempo"]'
+        Index("ix_workout_templates_tags_gin", "tags", postgresql_using="gin",
+              postgresql_ops={"tags": "jsonb_path_ops"}),
+    )
 
     id = Column(String, primary_key=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Template metadata
     name = Column(String, nullable=False)
     description = Column(Text)
-    sport = Column(String)
-    workout_type = Column(String)
-    difficulty_level = Column(String)
+    sport = Column(db_enum(Sport))
+    workout_type = Column(db_enum(WorkoutType))
+    difficulty_level = Column(db_enum(FitnessLevel))
     estimated_duration = Column(Integer)
 
     # Template structure
-    workout_structure = Column(JSON)  # Workout intervals and structure
+    workout_structure = Column(JSONType)  # Workout intervals and structure
     instructions = Column(Text)
     coaching_tips = Column(Text)
-    equipment_needed = Column(JSON)
+    equipment_needed = Column(JSONType)
 
     # Usage and effectiveness
     usage_count = Column(Integer, default=0)
     average_rating = Column(Float)
-    tags = Column(JSON)  # Searchable tags
+    tags = Column(JSONType)  # Searchable tags
 
     # Customization options
     is_customizable = Column(Boolean, default=True)
-    variable_parameters = Column(JSON)  # Parameters that can be adjusted
-    adaptation_rules = Column(JSON)  # How template adapts to user level
+    variable_parameters = Column(JSONType)  # Parameters that can be adjusted
+    adaptation_rules = Column(JSONType)  # How template adapts to user level
 
 
 class TrainingLoad(Base):
@@ -128,11 +143,16 @@ class TrainingLoad(Base):
     Training load tracking and management
     """
     __tablename__ = "training_load"
+    __table_args__ = (
+        # One row per user and day; also the conflict target of the training load trigger
+        UniqueConstraint("user_id", "date", name="uq_training_load_user_date"),
+        Index("ix_training_load_date_brin", "date", postgresql_using="brin"),
+    )
 
     id = Column(String, primary_key=True)
     user_id = Column(String, nullable=False)
     date = Column(DateTime, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Training stress scores
     daily_tss = Column(Float, default=0.0)
@@ -152,7 +172,7 @@ class TrainingLoad(Base):
     load_trend = Column(String)  # increasing, stable, decreasing
 
     # Recovery metrics
-    recovery_time_needed = Column(Integer)  # Hours until next hard session
+    recovery_time_needed = Column(SmallInteger)  # Hours until next hard session
     adaptation_state = Column(String)  # adapting, adapted, maladapted
 
 
@@ -161,30 +181,35 @@ class PerformanceMetric(Base):
     Key performance indicators and benchmarks
     """
     __tablename__ = "performance_metrics"
+    __table_args__ = (
+        Index("ix_performance_metrics_user_date", "user_id", "metric_date"),
+    )
 
-    id = Column(String, primary_key=True)
+    id = Column(Uuid, primary_key=True, default=new_id)
     user_id = Column(String, nullable=False)
-    workout_id = Column(String, ForeignKey("workouts.id"))
+    workout_id = Column(Uuid, ForeignKey("workouts.id"))
     metric_date = Column(DateTime, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Metric identification
     metric_type = Column(String)  # vo2_max, threshold_pace, max_power
-    sport = Column(String)
+    sport = Column(db_enum(Sport))
     test_type = Column(String)  # field_test, lab_test, workout_derived
 
     # Metric values
     value = Column(Float, nullable=False)
     units = Column(String, nullable=False)
-    confidence_level = Column(String)  # high, medium, low
-    test_conditions = Column(JSON)  # Weather, equipment, course details
+    confidence_level = Column(db_enum(Confidence))  # high, medium, low
+    test_conditions = Column(JSONType)  # Weather, equipment, course details
 
     # Context and analysis
     improvement_from_baseline = Column(Float)  # Percentage improvement
     percentile_ranking = Column(Float)  # Age/gender percentile
-    trend_direction = Column(String)  # improving, stable, declining
+    trend_direction = Column(db_enum(TrendDirection))  # improving, stable, declining
     next_test_recommended = Column(DateTime)
 
     # Related data
-    contributing_factors = Column(JSON)  # Training, recovery, etc.
-    external_factors = Column(JSON)  # Stress, sleep, nutrition
\ No newline at end of file
+    contributing_factors = Column(JSONType)  # Training, recovery, etc.
+    external_factors = Column(JSONType)  # Stress, sleep, nutrition
+
+    workout = relationship("Workout", back_populates="performance_metrics")
\ No newline at end of file
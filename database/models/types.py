@@ -0,0 +1,5 @@
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
+
+# Binary JSONB on PostgreSQL (parsed once on write, GIN-indexable); plain JSON elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
@@ -1,9 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, JSON
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, Integer, SmallInteger, String, Float, DateTime, Boolean, Text, ForeignKey, func
 from sqlalchemy.orm import relationship
-from datetime import datetime
 
-Base = declarative_base()
+from database.models.base import Base, new_id
+from database.models.enums import ActivityLevel, CoachingStyle, Confidence, FitnessLevel, db_enum
+from database.models.types import JSONType
 
 class User(Base):
     """
@@ -14,37 +14,43 @@ class User(Base):
     id = Column(String, primary_key=True)
     email = Column(String, unique=True, nullable=False)
     name = Column(String, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Basic demographics
-    age = Column(Integer)
+    age = Column(SmallInteger)
     gender = Column(String)  # male, female, other
     height_cm = Column(Float)
     weight_kg = Column(Float)
     timezone = Column(String, default="UTC")
 
     # Fitness profile
-    fitness_level = Column(String)  # beginner, intermediate, advanced
-    activity_level = Column(String)  # sedentary, lightly_active, etc.
-    years_training = Column(Integer)
+    fitness_level = Column(db_enum(FitnessLevel))  # beginner, intermediate, advanced
+    activity_level = Column(db_enum(ActivityLevel))  # sedentary, lightly_active, etc.
+    years_training = Column(SmallInteger)
 
     # Health information
-    resting_heart_rate = Column(Integer)
-    max_heart_rate = Column(Integer)
+    resting_heart_rate = Column(SmallInteger)
+    max_heart_rate = Column(SmallInteger)
     vo2_max = Column(Float)
-    health_conditions = Column(JSON)  # List of health conditions/limitations
+    health_conditions = Column(JSONType)  # List of health conditions/limitations
 
     # Preferences
     preferred_units = Column(String, default="metric")  # metric, imperial
-    notification_preferences = Column(JSON)
-    privacy_settings = Column(JSON)
+    notification_preferences = Column(JSONType)
+    privacy_settings = Column(JSONType)
 
     # System
     is_active = Column(Boolean, default=True)
     garmin_connected = Column(Boolean, default=False)
     onboarding_completed = Column(Boolean, default=False)
 
+    # One-to-one and one-to-many children are fetched with IN (...) queries, never per row
+    profile = relationship("UserProfile", back_populates="user", uselist=False, lazy="selectin")
+    baselines = relationship("UserBaselines", back_populates="user", uselist=False, lazy="selectin")
+    sessions = relationship("UserSession", back_populates="user", lazy="selectin",
+                            order_by="UserSession.session_start")
+
 
 class UserProfile(Base):
     """
@@ -52,38 +58,40 @@ class UserProfile(Base):
     """
     __tablename__ = "user_profiles"
 
-    user_id = Column(String, primary_key=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Training preferences
-    available_days = Column(JSON)  # Days available for training
+    available_days = Column(JSONType)  # Days available for training
     session_duration_preference = Column(Integer)  # Preferred minutes per session
     time_of_day_preference = Column(String)  # morning, afternoon, evening
-    equipment_available = Column(JSON)  # List of available equipment
-    location_preferences = Column(JSON)  # indoor, outdoor, gym, home
+    equipment_available = Column(JSONType)  # List of available equipment
+    location_preferences = Column(JSONType)  # indoor, outdoor, gym, home
 
     # Goal information
     primary_goal = Column(String)  # weight_loss, performance, general_fitness
-    secondary_goals = Column(JSON)  # Additional goals
-    target_events = Column(JSON)  # Races or events training for
-    motivation_factors = Column(JSON)  # What motivates the user
+    secondary_goals = Column(JSONType)  # Additional goals
+    target_events = Column(JSONType)  # Races or events training for
+    motivation_factors = Column(JSONType)  # What motivates the user
 
     # Limitations and considerations
-    injuries_history = Column(JSON)  # Past injuries and current limitations
+    injuries_history = Column(JSONType)  # Past injuries and current limitations
     medical_clearance = Column(Boolean, default=False)
-    exercise_restrictions = Column(JSON)  # Specific exercise limitations
+    exercise_restrictions = Column(JSONType)  # Specific exercise limitations
 
     # Nutrition preferences
-    dietary_restrictions = Column(JSON)  # Allergies, vegetarian, etc.
-    nutrition_goals = Column(JSON)  # Weight management, performance fuel
+    dietary_restrictions = Column(JSONType)  # Allergies, vegetarian, etc.
+    nutrition_goals = Column(JSONType)  # Weight management, performance fuel
     meal_prep_preference = Column(String)  # none, minimal, full
-    supplement_preferences = Column(JSON)
+    supplement_preferences = Column(JSONType)
 
     # Communication preferences
-    coaching_style_preference = Column(String)  # supportive, direct, technical
+    coaching_style_preference = Column(db_enum(CoachingStyle))  # supportive, direct, technical
     feedback_frequency = Column(String)  # daily, weekly, as_needed
-    reminder_preferences = Column(JSON)
+    reminder_preferences = Column(JSONType)
+
+    user = relationship("User", back_populates="profile")
 
 
 class UserBaselines(Base):
@@ -92,36 +100,38 @@ class UserBaselines(Base):
     """
     __tablename__ = "user_baselines"
 
-    user_id = Column(String, primary_key=True)
-    established_date = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    established_date = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Cardiovascular baselines
     resting_hr_baseline = Column(Float)
     hrv_baseline = Column(Float)
-    max_hr_tested = Column(Integer)
-    lactate_threshold_hr = Column(Integer)
+    max_hr_tested = Column(SmallInteger)
+    lactate_threshold_hr = Column(SmallInteger)
 
     # Performance baselines
     vo2_max_baseline = Column(Float)
-    running_pace_baseline = Column(JSON)  # Paces for different distances
-    cycling_power_baseline = Column(JSON)  # Power zones
-    strength_baselines = Column(JSON)  # Lift maxes
+    running_pace_baseline = Column(JSONType)  # Paces for different distances
+    cycling_power_baseline = Column(JSONType)  # Power zones
+    strength_baselines = Column(JSONType)  # Lift maxes
 
     # Health baselines
-    body_composition = Column(JSON)  # Body fat %, muscle mass
+    body_composition = Column(JSONType)  # Body fat %, muscle mass
     sleep_quality_baseline = Column(Float)
     stress_level_baseline = Column(Float)
     energy_level_baseline = Column(Float)
 
     # Fitness tests results
-    initial_fitness_tests = Column(JSON)  # Results from onboarding tests
-    latest_fitness_tests = Column(JSON)  # Most recent test results
+    initial_fitness_tests = Column(JSONType)  # Results from onboarding tests
+    latest_fitness_tests = Column(JSONType)  # Most recent test results
 
     # Metrics for comparison
     baseline_period_start = Column(DateTime)
     baseline_period_end = Column(DateTime)
-    baseline_confidence = Column(String)  # high, medium, low
+    baseline_confidence = Column(db_enum(Confidence))  # high, medium, low
+
+    user = relationship("User", back_populates="baselines")
 
 
 class UserSession(Base):
@@ -130,24 +140,26 @@ class UserSession(Base):
     """
     __tablename__ = "user_sessions"
 
-    id = Column(String, primary_key=True)
-    user_id = Column(String, nullable=False)
-    session_start = Column(DateTime, default=datetime.utcnow)
+    id = Column(String, primary_key=True, default=lambda: str(new_id()))
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    session_start = Column(DateTime(timezone=True), server_default=func.now())
     session_end = Column(DateTime)
 
     # Session context
     interaction_type = Column(String)  # chat, checkin, analysis, planning
     platform = Column(String)  # web, mobile, whatsapp
-    session_data = Column(JSON)  # Session-specific data
+    session_data = Column(JSONType)  # Session-specific data
 
     # Conversation tracking
     message_count = Column(Integer, default=0)
-    topics_discussed = Column(JSON)  # List of topics covered
-    agents_involved = Column(JSON)  # Which agents participated
+    topics_discussed = Column(JSONType)  # List of topics covered
+    agents_involved = Column(JSONType)  # Which agents participated
 
     # Outcomes
-    goals_set = Column(JSON)  # Any goals set during session
-    actions_planned = Column(JSON)  # Planned actions/workouts
-    satisfaction_rating = Column(Integer)  # User satisfaction (1-5)
+    goals_set = Column(JSONType)  # Any goals set during session
+    actions_planned = Column(JSONType)  # Planned actions/workouts
+    satisfaction_rating = Column(SmallInteger)  # User satisfaction (1-5)
+
+    is_active = Column(Boolean, default=True)
 
-    is_active = Column(Boolean, default=True)
\ No newline at end of file
+    user = relationship("User", back_populates="sessions")
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""
+Columnar analytics mirror for health metrics and training load.
+
+Trend lines, rolling chronic load and percentile baselines scan many rows but
+only a handful of columns. Those queries run against a DuckDB view over
+Parquet files partitioned by (user_id, month), so they read only the columns
+involved; PostgreSQL keeps serving writes and recent-day reads.
+"""
+
+import logging
+import os
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import duckdb
+from sqlalchemy.engine import make_url
+
+from config.database_config import db_config
+
+logger = logging.getLogger(__name__)
+
+OLAP_PARQUET_DIR = Path(os.getenv("OLAP_PARQUET_DIR", "/data/parquet"))
+
+# Days behind the watermark that are exported again on every run. Late Garmin
+# days, intra-day metric updates and the training load trigger (which rewrites
+# up to 42 days of acute/chronic load) all change rows the mirror already holds.
+OLAP_REEXPORT_DAYS = max(42, int(os.getenv("OLAP_REEXPORT_DAYS", "42")))
+
+# Mirrored tables: view name -> (source table, time column, columns copied)
+MIRRORED_TABLES: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {
+    "health": (
+        "health_metrics", "date",
+        ("user_id", "date", "resting_heart_rate", "heart_rate_variability", "sleep_duration_minutes",
+         "sleep_score", "stress_level_avg", "body_battery_end", "steps", "active_minutes")
+    ),
+    "training_load": (
+        "training_load", "date",
+        ("user_id", "date", "daily_tss", "acute_load", "chronic_load", "training_stress_balance", "total_volume")
+    )
+}
+
+class HealthOLAP:
+    """
+    DuckDB reader and nightly exporter for the Parquet analytics mirror.
+
+    Export:
+    - Rewrites every month from OLAP_REEXPORT_DAYS before the mirror's
+      latest timestamp (the watermark) onwards, replacing those partitions
+    - Reads PostgreSQL directly through DuckDB's postgres extension
+    - Writes Parquet partitioned by user_id and month
+
+    Queries:
+    - Weekly wellness trends with median HRV
+    - Daily training load series for acute/chronic load charts
+    - Percentile baselines of a single health metric
+    """
+
+    def __init__(self, parquet_dir: Path = OLAP_PARQUET_DIR):
+        self.parquet_dir = parquet_dir
+        self.connection = duckdb.connect()
+        self._views_ready = False
+
+    def _glob(self, view: str) -> str:
+        return str(self.parquet_dir / view / "**" / "*.parquet")
+
+    def _has_files(self, view: str) -> bool:
+        return any((self.parquet_dir / view).rglob("*.parquet"))
+
+    def _watermark(self, view: str, time_column: str) -> Optional[datetime]:
+        if not self._has_files(view):
+            return None
+        return self.connection.execute(
+            f"SELECT max({time_column}) FROM read_parquet('{self._glob(view)}', hive_partitioning = 1)"
+        ).fetchone()[0]
+
+    @staticmethod
+    def _window_start(watermark) -> Optional[datetime]:
+        if watermark is None:
+            return None
+        start = watermark - timedelta(days=OLAP_REEXPORT_DAYS)
+        return datetime(start.year, start.month, 1)
+
+    def _replace_months(self, view: str, staging: Path, start_month: Optional[str]):
+        """
+        Swap the staged partitions into the mirror, dropping every mirrored month >= start_month
+        Months are replaced for all users, since the staged export covers all of them
+        """
+        target = self.parquet_dir / view
+        for month_dir in target.glob("user_id=*/month=*"):
+            if start_month is None or month_dir.name.split("=", 1)[1] >= start_month:
+                shutil.rmtree(month_dir)
+
+        for month_dir in staging.glob("user_id=*/month=*"):
+            destination = target / month_dir.parent.name / month_dir.name
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(month_dir), str(destination))
+        shutil.rmtree(staging, ignore_errors=True)
+
+    def export_incremental(self) -> Dict[str, Optional[datetime]]:
+        """
+        Re-export the trailing window of each view and replace its (user_id, month) partitions
+        Intended to run nightly; returns the start of the window each export rewrote
+        """
+        # DuckDB's postgres scanner expects a libpq URL without the SQLAlchemy driver suffix
+        source_url = make_url(db_config.get_database_url()).set(drivername="postgresql")
+        self.connection.execute("INSTALL postgres")
+        self.connection.execute("LOAD postgres")
+        self.connection.execute(
+            f"ATTACH '{source_url.render_as_string(hide_password=False)}' AS oltp (TYPE POSTGRES, READ_ONLY)"
+        )
+
+        window_starts = {}
+        try:
+            for view, (table, time_column, columns) in MIRRORED_TABLES.items():
+                start = self._window_start(self._watermark(view, time_column))
+                window_starts[view] = start
+
+                # Written to a staging directory first so readers never see a half-replaced month
+                staging = self.parquet_dir / ".staging" / view
+                shutil.rmtree(staging, ignore_errors=True)
+                where = f"WHERE {time_column} >= TIMESTAMP '{start.isoformat()}'" if start else ""
+                self.connection.execute(
+                    f"COPY (SELECT {', '.join(columns)}, strftime({time_column}, '%Y-%m') AS month "
+                    f"FROM oltp.{table} {where}) "
+                    f"TO '{staging}' "
+                    "(FORMAT PARQUET, PARTITION_BY (user_id, month), OVERWRITE_OR_IGNORE, FILENAME_PATTERN 'part_{uuid}')"
+                )
+                self._replace_months(view, staging, start.strftime("%Y-%m") if start else None)
+                logger.info(f"Exported {table} to Parquet mirror from {start}")
+        finally:
+            self.connection.execute("DETACH oltp")
+
+        self._views_ready = False
+        return window_starts
+
+    def _ensure_views(self):
+        if self._views_ready:
+            return
+        for view in MIRRORED_TABLES:
+            if self._has_files(view):
+                self.connection.execute(
+                    f"CREATE OR REPLACE VIEW {view} AS "
+                    f"SELECT * FROM read_parquet('{self._glob(view)}', hive_partitioning = 1)"
+                )
+        self._views_ready = True
+
+    def weekly_wellness_trends(self, user_id: str, since: datetime) -> List[Dict]:
+        """
+        Weekly averages and median HRV for a user
+        """
+        self._ensure_views()
+        rows = self.connection.execute(
+            """
+            SELECT date_trunc('week', date) AS week,
+                   avg(sleep_score) AS sleep_score,
+                   avg(stress_level_avg) AS stress_level,
+                   avg(resting_heart_rate) AS resting_heart_rate,
+                   median(heart_rate_variability) AS hrv_median
+            FROM health
+            WHERE user_id = ? AND date >= ?
+            GROUP BY 1
+            ORDER BY 1
+            """,
+            [user_id, since]
+        ).fetchall()
+        columns = ("week", "sleep_score", "stress_level", "resting_heart_rate", "hrv_median")
+        return [dict(zip(columns, row)) for row in rows]
+
+    def training_load_series(self, user_id: str, since: datetime) -> List[Dict]:
+        """
+        Daily TSS with acute/chronic load for a user
+        """
+        self._ensure_views()
+        rows = self.connection.execute(
+            """
+            SELECT date, daily_tss, acute_load, chronic_load, training_stress_balance
+            FROM training_load
+            WHERE user_id = ? AND date >= ?
+            ORDER BY date
+            """,
+            [user_id, since]
+        ).fetchall()
+        columns = ("date", "daily_tss", "acute_load", "chronic_load", "training_stress_balance")
+        return [dict(zip(columns, row)) for row in rows]
+
+    def metric_percentiles(self, user_id: str, metric: str, since: datetime,
+                           percentiles: Tuple[float, ...] = (0.1, 0.5, 0.9)) -> Dict[float, Optional[float]]:
+        """
+        Percentile baseline of one health metric column for a user
+        """
+        if metric not in MIRRORED_TABLES["health"][2]:
+            raise ValueError(f"Unknown health metric column: {metric}")
+
+        self._ensure_views()
+        row = self.connection.execute(
+            f"SELECT quantile_cont({metric}, ?) FROM health WHERE user_id = ? AND date >= ?",
+            [list(percentiles), user_id, since]
+        ).fetchone()
+        values = row[0] or [None] * len(percentiles)
+        return dict(zip(percentiles, values))
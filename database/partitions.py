@@ -0,0 +1,108 @@
+"""
+Monthly range partitions for the time-series tables (PostgreSQL only).
+
+health_metrics and stress_events are declared PARTITION BY RANGE on their
+time column. Queries filtered by date touch only the matching monthly
+partitions. A DEFAULT partition catches rows outside the pre-created range
+(e.g. old history from a first Garmin backfill); when a month's partition is
+created later, its rows are moved out of DEFAULT first.
+"""
+
+import logging
+import os
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Partitioned table -> range partition key
+PARTITIONED_TABLES: Dict[str, str] = {"health_metrics": "date", "stress_events": "timestamp"}
+
+# Vacuum/analyze health_metrics partitions after 2% churn so planner statistics track daily appends
+_PARTITION_STORAGE = {
+    "health_metrics": "WITH (autovacuum_vacuum_scale_factor = 0.02, autovacuum_analyze_scale_factor = 0.02)"
+}
+
+# Tables with an ON DELETE CASCADE foreign key into a partitioned table, with their copy of the partition key.
+# Moving rows out of DEFAULT deletes them there, so the referencing rows are set aside and restored.
+_PARTITION_DEPENDENTS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "health_metrics": (("health_metrics_extended", "date"),)
+}
+
+# Months of partitions kept before and after the current month
+PARTITION_MONTHS_BACK = int(os.getenv("PARTITION_MONTHS_BACK", "12"))
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+
+def _add_months(month: date, offset: int) -> date:
+    index = month.year * 12 + month.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+def _create_month_partition(connection, table: str, key: str, start: date, end: date, storage: str):
+    """
+    Create one monthly partition, taking over any rows DEFAULT already holds for that month
+
+    PostgreSQL refuses to create a partition whose range has rows in DEFAULT,
+    so those rows are moved into a standalone table that is then attached.
+    Rows of cascading dependents are restored once the parent rows are back.
+    """
+    partition = f"{table}_{start:%Y_%m}"
+    bounds = f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+
+    def in_range(column: str) -> str:
+        return f"{column} >= '{start.isoformat()}' AND {column} < '{end.isoformat()}'"
+
+    if connection.execute(text(f"SELECT to_regclass('{partition}') IS NOT NULL")).scalar():
+        return
+
+    if not connection.execute(text(f"SELECT EXISTS (SELECT 1 FROM {table}_default WHERE {in_range(key)})")).scalar():
+        connection.execute(text(f"CREATE TABLE {partition} PARTITION OF {table} FOR VALUES {bounds} {storage}"))
+        return
+
+    connection.execute(text(
+        f"CREATE TABLE {partition} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) {storage}"
+    ))
+    dependents = _PARTITION_DEPENDENTS.get(table, ())
+    for dependent, dependent_key in dependents:
+        connection.execute(text(
+            f"CREATE TEMP TABLE _moving_{dependent} AS SELECT * FROM {dependent} WHERE {in_range(dependent_key)}"
+        ))
+
+    # The DELETE cascades into the dependents; the copies above are restored after ATTACH
+    moved = connection.execute(text(
+        f"WITH moved AS (DELETE FROM {table}_default WHERE {in_range(key)} RETURNING *) "
+        f"INSERT INTO {partition} SELECT * FROM moved"
+    )).rowcount
+    connection.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {partition} FOR VALUES {bounds}"))
+
+    for dependent, _ in dependents:
+        connection.execute(text(f"INSERT INTO {dependent} SELECT * FROM _moving_{dependent}"))
+        connection.execute(text(f"DROP TABLE _moving_{dependent}"))
+    logger.info(f"Moved {moved} rows from {table}_default into {partition}")
+
+def ensure_monthly_partitions(connection, today: Optional[date] = None):
+    """
+    Create the DEFAULT and missing monthly partitions around the current month
+
+    A month that cannot be created is logged and skipped, so startup is not blocked
+    """
+    if connection.dialect.name != "postgresql":
+        return
+
+    current = (today or date.today()).replace(day=1)
+    for table, key in PARTITIONED_TABLES.items():
+        storage = _PARTITION_STORAGE.get(table, "")
+        connection.execute(text(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT {storage}"))
+
+        for offset in range(-PARTITION_MONTHS_BACK, PARTITION_MONTHS_AHEAD + 1):
+            start = _add_months(current, offset)
+            end = _add_months(start, 1)
+            try:
+                # Savepoint, so a failed month does not abort the surrounding transaction
+                with connection.begin_nested():
+                    _create_month_partition(connection, table, key, start, end, storage)
+            except Exception as e:
+                logger.error(f"Could not create partition {table}_{start:%Y_%m}: {e}")
+
+    logger.info(f"Monthly partitions ensured through {_add_months(current, PARTITION_MONTHS_AHEAD):%Y-%m}")
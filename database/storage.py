@@ -0,0 +1,48 @@
+"""
+Storage tuning applied after table creation (PostgreSQL).
+
+Tables whose rows are updated after insert (status changes, actual workout
+results, alert acknowledgement) keep 20% free space per page, so updates
+stay HOT (same page, no index writes). Append-only tables keep the default
+fillfactor of 100.
+
+JSONB documents larger than ~2 kB are TOASTed and compressed. lz4
+compresses and, more importantly, decompresses several times faster than the
+default pglz at a similar ratio, which matters for the wide workout and
+analysis payloads that are read back whole (PostgreSQL 14+).
+"""
+
+from typing import Dict
+
+from sqlalchemy import JSON, MetaData, text
+
+UPDATE_HEAVY_FILLFACTOR: Dict[str, int] = {
+    "workouts": 80,
+    "training_plans": 80,
+    "user_sessions": 80,
+    "health_alerts": 80
+}
+
+def set_fillfactors(connection):
+    """
+    Leave room for in-page (HOT) updates on update-heavy tables
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    for table, fillfactor in UPDATE_HEAVY_FILLFACTOR.items():
+        connection.execute(text(f"ALTER TABLE {table} SET (fillfactor = {fillfactor})"))
+
+def compress_json_columns(connection, metadata: MetaData):
+    """
+    Switch every JSON column in `metadata` to lz4 TOAST compression
+    """
+    dialect = connection.dialect
+    if dialect.name != "postgresql" or (dialect.server_version_info or (0,)) < (14,):
+        return
+
+    for table in metadata.tables.values():
+        for column in table.columns:
+            if isinstance(column.type, JSON):
+                connection.execute(text(
+                    f"ALTER TABLE {table.name} ALTER COLUMN {column.name} SET COMPRESSION lz4"
+                ))
@@ -0,0 +1,78 @@
+"""
+Database-maintained training load (PostgreSQL only).
+
+When a workout's actual_tss or actual_date is set, changed or cleared, or
+the workout is deleted, a trigger recomputes daily_tss in training_load for
+both the day it left and the day it landed on, and refreshes the 7-day acute
+and 42-day chronic loads for every day the change affects. Dashboards then
+read precomputed rows instead of aggregating six weeks of workouts per request.
+"""
+
+from sqlalchemy import text
+
+_RECOMPUTE_TRAINING_LOAD = """
+CREATE OR REPLACE FUNCTION recompute_training_load(p_user_id text, p_date timestamp) RETURNS void AS $$
+DECLARE
+    day timestamp := date_trunc('day', p_date);
+BEGIN
+    -- Summed from scratch, so a day whose last workout was cleared or moved drops to zero
+    INSERT INTO training_load (id, user_id, date, daily_tss)
+    SELECT gen_random_uuid()::text, p_user_id, day, coalesce(sum(actual_tss), 0)
+    FROM workouts
+    WHERE user_id = p_user_id AND actual_date >= day AND actual_date < day + interval '1 day'
+    ON CONFLICT (user_id, date) DO UPDATE SET daily_tss = EXCLUDED.daily_tss;
+
+    -- Days without a training_load row count as zero load
+    UPDATE training_load AS tl SET
+        acute_load = (
+            SELECT sum(w.daily_tss) / 7.0 FROM training_load AS w
+            WHERE w.user_id = tl.user_id AND w.date > tl.date - interval '7 days' AND w.date <= tl.date
+        ),
+        chronic_load = (
+            SELECT sum(w.daily_tss) / 42.0 FROM training_load AS w
+            WHERE w.user_id = tl.user_id AND w.date > tl.date - interval '42 days' AND w.date <= tl.date
+        )
+    WHERE tl.user_id = p_user_id AND tl.date >= day AND tl.date < day + interval '42 days';
+
+    UPDATE training_load SET training_stress_balance = chronic_load - acute_load
+    WHERE user_id = p_user_id AND date >= day AND date < day + interval '42 days';
+END;
+$$ LANGUAGE plpgsql
+"""
+
+_UPDATE_TRAINING_LOAD = """
+CREATE OR REPLACE FUNCTION update_training_load() RETURNS trigger AS $$
+BEGIN
+    -- The day a workout left (deleted, cleared, moved or reassigned) is recomputed as well as the day it landed on
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.actual_date IS NOT NULL THEN
+        PERFORM recompute_training_load(OLD.user_id, OLD.actual_date);
+    END IF;
+    -- Skipped when an update stays on the same user and day, which the branch above already covered
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.actual_date IS NOT NULL
+       AND NOT (TG_OP = 'UPDATE' AND OLD.actual_date IS NOT NULL AND OLD.user_id = NEW.user_id
+                AND date_trunc('day', OLD.actual_date) = date_trunc('day', NEW.actual_date)) THEN
+        PERFORM recompute_training_load(NEW.user_id, NEW.actual_date);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+_WORKOUT_TSS_TRIGGER = """
+CREATE OR REPLACE TRIGGER tr_workout_tss
+AFTER INSERT OR UPDATE OF actual_tss, actual_date, user_id OR DELETE ON workouts
+FOR EACH ROW
+EXECUTE FUNCTION update_training_load()
+"""
+
+# Every statement create_triggers runs; part of the schema hash so edits reach existing databases
+TRIGGER_DDL = (_RECOMPUTE_TRAINING_LOAD, _UPDATE_TRAINING_LOAD, _WORKOUT_TSS_TRIGGER)
+
+def create_triggers(connection):
+    """
+    Install or replace the training load trigger
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    for ddl in TRIGGER_DDL:
+        connection.execute(text(ddl))
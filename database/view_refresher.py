@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from config.database_config import db_config
+from database.models.health_models import HealthMetric
+from database.views import refresh_materialized_view
+
+logger = logging.getLogger(__name__)
+
+# Seconds between refreshes of each materialized view
+WEEKLY_REFRESH_SEC = float(os.getenv("MV_WEEKLY_REFRESH_SEC", "300"))
+MONTHLY_REFRESH_SEC = float(os.getenv("MV_MONTHLY_REFRESH_SEC", "86400"))
+
+# New health metrics arriving within this window trigger a single readiness refresh
+READINESS_DEBOUNCE_SEC = float(os.getenv("MV_READINESS_DEBOUNCE_SEC", "30"))
+
+# Readiness is also refreshed on this slow schedule, covering writers that bypass the session hooks
+READINESS_FALLBACK_SEC = float(os.getenv("MV_READINESS_FALLBACK_SEC", "3600"))
+
+# Session.info flag set when a transaction wrote health metrics
+_HEALTH_WRITTEN = "health_metrics_written"
+
+class MaterializedViewRefresher:
+    """
+    Background refresh of the wellness materialized views.
+
+    - Weekly and monthly aggregates are refreshed on fixed intervals
+    - Readiness is refreshed after `notify_health_metrics` reports new
+      rows, debounced so one sync burst causes one refresh, plus on a slow
+      fallback schedule. Sessions that commit HealthMetric rows (ORM or
+      database.models.bulk) notify automatically.
+
+    Refreshes run in a worker thread so the event loop is never blocked.
+    Does nothing on databases other than PostgreSQL.
+    """
+
+    def __init__(self):
+        self._intervals: Dict[str, float] = {
+            "mv_user_weekly_wellness": WEEKLY_REFRESH_SEC,
+            "mv_user_monthly_wellness": MONTHLY_REFRESH_SEC,
+            "mv_user_readiness": READINESS_FALLBACK_SEC
+        }
+        self._last_refresh: Dict[str, float] = {}
+        self._readiness_dirty = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks = []
+
+    def start(self):
+        """
+        Start the refresh loops on the running event loop
+        """
+        if self._tasks or not db_config.get_database_url().startswith("postgresql"):
+            return
+        self._loop = asyncio.get_running_loop()
+        self._tasks = [
+            asyncio.create_task(self._run_scheduled()),
+            asyncio.create_task(self._run_readiness())
+        ]
+
+    async def close(self):
+        """
+        Stop the refresh loops
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify_health_metrics(self):
+        """
+        Mark readiness stale after new health metrics were written
+
+        Safe to call from any thread; sync sessions commit in worker threads.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._readiness_dirty.set()
+        else:
+            loop.call_soon_threadsafe(self._readiness_dirty.set)
+
+    async def _run_scheduled(self):
+        while True:
+            now = time.monotonic()
+            for name, interval in self._intervals.items():
+                if now - self._last_refresh.get(name, float("-inf")) >= interval:
+                    await self._refresh(name)
+                    self._last_refresh[name] = now
+            await asyncio.sleep(min(self._intervals.values()))
+
+    async def _run_readiness(self):
+        while True:
+            await self._readiness_dirty.wait()
+            await asyncio.sleep(READINESS_DEBOUNCE_SEC)
+            self._readiness_dirty.clear()
+            await self._refresh("mv_user_readiness")
+            self._last_refresh["mv_user_readiness"] = time.monotonic()
+
+    async def _refresh(self, name: str):
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self._refresh_sync, name)
+            logger.info(f"Refreshed {name} in {time.perf_counter() - started:.2f}s")
+        except Exception as e:
+            logger.error(f"Refreshing {name} failed: {e}")
+
+    @staticmethod
+    def _refresh_sync(name: str):
+        if db_config.engine is None:
+            db_config.create_engine()
+        with db_config.engine.begin() as connection:
+            refresh_materialized_view(connection, name)
+
+view_refresher = MaterializedViewRefresher()
+
+def mark_health_metrics_written(session: Session):
+    """
+    Record that this session's transaction wrote health metrics; readiness is notified on commit
+    """
+    session.info[_HEALTH_WRITTEN] = True
+
+@event.listens_for(Session, "after_flush")
+def _track_health_metric_flush(session, flush_context):
+    if any(isinstance(obj, HealthMetric) for obj in session.new) or any(
+        isinstance(obj, HealthMetric) for obj in session.dirty
+    ):
+        mark_health_metrics_written(session)
+
+@event.listens_for(Session, "after_commit")
+def _notify_health_metric_commit(session):
+    if session.info.pop(_HEALTH_WRITTEN, False):
+        view_refresher.notify_health_metrics()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_health_metric_flag(session):
+    session.info.pop(_HEALTH_WRITTEN, None)
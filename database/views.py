@@ -0,0 +1,134 @@
+"""
+Database views created alongside the ORM tables.
+
+health_metrics_full rejoins the narrow health_metrics table with its cold
+health_metrics_extended columns for readers that need the full row.
+
+Materialized wellness aggregates (PostgreSQL only): dashboard trend and
+readiness figures are rolled up from health_metrics once per refresh instead
+of on every request. Each view has a unique index so it can be refreshed
+CONCURRENTLY without blocking readers.
+
+Refresh tiers (see database/view_refresher.py):
+- mv_user_readiness: event-driven, after new health metrics are written
+- mv_user_weekly_wellness: every few minutes
+- mv_user_monthly_wellness: nightly
+"""
+
+import hashlib
+from typing import Dict
+
+from sqlalchemy import text
+
+# Plain views, created on every dialect
+VIEWS: Dict[str, str] = {
+    "health_metrics_full": """
+        SELECT core.*,
+               ext.floors_climbed, ext.calories_burned, ext.active_calories, ext.distance_meters,
+               ext.sedentary_minutes, ext.data_completeness, ext.device_wear_time, ext.sync_timestamp
+        FROM health_metrics AS core
+        LEFT JOIN health_metrics_extended AS ext ON ext.id = core.id AND ext.date = core.date
+    """
+}
+
+MATERIALIZED_VIEWS: Dict[str, str] = {
+    "mv_user_weekly_wellness": """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS mv_user_weekly_wellness AS
+        SELECT user_id,
+               date_trunc('week', date) AS week,
+               avg(sleep_score) AS avg_sleep_score,
+               avg(stress_level_avg) AS avg_stress_level,
+               avg(heart_rate_variability) AS avg_hrv,
+               percentile_cont(0.5) WITHIN GROUP (ORDER BY heart_rate_variability) AS median_hrv,
+               avg(resting_heart_rate) AS avg_resting_heart_rate,
+               count(*) AS days
+        FROM health_metrics
+        GROUP BY 1, 2
+    """,
+    "mv_user_monthly_wellness": """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS mv_user_monthly_wellness AS
+        SELECT user_id,
+               date_trunc('month', date) AS month,
+               avg(sleep_score) AS avg_sleep_score,
+               avg(stress_level_avg) AS avg_stress_level,
+               avg(heart_rate_variability) AS avg_hrv,
+               percentile_cont(0.5) WITHIN GROUP (ORDER BY heart_rate_variability) AS median_hrv,
+               avg(steps) AS avg_steps,
+               count(*) AS days
+        FROM health_metrics
+        GROUP BY 1, 2
+    """,
+    "mv_user_readiness": """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS mv_user_readiness AS
+        SELECT latest.user_id,
+               latest.date AS latest_date,
+               latest.heart_rate_variability AS latest_hrv,
+               latest.resting_heart_rate AS latest_resting_heart_rate,
+               baseline.hrv_baseline,
+               baseline.hrv_stddev,
+               (latest.heart_rate_variability - baseline.hrv_baseline)
+                   / NULLIF(baseline.hrv_stddev, 0) AS hrv_z_score
+        FROM (
+            SELECT DISTINCT ON (user_id) user_id, date, heart_rate_variability, resting_heart_rate
+            FROM health_metrics
+            ORDER BY user_id, date DESC
+        ) AS latest
+        LEFT JOIN (
+            SELECT user_id,
+                   avg(heart_rate_variability) AS hrv_baseline,
+                   stddev_samp(heart_rate_variability) AS hrv_stddev
+            FROM health_metrics
+            WHERE date >= now() - interval '28 days'
+            GROUP BY user_id
+        ) AS baseline USING (user_id)
+    """
+}
+
+# Unique indexes required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+_UNIQUE_INDEXES: Dict[str, str] = {
+    "mv_user_weekly_wellness": "user_id, week",
+    "mv_user_monthly_wellness": "user_id, month",
+    "mv_user_readiness": "user_id"
+}
+
+def _definition_digest(name: str, ddl: str) -> str:
+    return hashlib.sha1(f"{ddl}\n{_UNIQUE_INDEXES[name]}".encode("utf-8")).hexdigest()
+
+def create_views(connection):
+    """
+    Create or replace the plain views, then (on PostgreSQL) the wellness
+    materialized views and their unique indexes
+
+    A materialized view cannot be replaced in place, so each one carries a
+    digest of its definition as a comment and is dropped and rebuilt only
+    when that digest no longer matches.
+    """
+    is_postgresql = connection.dialect.name == "postgresql"
+    for name, query in VIEWS.items():
+        # Dropped first: CREATE OR REPLACE can't remove columns and SQLite has no replace
+        connection.execute(text(f"DROP VIEW IF EXISTS {name}"))
+        connection.execute(text(f"CREATE VIEW {name} AS {query}"))
+
+    if not is_postgresql:
+        return
+
+    for name, ddl in MATERIALIZED_VIEWS.items():
+        digest = _definition_digest(name, ddl)
+        current = connection.execute(
+            text("SELECT obj_description(to_regclass(:name), 'pg_class')"), {"name": name}
+        ).scalar()
+        if current == digest:
+            continue
+
+        connection.execute(text(f"DROP MATERIALIZED VIEW IF EXISTS {name}"))
+        connection.execute(text(ddl))
+        connection.execute(text(f"CREATE UNIQUE INDEX ux_{name} ON {name} ({_UNIQUE_INDEXES[name]})"))
+        connection.execute(text(f"COMMENT ON MATERIALIZED VIEW {name} IS '{digest}'"))
+
+def refresh_materialized_view(connection, name: str):
+    """
+    Refresh one view without blocking concurrent readers
+    """
+    if name not in MATERIALIZED_VIEWS:
+        raise ValueError(f"Unknown materialized view: {name}")
+    connection.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {name}"))
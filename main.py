@@ -33,20 +33,19 @@ Examples:
 
 import asyncio
 import argparse
+import functools
 import logging
+import os
+import re
 import sys
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple
 
-# Import Agno components
-from agno.os import AgentOS
-
-# Import local components
-from teams.main_coaching_team import MainCoachingTeam
-from teams.analysis_team import AnalysisTeam
-from workflows.daily_checkin import DailyCheckinWorkflow
-from workflows.onboarding import OnboardingWorkflow
-from config.database_config import db_config
-from config.models.model_config import ModelConfig
+# Agno, the agents and the database layer are imported inside the functions
+# that use them, so `--help` and argument errors return without loading them
+if TYPE_CHECKING:
+    from teams.main_coaching_team import MainCoachingTeam
 
 # Configure logging
 logging.basicConfig(
@@ -55,43 +54,94 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def initialize_system():
+# Threads available to asyncio.to_thread for blocking calls made from request handlers
+DEFAULT_EXECUTOR_WORKERS = int(os.getenv("DEFAULT_EXECUTOR_WORKERS", "32"))
+
+def _initialize_database():
     """
-    Initialize Health Coach AI System components and return AgentOS instance
+    Create the coaching schema and open the agent session store
     """
-    logger.info("Initializing Health Coach AI System...")
+    from agno.db.sqlite import SqliteDb
+    from config.database_config import create_session_store_engine, db_config
+    from database.models.template_cache import template_cache
 
-    # Initialize database
     logger.info("Setting up database...")
     db_config.initialize_database()
+    template_cache.start_listener()
 
-    from agno.db.sqlite import SqliteDb
     database = SqliteDb(
-        db_file="./data/health_coach.db",
+        db_engine=create_session_store_engine("./data/health_coach.db"),
         session_table="coaching_sessions"
     )
     logger.info("Database initialized successfully")
+    return database
 
-    # Initialize knowledge base
-    logger.info("Setting up knowledge base...")
+def create_knowledge_base():
+    """
+    Build the knowledge base object; its vector index is opened separately
+    """
     from agno.vectordb.lancedb import LanceDb, SearchType
-    from agno.knowledge.embedder.openai import OpenAIEmbedder
-    from agno.knowledge.knowledge import Knowledge
+    from agents.core.embedding_cache import CachedOpenAIEmbedder
+    from agents.core.hybrid_knowledge import HybridKnowledge
 
-    knowledge_base = Knowledge(
+    # Vector leg only in LanceDB; HybridKnowledge adds the FTS5 keyword leg
+    return HybridKnowledge(
         vector_db=LanceDb(
             uri="./data/knowledge",
             table_name="health_coaching_knowledge",
-            search_type=SearchType.hybrid,
-            embedder=OpenAIEmbedder(id="text-embedding-3-small")
+            search_type=SearchType.vector,
+            # Chunks are embedded in batched requests rather than one request per chunk
+            embedder=CachedOpenAIEmbedder(id="text-embedding-3-small", enable_batch=True, batch_size=512)
         )
     )
-    logger.info("Knowledge base initialized (content loading skipped for now)")
 
-    # Initialize teams
-    logger.info("Setting up AI agent teams...")
-    main_team = MainCoachingTeam(knowledge_base)
-    analysis_team = AnalysisTeam(knowledge_base)
+def open_knowledge_index(knowledge_base):
+    """
+    Open (or create) the LanceDB table backing the knowledge base
+    """
+    logger.info("Setting up knowledge base...")
+    vector_db = knowledge_base.vector_db
+    if not vector_db.exists():
+        vector_db.create()
+    logger.info("Knowledge base initialized (sources are loaded at server startup)")
+
+@functools.lru_cache(maxsize=1)
+def initialize_system():
+    """
+    Initialize Health Coach AI System components and return AgentOS instance
+    Built once per process; later calls (app factory, chat mode) reuse the result
+    """
+    from agno.os import AgentOS
+    from agents.core.agent_pool import agent_pool
+    from agents.core.agent_registry import AgentRegistry
+    from teams.main_coaching_team import MainCoachingTeam
+    from teams.analysis_team import AnalysisTeam
+
+    logger.info("Initializing Health Coach AI System...")
+    knowledge_base = create_knowledge_base()
+
+    # Database setup, index open and team construction don't depend on each other,
+    # so startup takes as long as the slowest of them instead of their sum
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        database_future = pool.submit(_initialize_database)
+        index_future = pool.submit(open_knowledge_index, knowledge_base)
+
+        logger.info("Setting up AI agent teams...")
+        registry = AgentRegistry.build(knowledge_base)
+        main_team = MainCoachingTeam(knowledge_base, registry)
+        analysis_team = AnalysisTeam(knowledge_base, registry)
+        agent_pool.prewarm(int(os.getenv("AGENT_POOL_MIN_IDLE", "1")))
+
+        database = database_future.result()
+        index_future.result()
+
+    # Both teams write their sessions through the same store (and its single connection)
+    main_team.team.db = database
+    analysis_team.team.db = database
+
+    # Attach the opened index now instead of on the first request
+    for knowledge_agent in (registry.training_planner, registry.training_analyzer):
+        knowledge_agent.load_knowledge()
     logger.info("AI teams initialized successfully")
 
     # Create individual agents list for AgentOS
@@ -126,32 +176,250 @@ def initialize_system():
     )
 
     logger.info("System initialization completed successfully")
-    return agent_os
+    return agent_os, main_team
 
-# Initialize AgentOS system at module level
-agent_os = initialize_system()
+def register_streaming_routes(app, main_team: "MainCoachingTeam"):
+    """
+    Expose the coordinator's merged specialist stream as Server-Sent Events
+    """
+    from fastapi.responses import StreamingResponse
 
-# Create FastAPI app at module level for AgentOS serve method
-app = agent_os.get_app()
+    @app.post("/coach/stream")
+    async def stream_coaching_reply(payload: Dict[str, Any]):
+        async def events():
+            async for agent_name, chunk in main_team.stream_user_query(
+                payload["message"], payload.get("user_context", {})
+            ):
+                data = "".join(f"data: {line}\n" for line in chunk.split("\n"))
+                yield f"event: {agent_name}\n{data}\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+def install_default_executor():
+    """
+    Bound the thread pool behind asyncio.to_thread for the running loop
+    Blocking work (SQLite, LanceDB, file reads) shares DEFAULT_EXECUTOR_WORKERS threads
+    """
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=DEFAULT_EXECUTOR_WORKERS, thread_name_prefix="coach-io")
+    )
+
+def register_background_jobs(app, main_team: "MainCoachingTeam"):
+    """
+    Load knowledge sources and run the materialized view refresher with the API server
+    """
+    from agents.core.knowledge_loader import load_knowledge_sources
+    from database.view_refresher import view_refresher
+
+    app.add_event_handler("startup", install_default_executor)
+    app.add_event_handler("startup", view_refresher.start)
+    app.add_event_handler("startup", functools.partial(load_knowledge_sources, main_team.knowledge_base))
+    app.add_event_handler("shutdown", view_refresher.close)
+
+@functools.lru_cache(maxsize=1)
+def get_app():
+    """
+    ASGI app factory for uvicorn (`factory=True`); the system is built in the server process
+    """
+    agent_os, main_team = initialize_system()
+    app = agent_os.get_app()
+
+    # Handlers read these from app.state instead of module globals
+    app.state.agent_os = agent_os
+    app.state.main_team = main_team
+
+    register_streaming_routes(app, main_team)
+    register_background_jobs(app, main_team)
+    return app
+
+# Compiled once; anchored so ordinary messages fail on the first character
+COMMAND_RE = re.compile(
+    r"^(?:/?(?P<quit>exit|quit)|/(?P<command>help|clear|save|agent)(?:\s+(?P<arg>\w+))?)\s*$",
+    re.IGNORECASE
+)
+
+CHAT_HELP = """Commands:
+  /agent NAME  chat with one specialist (e.g. /agent training_planner)
+  /agent       back to the full coaching team
+  /clear       forget the conversation context
+  /save        write the transcript to ./data/chat_transcripts
+  /help        show this help
+  /exit        quit
+"""
+
+def _save_transcript(transcript: List[Tuple[str, str]]) -> str:
+    directory = os.path.join("data", "chat_transcripts")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"chat-{datetime.now():%Y%m%d-%H%M%S}.md")
+    with open(path, "w", encoding="utf-8") as f:
+        for speaker, text in transcript:
+            f.write(f"**{speaker}:** {text}\n\n")
+    return path
+
+async def run_chat_mode(agent_name: Optional[str] = None):
+    """
+    Interactive terminal chat with the coaching team, or with one specialist via --agent
+    """
+    from agents.core.knowledge_loader import load_knowledge_sources
+
+    _, main_team = initialize_system()
+    specialist = None
+    if agent_name:
+        specialist = vars(main_team.registry).get(agent_name)
+        if specialist is None:
+            raise ValueError(f"Unknown agent: {agent_name}")
+
+    # Knowledge sources load in the background while the user types their first message
+    knowledge_task = asyncio.create_task(load_knowledge_sources(main_team.knowledge_base))
+
+    print("Health Coach AI - type /help for commands, /exit to quit\n")
+    user_context: Dict[str, Any] = {}
+    transcript: List[Tuple[str, str]] = []
+    try:
+        while True:
+            # input() blocks, so it runs on a worker thread and the event loop keeps serving background tasks
+            try:
+                user_input = (await asyncio.to_thread(input, "You: ")).strip()
+            except EOFError:
+                break
+
+            if not user_input:
+                continue
+
+            match = COMMAND_RE.match(user_input)
+            if match:
+                if match.group("quit"):
+                    break
+                command = match.group("command").lower()
+                if command == "help":
+                    print(CHAT_HELP)
+                elif command == "clear":
+                    user_context.clear()
+                    transcript.clear()
+                    print("Conversation context cleared\n")
+                elif command == "save":
+                    print(f"Transcript saved to {_save_transcript(transcript)}\n")
+                else:
+                    name = match.group("arg")
+                    candidate = vars(main_team.registry).get(name) if name else None
+                    if name and candidate is None:
+                        print(f"Unknown agent: {name}\n")
+                        continue
+                    specialist, agent_name = candidate, name
+                    print(f"Now chatting with {agent_name or 'the coaching team'}\n")
+                continue
+
+            # Print tokens as they arrive so the wait is time-to-first-token, not the full reply
+            try:
+                reply = await _print_stream(_chat_stream(main_team, specialist, agent_name, user_input, user_context))
+            except Exception as e:
+                logger.error(f"Chat turn failed: {e}")
+                continue
+            transcript.append(("You", user_input))
+            transcript.append((agent_name or "Coach", reply))
+    finally:
+        knowledge_task.cancel()
+
+async def _chat_stream(main_team: "MainCoachingTeam", specialist, agent_name: Optional[str],
+                       user_input: str, user_context: Dict[str, Any]):
+    if specialist is None:
+        async for name, chunk in main_team.stream_user_query(user_input, user_context):
+            yield name, chunk
+        return
+
+    async for event in specialist.agent.arun(user_input, stream=True):
+        content = getattr(event, "content", None)
+        if content:
+            yield agent_name, main_team.coordinator._render(content)
+
+async def _print_stream(chunks) -> str:
+    current = None
+    parts = []
+    async for name, chunk in chunks:
+        # Specialists stream concurrently; label each switch between them
+        if name != current:
+            print(f"\n[{name}] ", end="", flush=True)
+            current = name
+        print(chunk, end="", flush=True)
+        parts.append(chunk)
+    print("\n")
+    return "".join(parts)
+
+_cli_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def run_cli(coro):
+    """
+    Run a CLI coroutine on the event loop kept for the life of the process
+    Unlike asyncio.run(), repeated calls don't build and tear down a loop and its executor
+    """
+    global _cli_loop
+    if _cli_loop is None or _cli_loop.is_closed():
+        _cli_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_cli_loop)
+        _cli_loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=DEFAULT_EXECUTOR_WORKERS, thread_name_prefix="coach-io")
+        )
+    return _cli_loop.run_until_complete(coro)
+
+def close_cli_loop():
+    """
+    Finalize async generators and the default executor, then close the CLI loop
+    """
+    global _cli_loop
+    if _cli_loop is None or _cli_loop.is_closed():
+        return
+    try:
+        _cli_loop.run_until_complete(_cli_loop.shutdown_asyncgens())
+        _cli_loop.run_until_complete(_cli_loop.shutdown_default_executor())
+    finally:
+        _cli_loop.close()
+        _cli_loop = None
+
+def install_event_loop_policy():
+    """
+    Use uvloop when available; it cuts per-socket overhead when the coordinator
+    fans out to many model providers concurrently
+    """
+    try:
+        import uvloop
+    except ImportError:
+        logger.info("uvloop not installed, using the default asyncio event loop")
+        return
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 def main():
     """
     Main application entry point
     """
     parser = argparse.ArgumentParser(description="Health Coach AI System")
-    parser.add_argument("--mode", choices=["api"], default="api",
-                        help="Application mode (only API mode supported with AgentOS)")
+    parser.add_argument("--mode", choices=["api", "chat"], default="api",
+                        help="Application mode: AgentOS API server or interactive chat")
+    parser.add_argument("--agent", help="Chat with a single specialist (e.g. training_planner)")
     parser.add_argument("--host", default="0.0.0.0", help="API server host")
     parser.add_argument("--port", type=int, default=8000, help="API server port")
 
     args = parser.parse_args()
+    install_event_loop_policy()
 
-    # Serve using AgentOS built-in serve method
+    if args.mode == "chat":
+        try:
+            run_cli(run_chat_mode(args.agent))
+        except KeyboardInterrupt:
+            logger.info("Chat interrupted by user")
+        finally:
+            close_cli_loop()
+        return
+
+    # uvicorn calls get_app once it is ready to serve; nothing is built for --help
     try:
+        import uvicorn
+
         logger.info(f"Starting AgentOS API server on {args.host}:{args.port}")
 
-        agent_os.serve(
-            app=f"{__name__}:app",
+        uvicorn.run(
+            f"{__name__}:get_app",
+            factory=True,
             host=args.host,
             port=args.port,
             reload=False  # Don't use reload with MCP tools
@@ -0,0 +1,44 @@
+"""
+Build the coaching knowledge base ahead of deployment.
+
+Embeds every file in the knowledge sources directory into ./data/knowledge,
+builds the vector and keyword indexes and writes the source manifest. A
+server started against the built directory finds the manifest current and
+only opens the table.
+
+Usage:
+    python scripts/build_knowledge.py [--force]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.core.knowledge_loader import discover_knowledge_sources, load_knowledge_sources
+from main import create_knowledge_base, open_knowledge_index
+
+logger = logging.getLogger(__name__)
+
+async def build(force: bool) -> int:
+    sources = discover_knowledge_sources()
+    if not sources:
+        logger.error("No knowledge sources found")
+        return 1
+
+    knowledge_base = create_knowledge_base()
+    open_knowledge_index(knowledge_base)
+    failures = await load_knowledge_sources(knowledge_base, sources, force=force)
+    return 1 if failures else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the coaching knowledge base")
+    parser.add_argument("--force", action="store_true", help="Re-add sources even if the manifest is current")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(build(args.force)))
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,9 @@
+from typing import Optional
+
 from agno.team import Team
-from agno.models.openai import OpenAIChat
-from agno.models.anthropic import Claude
 
-from agents.specialized.data_sync import DataSyncAgent
-from agents.specialized.training_analyzer import TrainingAnalyzerAgent
-from agents.specialized.health_analyzer import HealthAnalyzerAgent
-from agents.specialized.goal_manager import GoalManagerAgent
+from agents.core.agent_registry import AgentRegistry
+from config.models.model_config import ModelConfig
 
 class AnalysisTeam:
     """
@@ -39,13 +37,14 @@ class AnalysisTeam:
     - Training plan effectiveness evaluation
     """
 
-    def __init__(self, knowledge_base=None):
+    def __init__(self, knowledge_base=None, registry: Optional[AgentRegistry] = None):
+        registry = registry or AgentRegistry.build(knowledge_base)
 
-        # Initialize analysis-focused agents
-        self.data_sync = DataSyncAgent()
-        self.training_analyzer = TrainingAnalyzerAgent(knowledge_base)
-        self.health_analyzer = HealthAnalyzerAgent()
-        self.goal_manager = GoalManagerAgent()
+        # Analysis-focused agents, shared with the main team through the registry
+        self.data_sync = registry.data_sync
+        self.training_analyzer = registry.training_analyzer
+        self.health_analyzer = registry.health_analyzer
+        self.goal_manager = registry.goal_manager
 
         # Create the analysis team
         team_members = [
@@ -59,6 +58,8 @@ class AnalysisTeam:
             name="Performance Analysis Team",
             members=team_members,
             description="Specialized team for deep performance and health analysis",
+            # agno's default team model, but the process-wide instance instead of a private client
+            model=ModelConfig.get_shared("gpt-4o")
         )
 
         # Set team instructions
@@ -1,16 +1,15 @@
+from typing import Optional
+
 from agno.team import Team
-from agno.models.openai import OpenAIChat
-from agno.models.anthropic import Claude
 
+from agents.core.agent_pool import agent_pool
+from agents.core.batcher import SingleFlight
+from agents.core.response_cache import make_cache_key
 from agents.core.coordinator import CoordinatorAgent
-from agents.specialized.onboarding import OnboardingAgent
-from agents.specialized.data_sync import DataSyncAgent
+from agents.core.agent_registry import AgentRegistry
+from config.models.model_config import ModelConfig
 from agents.specialized.training_planner import TrainingPlannerAgent
 from agents.specialized.training_analyzer import TrainingAnalyzerAgent
-from agents.specialized.health_analyzer import HealthAnalyzerAgent
-from agents.specialized.recovery import RecoveryAgent
-from agents.specialized.nutrition import NutritionAgent
-from agents.specialized.goal_manager import GoalManagerAgent
 
 class MainCoachingTeam:
     """
@@ -35,18 +34,36 @@ class MainCoachingTeam:
     - Comprehensive progress tracking and adaptation
     """
 
-    def __init__(self, knowledge_base=None):
+    def __init__(self, knowledge_base=None, registry: Optional[AgentRegistry] = None):
+        self.knowledge_base = knowledge_base
+        self.registry = registry or AgentRegistry.build(knowledge_base)
+        self._inflight = SingleFlight()
+
+        # Specialized agents are shared with the other teams through the registry
+        self.onboarding = self.registry.onboarding
+        self.data_sync = self.registry.data_sync
+        self.training_planner = self.registry.training_planner
+        self.training_analyzer = self.registry.training_analyzer
+        self.health_analyzer = self.registry.health_analyzer
+        self.recovery = self.registry.recovery
+        self.nutrition = self.registry.nutrition
+        self.goal_manager = self.registry.goal_manager
+
+        # Pooled copies of knowledge-backed agents need the same knowledge base
+        agent_pool.set_factory(TrainingPlannerAgent, lambda: TrainingPlannerAgent(knowledge_base))
+        agent_pool.set_factory(TrainingAnalyzerAgent, lambda: TrainingAnalyzerAgent(knowledge_base))
 
-        # Initialize all specialized agents
-        self.coordinator = CoordinatorAgent()
-        self.onboarding = OnboardingAgent()
-        self.data_sync = DataSyncAgent()
-        self.training_planner = TrainingPlannerAgent(knowledge_base)
-        self.training_analyzer = TrainingAnalyzerAgent(knowledge_base)
-        self.health_analyzer = HealthAnalyzerAgent()
-        self.recovery = RecoveryAgent()
-        self.nutrition = NutritionAgent()
-        self.goal_manager = GoalManagerAgent()
+        # Coordinator fans out to the specialists concurrently
+        self.coordinator = CoordinatorAgent(specialists={
+            "onboarding": self.onboarding,
+            "data_sync": self.data_sync,
+            "training_planner": self.training_planner,
+            "training_analyzer": self.training_analyzer,
+            "health_analyzer": self.health_analyzer,
+            "recovery": self.recovery,
+            "nutrition": self.nutrition,
+            "goal_manager": self.goal_manager
+        })
 
         # Create the main coaching team
         team_members = [
@@ -65,6 +82,8 @@ class MainCoachingTeam:
             name="Complete Health Coaching Team",
             members=team_members,
             description="Comprehensive health and fitness coaching with all specialized agents",
+            # agno's default team model, but the process-wide instance instead of a private client
+            model=ModelConfig.get_shared("gpt-4o")
         )
 
         # Set team instructions
@@ -94,8 +113,17 @@ class MainCoachingTeam:
     async def handle_user_query(self, user_input: str, user_context: dict):
         """
         Process user query through the complete coaching team
+        Identical queries arriving while one is in flight share its result
+        """
+        key = make_cache_key("MainCoachingTeam.handle_user_query", None, (user_input, user_context), {})
+        return await self._inflight.run(key, lambda: self.coordinator.handle_query(user_input, user_context))
+
+    async def stream_user_query(self, user_input: str, user_context: dict):
+        """
+        Process user query and stream (agent_name, chunk) pairs as specialists respond
         """
-        pass
+        async for agent_name, chunk in self.coordinator.stream_query(user_input, user_context):
+            yield agent_name, chunk
 
     async def daily_check_in(self, user_id: str):
         """
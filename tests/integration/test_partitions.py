@@ -0,0 +1,59 @@
+"""
+Monthly partition maintenance against a real PostgreSQL server.
+
+Set TEST_POSTGRES_URL to run; everything happens in one transaction inside a
+scratch schema and is rolled back afterwards.
+"""
+
+import os
+import uuid
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine, insert, select, text
+
+from database import partitions
+from database.models.health_models import HealthMetric, HealthMetricExtended
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL not set")
+
+@pytest.fixture
+def connection():
+    engine = create_engine(TEST_POSTGRES_URL)
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        schema = f"partition_test_{uuid.uuid4().hex[:8]}"
+        connection.execute(text(f"CREATE SCHEMA {schema}"))
+        connection.execute(text(f"SET LOCAL search_path TO {schema}"))
+        HealthMetric.metadata.create_all(
+            connection, tables=[HealthMetric.__table__, HealthMetricExtended.__table__]
+        )
+        try:
+            yield connection
+        finally:
+            transaction.rollback()
+    engine.dispose()
+
+@pytest.mark.integration
+@pytest.mark.database
+def test_extended_rows_survive_partition_move(connection, monkeypatch):
+    monkeypatch.setattr(partitions, "PARTITION_MONTHS_BACK", 0)
+    monkeypatch.setattr(partitions, "PARTITION_MONTHS_AHEAD", 0)
+    partitions.ensure_monthly_partitions(connection, today=date(2026, 1, 1))
+
+    # Backfilled history lands in DEFAULT while its month has no partition
+    metric_id = uuid.uuid4()
+    day = datetime(2025, 6, 15)
+    connection.execute(insert(HealthMetric).values(id=metric_id, user_id="user-1", date=day, resting_heart_rate=52))
+    connection.execute(insert(HealthMetricExtended).values(id=metric_id, date=day, floors_climbed=12))
+
+    partitions.ensure_monthly_partitions(connection, today=date(2025, 6, 1))
+
+    assert connection.execute(text("SELECT count(*) FROM health_metrics_2025_06")).scalar() == 1
+    assert connection.execute(text("SELECT count(*) FROM health_metrics_default")).scalar() == 0
+    floors = connection.execute(
+        select(HealthMetricExtended.floors_climbed).where(HealthMetricExtended.id == metric_id)
+    ).scalar()
+    assert floors == 12
@@ -0,0 +1,156 @@
+"""
+Request state machine of GarminDataTool, driven through httpx.MockTransport.
+
+Covers retry with Retry-After, retry exhaustion on 5xx, the 401 token
+refresh (including the shared refresh lock) and 304 passthrough of
+conditional GETs. Backoff sleeps are recorded instead of awaited.
+"""
+
+import asyncio
+
+import httpx
+import orjson
+import pytest
+
+from tools.garmin import garmin_data_tool
+from tools.garmin.garmin_data_tool import GARMIN_TOKEN_URL, GarminDataTool
+
+PATH = "/wellness-api/rest/dailies"
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay, *args, **kwargs):
+        delays.append(delay)
+
+    monkeypatch.setattr(garmin_data_tool.asyncio, "sleep", fake_sleep)
+    return delays
+
+def make_tool(handler) -> GarminDataTool:
+    tool = GarminDataTool("client-id", "client-secret")
+    tool.access_token = "old-token"
+    tool.refresh_token = "refresh-token"
+    tool.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return tool
+
+def token_response():
+    return httpx.Response(200, content=orjson.dumps({"access_token": "new-token", "expires_in": 3600}))
+
+@pytest.mark.unit
+@pytest.mark.garmin
+async def test_429_waits_for_retry_after(sleeps):
+    responses = iter([
+        httpx.Response(429, headers={"Retry-After": "7"}),
+        httpx.Response(200, content=b'[{"steps": 100}]')
+    ])
+    tool = make_tool(lambda request: next(responses))
+
+    assert await tool._get_json(PATH) == [{"steps": 100}]
+    assert sleeps == [7.0]
+
+@pytest.mark.unit
+@pytest.mark.garmin
+async def test_5xx_raises_once_attempts_run_out(sleeps):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(503)
+
+    tool = make_tool(handler)
+
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        await tool._request_with_retry("GET", PATH, max_attempts=3)
+    assert error.value.response.status_code == 503
+    assert len(requests) == 3
+    assert len(sleeps) == 2
+
+@pytest.mark.unit
+@pytest.mark.garmin
+async def test_401_refreshes_token_and_retries(sleeps):
+    tokens_sent = []
+
+    def handler(request):
+        if str(request.url) == GARMIN_TOKEN_URL:
+            return token_response()
+        tokens_sent.append(request.headers["Authorization"])
+        if request.headers["Authorization"] == "Bearer old-token":
+            return httpx.Response(401)
+        return httpx.Response(200, content=b'{"ok": true}')
+
+    tool = make_tool(handler)
+
+    assert await tool._get_json(PATH) == {"ok": True}
+    assert tokens_sent == ["Bearer old-token", "Bearer new-token"]
+    assert tool.access_token == "new-token"
+    assert sleeps == []
+
+@pytest.mark.unit
+@pytest.mark.garmin
+async def test_second_401_is_raised(sleeps):
+    refreshes = []
+
+    def handler(request):
+        if str(request.url) == GARMIN_TOKEN_URL:
+            refreshes.append(request)
+            return token_response()
+        return httpx.Response(401)
+
+    tool = make_tool(handler)
+
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        await tool._get_json(PATH)
+    assert error.value.response.status_code == 401
+    assert len(refreshes) == 1
+
+@pytest.mark.unit
+@pytest.mark.garmin
+async def test_concurrent_401s_share_one_refresh(sleeps):
+    refreshes = []
+
+    async def handler(request):
+        if str(request.url) == GARMIN_TOKEN_URL:
+            refreshes.append(request)
+            await asyncio.sleep(0)
+            return token_response()
+        if request.headers["Authorization"] == "Bearer old-token":
+            return httpx.Response(401)
+        return httpx.Response(200, content=b"[]")
+
+    tool = make_tool(handler)
+
+    assert await asyncio.gather(*(tool._get_json(PATH) for _ in range(5))) == [[]] * 5
+    assert len(refreshes) == 1
+
+@pytest.mark.unit
+@pytest.mark.garmin
+async def test_conditional_get_passes_304_through(sleeps):
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(request.headers)
+        return httpx.Response(304)
+
+    tool = make_tool(handler)
+
+    result = await tool.get_json_conditional(
+        PATH, etag='"abc"', last_modified="Mon, 12 Oct 2026 08:00:00 GMT"
+    )
+    assert result.modified is False
+    assert result.payload is None
+    assert (result.etag, result.last_modified) == ('"abc"', "Mon, 12 Oct 2026 08:00:00 GMT")
+    assert seen_headers[0]["If-None-Match"] == '"abc"'
+    assert seen_headers[0]["If-Modified-Since"] == "Mon, 12 Oct 2026 08:00:00 GMT"
+    assert sleeps == []
+
+@pytest.mark.unit
+@pytest.mark.garmin
+async def test_conditional_get_returns_new_validators(sleeps):
+    tool = make_tool(lambda request: httpx.Response(200, content=b"[1, 2]", headers={"ETag": '"def"'}))
+
+    result = await tool.get_json_conditional(PATH, etag='"abc"')
+    assert result.modified is True
+    assert result.payload == [1, 2]
+    assert result.etag == '"def"'
+    assert result.size == len(b"[1, 2]")
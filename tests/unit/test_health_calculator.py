@@ -0,0 +1,70 @@
+"""
+Baseline outputs of the profile-level health calculators.
+
+The expected values were produced by the original per-zone round() and
+scalar macro formulas; the vectorized and memoized implementations must
+keep returning them exactly, including half-even ties (e.g. 122.5 -> 122).
+"""
+
+import pytest
+
+from tools.health.health_calculator import Gender, HealthCalculator
+
+# (max_hr, resting_hr) -> (min_hr, max_hr) of zones 1-5
+HEART_RATE_ZONE_BASELINES = {
+    (190, 50): [(120, 134), (134, 148), (148, 162), (162, 176), (176, 190)],
+    (185, 60): [(122, 135), (135, 148), (148, 160), (160, 172), (172, 185)],
+    (200, 45): [(122, 138), (138, 154), (154, 169), (169, 184), (184, 200)],
+    (171, 58): [(114, 126), (126, 137), (137, 148), (148, 160), (160, 171)]
+}
+
+# (weight_kg, height_cm, age, gender, activity_level, goal) -> (bmr, tdee, goal_calories, protein_g, fat_g, carbs_g)
+CALORIC_NEEDS_BASELINES = {
+    (70, 175, 30, "male", "moderately_active", "maintain"): (1649, 2556, 2556, 112, 71, 367),
+    (60, 165, 28, "female", "lightly_active", "lose_weight"): (1330, 1829, 1329, 96, 37, 153),
+    (82.5, 180, 45, "male", "very_active", "gain_muscle"): (1730, 2984, 3184, 132, 88, 465),
+    (55, 160, 52, "female", "sedentary", "maintain"): (1129, 1355, 1355, 88, 38, 166)
+}
+
+@pytest.mark.unit
+@pytest.mark.health
+@pytest.mark.parametrize("profile, expected", HEART_RATE_ZONE_BASELINES.items())
+def test_karvonen_zones_match_baseline(profile, expected):
+    zones = HealthCalculator.calculate_heart_rate_zones(*profile)
+
+    assert list(zones) == ["zone1", "zone2", "zone3", "zone4", "zone5"]
+    assert [(zone["min_hr"], zone["max_hr"]) for zone in zones.values()] == expected
+    assert all(type(zone["min_hr"]) is int for zone in zones.values())
+    assert zones["zone5"]["intensity"] == "90-100% HRR"
+
+@pytest.mark.unit
+@pytest.mark.health
+def test_compute_zones_uses_karvonen_floors():
+    zones = HealthCalculator.compute_zones(190, 50, ftp=250, lthr=172)
+
+    assert zones.hr_floors == (120, 134, 148, 162, 176)
+    assert zones.power_floors == (0, 138, 188, 225, 262, 300, 375)
+    assert zones.prompt_block == (
+        "User zones: HR floors 120/134/148/162/176 bpm; power floors 0/138/188/225/262/300/375 W; LTHR 172 bpm"
+    )
+
+@pytest.mark.unit
+@pytest.mark.health
+@pytest.mark.parametrize("profile, expected", CALORIC_NEEDS_BASELINES.items())
+def test_caloric_needs_match_baseline(profile, expected):
+    needs = HealthCalculator.calculate_caloric_needs(*profile)
+    macros = needs["macros"]
+
+    assert (
+        needs["bmr"], needs["tdee"], needs["goal_calories"],
+        macros["protein_g"], macros["fat_g"], macros["carbs_g"]
+    ) == expected
+    assert all(type(value) is int for value in (needs["bmr"], *macros.values()))
+
+@pytest.mark.unit
+@pytest.mark.health
+def test_caloric_needs_accepts_gender_enum():
+    profile = (70, 175, 30, "male", "moderately_active", "maintain")
+    by_enum = HealthCalculator.calculate_caloric_needs(70, 175, 30, Gender.MALE, "moderately_active", "maintain")
+
+    assert by_enum == HealthCalculator.calculate_caloric_needs(*profile)
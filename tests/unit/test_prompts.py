@@ -0,0 +1,51 @@
+"""
+Token budgets for the compressed agent instruction blocks.
+
+Every block is sent with each uncached call, so growth shows up directly
+in prefill cost; raise a budget here only deliberately.
+"""
+
+import pytest
+
+from agents.core import prompts
+
+tiktoken = pytest.importorskip("tiktoken")
+
+# Tokenizer of the gpt-4o family the agents run on
+ENCODING = tiktoken.get_encoding("o200k_base")
+
+BUDGET = 150
+
+# Blocks that carry more than directives: the shared health prefix or the question bank
+EXTENDED_BUDGETS = {
+    "RECOVERY_INSTRUCTIONS": 180,
+    "ONBOARDING_INSTRUCTIONS": 350
+}
+
+INSTRUCTION_BLOCKS = [
+    "COMMON_HEALTH_PROMPT",
+    "COORDINATOR_INSTRUCTIONS",
+    "ONBOARDING_INSTRUCTIONS",
+    "DATA_SYNC_INSTRUCTIONS",
+    "TRAINING_PLANNER_INSTRUCTIONS",
+    "TRAINING_ANALYZER_INSTRUCTIONS",
+    "HEALTH_ANALYZER_INSTRUCTIONS",
+    "RECOVERY_INSTRUCTIONS",
+    "NUTRITION_INSTRUCTIONS",
+    "GOAL_MANAGER_INSTRUCTIONS",
+    "ROUTER_INSTRUCTIONS"
+]
+
+@pytest.mark.unit
+@pytest.mark.agents
+@pytest.mark.parametrize("name", INSTRUCTION_BLOCKS)
+def test_instruction_block_within_token_budget(name):
+    instructions = getattr(prompts, name)
+    budget = EXTENDED_BUDGETS.get(name, BUDGET)
+    assert len(ENCODING.encode(instructions)) <= budget
+
+@pytest.mark.unit
+@pytest.mark.agents
+@pytest.mark.parametrize("name", ["HEALTH_ANALYZER_INSTRUCTIONS", "RECOVERY_INSTRUCTIONS"])
+def test_health_agents_share_common_prefix(name):
+    assert getattr(prompts, name).startswith(prompts.COMMON_HEALTH_PROMPT)
@@ -1,7 +1,64 @@
 import asyncio
-import aiohttp
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+import os
+import random
+import time
+import httpx
+import numpy as np
+import orjson
+from email.utils import parsedate_to_datetime
+from aiolimiter import AsyncLimiter
+from typing import Any, Dict, List, NamedTuple, Optional
+from datetime import datetime, timedelta, timezone
+
+from tools.health.time_series import DAILY_METRIC_RANGES, HealthMetrics
+
+GARMIN_API_URL = os.getenv("GARMIN_API_URL", "https://apis.garmin.com")
+
+# In-flight request cap and request rate; Garmin allows about 10 requests/s, so stay just under
+GARMIN_MAX_IN_FLIGHT = int(os.getenv("GARMIN_MAX_IN_FLIGHT", "16"))
+GARMIN_RATE_PER_SEC = float(os.getenv("GARMIN_RATE_PER_SEC", "9"))
+
+# Garmin's limit applies per application, so every GarminDataTool (and DataSyncAgent,
+# which sends through one) shares a single limiter and in-flight cap per process
+_garmin_slots = asyncio.Semaphore(GARMIN_MAX_IN_FLIGHT)
+_garmin_limiter = AsyncLimiter(max_rate=GARMIN_RATE_PER_SEC, time_period=1)
+
+# Rate limiting and transient server errors are retried with exponential backoff
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+GARMIN_MAX_ATTEMPTS = int(os.getenv("GARMIN_MAX_ATTEMPTS", "5"))
+MAX_RETRY_DELAY_SEC = 60.0
+
+# Days further than this many standard deviations from the period mean are flagged as anomalies
+ANOMALY_Z_THRESHOLD = 3.0
+
+# Bodies above this size (activity GPS tracks, HR streams) are parsed off the event loop
+LARGE_PAYLOAD_BYTES = 1_000_000
+
+# Garmin Health API endpoints used by this tool
+ACTIVITIES_PATH = "/wellness-api/rest/activities"
+HEALTH_PATHS = {
+    "dailySummaries": "/wellness-api/rest/dailies",
+    "hrv": "/wellness-api/rest/hrv",
+    "sleep": "/wellness-api/rest/sleeps"
+}
+USER_METRICS_PATH = "/wellness-api/rest/userMetrics"
+
+# The Health API filters summaries by upload time and rejects upload ranges longer than one day
+MAX_UPLOAD_RANGE_SEC = 86400
+
+# OAuth2 token endpoint; tokens are renewed this many seconds before they expire
+GARMIN_TOKEN_URL = os.getenv("GARMIN_TOKEN_URL", "https://diauth.garmin.com/di-oauth2-service/oauth/token")
+TOKEN_REFRESH_MARGIN_SEC = 30
+
+class ConditionalResult(NamedTuple):
+    """
+    Outcome of a conditional GET; payload is None when Garmin answered 304 Not Modified
+    """
+    modified: bool
+    payload: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    size: int = 0  # body bytes
 
 class GarminDataTool:
     """
@@ -30,11 +87,162 @@ class GarminDataTool:
     def __init__(self, client_id: str, client_secret: str):
         self.client_id = client_id
         self.client_secret = client_secret
-        self.base_url = "https://apis.garmin.com"
-        self.session = None
+        self.base_url = GARMIN_API_URL
+        self.session: Optional[httpx.AsyncClient] = None
         self.access_token = None
         self.refresh_token = None
 
+        # Concurrent requests share one refresh instead of each re-authenticating
+        self._auth_lock = asyncio.Lock()
+        self._token_expires_at = 0.0
+
+        # HTTP/2 multiplexes concurrent requests over one connection to apis.garmin.com,
+        # so a sync fan-out pays a single TCP + TLS handshake
+        self._limits = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=75)
+
+        # The limiter spaces requests out before Garmin answers 429; the semaphore bounds in-flight requests.
+        # Both are module-level and shared by every instance
+        self._sem = _garmin_slots
+        self._limiter = _garmin_limiter
+
+    async def _get_session(self) -> httpx.AsyncClient:
+        """
+        Shared HTTP/2 client, created on first use (it must be built inside a running loop)
+        """
+        if self.session is None or self.session.is_closed:
+            self.session = httpx.AsyncClient(http2=True, limits=self._limits, timeout=30.0)
+        return self.session
+
+    async def _get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        return await self._request_with_retry("GET", path, params=params)
+
+    async def _request_with_retry(self, method: str, path: str, max_attempts: int = GARMIN_MAX_ATTEMPTS, **kwargs) -> Any:
+        """
+        Send a request with _send_with_retry and return the parsed JSON body
+
+        Bodies are parsed with orjson after the limiter and semaphore are
+        released, off the loop when they are large.
+        """
+        response = await self._send_with_retry(method, path, max_attempts, **kwargs)
+        return await self._parse_json(response.content)
+
+    async def _send_with_retry(self, method: str, path: str, max_attempts: int = GARMIN_MAX_ATTEMPTS,
+                               headers: Optional[Dict[str, str]] = None, **kwargs) -> httpx.Response:
+        """
+        Send an authenticated request, retrying 429/5xx and connection failures with exponential backoff
+
+        Retry-After is honoured when Garmin sends it. A 401 refreshes the
+        access token and retries once; tokens close to expiry are refreshed
+        before sending. Backoff sleeps happen outside the limiter and
+        semaphore so waiting requests don't hold a slot. Returns successful
+        and 304 responses; other error statuses are raised.
+        """
+        session = await self._get_session()
+        refreshed = False
+        attempt = 0
+        while True:
+            retry_after = None
+            if self._token_expires_at and time.time() >= self._token_expires_at - TOKEN_REFRESH_MARGIN_SEC:
+                await self.refresh_access_token()
+            token = self.access_token
+            try:
+                async with self._limiter, self._sem:
+                    response = await session.request(
+                        method,
+                        self.base_url + path,
+                        headers={**(headers or {}), "Authorization": f"Bearer {token}"},
+                        **kwargs
+                    )
+                status = response.status_code
+                if (status == 401 and refreshed) or (status not in RETRY_STATUSES and status != 401):
+                    if status != 304:
+                        response.raise_for_status()
+                    return response
+                if status in RETRY_STATUSES:
+                    retry_after = response.headers.get("Retry-After")
+                if attempt + 1 >= max_attempts:
+                    response.raise_for_status()
+            except httpx.TransportError:
+                if attempt + 1 >= max_attempts:
+                    raise
+                status = None
+
+            if status == 401:
+                # A second 401 after the refresh is raised above
+                refreshed = True
+                await self.refresh_access_token(stale_token=token)
+                continue
+
+            await asyncio.sleep(self._retry_delay(retry_after, attempt))
+            attempt += 1
+
+    async def get_json_conditional(self, path: str, params: Optional[Dict[str, Any]] = None,
+                                   etag: Optional[str] = None, last_modified: Optional[str] = None) -> ConditionalResult:
+        """
+        GET with If-None-Match / If-Modified-Since validators through the shared request path
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        response = await self._send_with_retry("GET", path, params=params, headers=headers)
+        if response.status_code == 304:
+            return ConditionalResult(False, None, etag, last_modified)
+        return ConditionalResult(
+            True,
+            await self._parse_json(response.content),
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            len(response.content)
+        )
+
+    @staticmethod
+    async def _parse_json(body: bytes) -> Any:
+        if not body:
+            return None
+        if len(body) > LARGE_PAYLOAD_BYTES:
+            return await asyncio.to_thread(orjson.loads, body)
+        return orjson.loads(body)
+
+    @staticmethod
+    def _retry_delay(retry_after: Optional[str], attempt: int) -> float:
+        if retry_after:
+            try:
+                return min(MAX_RETRY_DELAY_SEC, max(0.0, float(retry_after)))
+            except ValueError:
+                try:
+                    wait = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                    return min(MAX_RETRY_DELAY_SEC, max(0.0, wait))
+                except (TypeError, ValueError):
+                    pass
+        return min(MAX_RETRY_DELAY_SEC, 2 ** attempt + random.random())
+
+    @staticmethod
+    def _upload_windows(start_date: datetime, end_date: datetime) -> List[Dict[str, int]]:
+        """
+        Query parameters for consecutive upload-time windows of at most MAX_UPLOAD_RANGE_SEC covering the range
+        """
+        start, end = int(start_date.timestamp()), int(end_date.timestamp())
+        return [
+            {"uploadStartTimeInSeconds": window_start,
+             "uploadEndTimeInSeconds": min(window_start + MAX_UPLOAD_RANGE_SEC, end)}
+            for window_start in range(start, max(end, start + 1), MAX_UPLOAD_RANGE_SEC)
+        ]
+
+    async def _get_uploaded(self, path: str, start_date: datetime, end_date: datetime) -> List[Dict]:
+        """
+        Summaries uploaded between start_date and end_date, oldest window first
+
+        Windows are requested concurrently through the shared limiter; a summary
+        re-uploaded in a later window appears after its earlier version.
+        """
+        pages = await asyncio.gather(
+            *(self._get_json(path, params) for params in self._upload_windows(start_date, end_date))
+        )
+        return [summary for page in pages for summary in page or []]
+
     async def authenticate(self, username: str, password: str) -> bool:
         """
         Authenticate with Garmin Connect API using OAuth2
@@ -44,16 +252,47 @@ class GarminDataTool:
         # Store access and refresh tokens securely
         pass
 
-    async def refresh_access_token(self) -> bool:
+    async def refresh_access_token(self, stale_token: Optional[str] = None) -> bool:
         """
         Refresh expired access token using refresh token
+
+        Serialized by a lock: coroutines that queued behind a refresh see the
+        new token and return without a second OAuth round-trip. stale_token is
+        the token a request was rejected with; if it has already been replaced
+        there is nothing to do.
         """
-        # Token refresh implementation
-        pass
+        async with self._auth_lock:
+            if stale_token is None:
+                if time.time() < self._token_expires_at - TOKEN_REFRESH_MARGIN_SEC:
+                    return True
+            elif self.access_token != stale_token:
+                return True
+
+            if not self.refresh_token:
+                return False
+
+            session = await self._get_session()
+            response = await session.post(GARMIN_TOKEN_URL, data={
+                "grant_type": "refresh_token",
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "refresh_token": self.refresh_token
+            })
+            if response.status_code != 200:
+                return False
+            tokens = orjson.loads(response.content)
+
+            self.access_token = tokens["access_token"]
+            self.refresh_token = tokens.get("refresh_token", self.refresh_token)
+            self._token_expires_at = time.time() + float(tokens.get("expires_in", 0))
+            return True
 
     async def get_activities(self, user_id: str, start_date: datetime, end_date: datetime) -> List[Dict]:
         """
-        Retrieve activities for date range
+        Retrieve activities uploaded to Garmin between start_date and end_date
+
+        The range is upload time, not activity start time; ranges longer than
+        a day are fetched as one request per 24 h window.
 
         Returns list of activities with:
         - Activity ID and basic info (type, name, start time)
@@ -62,8 +301,7 @@ class GarminDataTool:
         - GPS track data (if available)
         - Detailed time series data (heart rate zones, splits)
         """
-        # Activities API implementation
-        activities = []
+        activities = await self._get_uploaded(ACTIVITIES_PATH, start_date, end_date)
 
         # Example activity structure:
         activity_example = {
@@ -86,27 +324,25 @@ class GarminDataTool:
 
         return activities
 
-    async def get_health_metrics(self, user_id: str, start_date: datetime, end_date: datetime) -> Dict:
-        """
-        Retrieve health and wellness metrics
-
-        Returns comprehensive health data:
-        - Daily summaries (steps, calories, sleep)
-        - Heart Rate Variability (HRV) data
-        - Stress levels and events
-        - Sleep stages and quality metrics
-        - Body battery/energy levels
-        - Resting heart rate trends
-        """
-        # Health metrics API implementation
-        health_data = {
-            "dailySummaries": [],
-            "hrv": [],
-            "stress": [],
-            "sleep": [],
-            "bodyBattery": [],
-            "restingHeartRate": []
-        }
+    async def get_health_metrics(self, user_id: str, start_date: datetime, end_date: datetime) -> HealthMetrics:
+        """
+        Retrieve health and wellness metrics uploaded between start_date and end_date
+
+        The range is upload time (one request per 24 h window); the returned
+        days are the calendar dates of the uploaded summaries.
+
+        Returns one NumPy column per metric, aligned by calendar day:
+        - Daily summaries (steps, resting heart rate, average stress)
+        - Heart Rate Variability (HRV) nightly average
+        - Sleep duration
+        """
+        results = await asyncio.gather(
+            *(self._get_uploaded(path, start_date, end_date) for path in HEALTH_PATHS.values())
+        )
+        health_data = dict(zip(HEALTH_PATHS, results))
+        health_metrics = HealthMetrics.from_garmin(
+            health_data["dailySummaries"], hrv=health_data["hrv"], sleep=health_data["sleep"]
+        )
 
         # Example daily summary structure:
         daily_summary_example = {
@@ -120,9 +356,9 @@ class GarminDataTool:
             "vigorousIntensityMinutes": 20
         }
 
-        return health_data
+        return health_metrics
 
-    async def get_training_load(self, user_id: str, timeframe_days: int = 7) -> Dict:
+    async def get_training_load(self, user_id: str, timeframe_days: int = 7, end_date: Optional[datetime] = None) -> Dict:
         """
         Retrieve training load and recovery metrics
 
@@ -132,15 +368,20 @@ class GarminDataTool:
         - Training status (productive, maintaining, etc.)
         - Recovery time recommendations
         - Fitness level and trends
+
+        timeframe_days counts back from end_date in upload time, one request per day
         """
-        # Training load API implementation
+        end_date = end_date or datetime.now(timezone.utc)
+        metrics = await self._get_uploaded(USER_METRICS_PATH, end_date - timedelta(days=timeframe_days), end_date)
+        latest = metrics[-1] if metrics else {}
+
         training_data = {
             "acuteLoad": 0,
             "chronicLoad": 0,
             "trainingStatus": "productive",
             "recoveryTime": 24,  # hours
             "fitnessLevel": 45,
-            "vo2Max": 52.5
+            "vo2Max": latest.get("vo2Max", 52.5)
         }
 
         return training_data
@@ -157,37 +398,76 @@ class GarminDataTool:
         if data_types is None:
             data_types = ['activities', 'health', 'training']
 
+        # One timestamp for the whole sync: reported time and fetch window agree
+        now = datetime.now(timezone.utc)
         sync_results = {
-            "syncTimestamp": datetime.now().isoformat(),
+            "syncTimestamp": now.isoformat(),
             "syncedDataTypes": data_types,
             "results": {},
             "errors": []
         }
 
-        # Parallel data sync implementation
-        # Handle rate limiting and error recovery
-        # Validate data integrity
-        # Store in database
+        # Data types are fetched concurrently; every request still passes the shared limiter
+        end_date = now
+        start_date = end_date - timedelta(days=1)
+        fetchers = {
+            "activities": lambda: self.get_activities(user_id, start_date, end_date),
+            "health": lambda: self.get_health_metrics(user_id, start_date, end_date),
+            "training": lambda: self.get_training_load(user_id, end_date=end_date)
+        }
+
+        requested = [data_type for data_type in data_types if data_type in fetchers]
+        results = await asyncio.gather(*(fetchers[data_type]() for data_type in requested), return_exceptions=True)
+        for data_type, result in zip(requested, results):
+            if isinstance(result, Exception):
+                sync_results["errors"].append({"dataType": data_type, "error": str(result)})
+            else:
+                sync_results["results"][data_type] = result
 
         return sync_results
 
-    async def validate_data_quality(self, data: Dict) -> Dict:
+    async def validate_data_quality(self, data: Dict, checked_at: Optional[datetime] = None) -> Dict:
         """
         Validate data integrity and quality
         Flag anomalies and missing data
+
+        checked_at is the sync's timestamp when called from a sync, so results share its reference time
         """
+        checked_at = checked_at or datetime.now(timezone.utc)
         validation_results = {
+            "checkedAt": checked_at.isoformat(),
             "isValid": True,
             "warnings": [],
             "errors": [],
             "anomalies": []
         }
 
-        # Data validation logic
-        # Check for reasonable value ranges
-        # Identify missing required fields
-        # Flag statistical anomalies
+        # Accepts a sync result or the health section on its own
+        health = data.get("results", data).get("health")
+        if not isinstance(health, HealthMetrics) or len(health) == 0:
+            validation_results["warnings"].append({"metric": "health", "issue": "no daily health metrics"})
+            return validation_results
+
+        # Whole-column comparisons; NaN (no reading) fails every test, so missing days are never flagged as bad
+        dates = health.dates.astype(str)
+        for name, (low, high) in DAILY_METRIC_RANGES.items():
+            values = getattr(health, name).astype(np.float64)
+
+            missing = int(np.count_nonzero(np.isnan(values)))
+            if missing:
+                validation_results["warnings"].append({"metric": name, "issue": "missing", "days": missing})
+
+            out_of_range = np.flatnonzero((values < low) | (values > high))
+            if out_of_range.size:
+                validation_results["errors"].append({"metric": name, "issue": "out_of_range", "dates": dates[out_of_range].tolist()})
+
+            std = np.nanstd(values) if missing < len(values) else 0.0
+            if std > 0:
+                outliers = np.flatnonzero(np.abs(values - np.nanmean(values)) > ANOMALY_Z_THRESHOLD * std)
+                if outliers.size:
+                    validation_results["anomalies"].append({"metric": name, "dates": dates[outliers].tolist()})
 
+        validation_results["isValid"] = not validation_results["errors"]
         return validation_results
 
     async def close(self):
@@ -195,4 +475,5 @@ class GarminDataTool:
         Clean up resources and close session
         """
         if self.session:
-            await self.session.close()
\ No newline at end of file
+            await self.session.aclose()
+            self.session = None
\ No newline at end of file
@@ -1,8 +1,188 @@
+import functools
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from collections import deque
+from enum import IntEnum
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import math
 
+try:
+    import numexpr
+except ImportError:
+    # Plain NumPy evaluates the same expressions, just without operator fusion
+    numexpr = None
+
+# Fixed template so users with identical zones produce identical prompt text
+ZONE_BLOCK_TEMPLATE = "User zones: HR floors {hr} bpm; power floors {power} W; LTHR {lthr} bpm"
+
+# Coggan power zone floors as a fraction of FTP (zones 1-7)
+POWER_ZONE_FRACTIONS = (0.0, 0.55, 0.75, 0.90, 1.05, 1.20, 1.50)
+
+# Karvonen zone edges as fractions of heart rate reserve (zone floors plus the zone 5 ceiling)
+_KARVONEN_EDGES = np.array([0.50, 0.60, 0.70, 0.80, 0.90, 1.00])
+
+# (name, intensity, description) of the zone between consecutive edges
+_KARVONEN_ZONES = (
+    ("Active Recovery", "50-60% HRR", "Very light intensity, active recovery"),
+    ("Aerobic Base", "60-70% HRR", "Light intensity, fat burning"),
+    ("Aerobic", "70-80% HRR", "Moderate intensity, aerobic development"),
+    ("Lactate Threshold", "80-90% HRR", "Hard intensity, lactate threshold"),
+    ("VO2 Max", "90-100% HRR", "Very hard intensity, VO2 max")
+)
+
+def _evaluate(expression: str, **operands) -> np.ndarray:
+    """
+    Evaluate an array expression in one fused, multithreaded pass when numexpr is available
+    """
+    if numexpr is not None:
+        return numexpr.evaluate(expression, local_dict=operands)
+    return eval(expression, {"__builtins__": {}, "where": np.where}, operands)
+
+# Zones, VO2 max and caloric needs depend only on profile values that change
+# rarely, so results are memoized per input tuple. An edited profile is a new
+# key; the returned dicts are shared between callers and must not be mutated.
+PROFILE_CACHE_SIZE = 1024
+
+# Lookup tables for estimate_vo2_max and calculate_caloric_needs, built once
+VO2_ACTIVITY_MULTIPLIERS = {
+    "sedentary": 0.85,
+    "lightly_active": 0.95,
+    "moderately_active": 1.0,
+    "very_active": 1.1,
+    "extremely_active": 1.2
+}
+
+TDEE_ACTIVITY_MULTIPLIERS = {
+    "sedentary": 1.2,
+    "lightly_active": 1.375,
+    "moderately_active": 1.55,
+    "very_active": 1.725,
+    "extremely_active": 1.9
+}
+
+GOAL_CALORIE_ADJUSTMENTS = {
+    "lose_weight": -500,  # 1 lb per week deficit
+    "lose_weight_fast": -750,
+    "maintain": 0,
+    "gain_weight": 300,
+    "gain_muscle": 200
+}
+
+class Gender(IntEnum):
+    """
+    Sex used by the physiological equations; compares as an int on the hot path
+    """
+    MALE = 0
+    FEMALE = 1
+
+    @classmethod
+    def parse(cls, value: Union[str, "Gender"]) -> "Gender":
+        """
+        Accept a Gender or the legacy string form ("male" is male, anything else female)
+        """
+        if isinstance(value, Gender):
+            return value
+        return cls.MALE if value.lower() == "male" else cls.FEMALE
+
+class TrainingZones(NamedTuple):
+    """
+    Derived per-user training zone constants
+    """
+    hr_floors: Tuple[int, ...]
+    power_floors: Tuple[int, ...]
+    prompt_block: str
+
+# Windows whose deviation is below this are treated as flat; running-sum
+# variance can leave a tiny positive residue that would inflate the z-score
+HRV_STD_EPSILON = 1e-6
+
+# HRV status by index as returned from classify_hrv_z_scores, with the interpretation of each
+HRV_STATUSES = np.array(["above_baseline", "below_baseline", "normal"])
+HRV_INTERPRETATIONS = {
+    "above_baseline": "Good recovery, ready for training",
+    "below_baseline": "Possible fatigue or stress, consider easier training",
+    "normal": "Normal recovery status"
+}
+
+def hrv_z_scores(current: np.ndarray, baseline: np.ndarray, std_dev: np.ndarray) -> np.ndarray:
+    """
+    Deviation of each current reading from its baseline; 0 where the window is flat
+    """
+    std_dev = np.asarray(std_dev, dtype=float)
+    flat = std_dev <= HRV_STD_EPSILON
+    return np.where(flat, 0.0, (np.asarray(current, dtype=float) - baseline) / np.where(flat, 1.0, std_dev))
+
+def classify_hrv_z_scores(z_scores: np.ndarray) -> np.ndarray:
+    """
+    HRV status for every z-score in one branchless pass (cohort dashboards)
+    """
+    z_scores = np.asarray(z_scores)
+    return HRV_STATUSES[np.select([z_scores > 0.5, z_scores < -0.5], [0, 1], default=2)]
+
+def _interpret_hrv(current_hrv: float, baseline: float, std_dev: float, count: int) -> Dict:
+    """
+    HRV status of the latest reading relative to the window's mean and standard deviation
+    """
+    z_score = (current_hrv - baseline) / std_dev if std_dev > HRV_STD_EPSILON else 0
+
+    if z_score > 0.5:
+        status = "above_baseline"
+    elif z_score < -0.5:
+        status = "below_baseline"
+    else:
+        status = "normal"
+    interpretation = HRV_INTERPRETATIONS[status]
+
+    return {
+        "baseline": round(baseline, 1),
+        "current": round(current_hrv, 1),
+        "z_score": round(z_score, 2),
+        "status": status,
+        "interpretation": interpretation,
+        "confidence": "high" if count >= 7 else "moderate"
+    }
+
+class RollingHRVBaseline:
+    """
+    HRV baseline over the last `window_days` readings, updated one reading at a time.
+
+    Keeps a running sum and sum of squares over a fixed-size ring buffer, so
+    each daily update costs O(1) instead of recomputing the window. Missing
+    nights (NaN) are skipped, so the window holds the last `window_days`
+    actual readings, the same readings calculate_hrv_baseline would use;
+    results agree with it up to float rounding (float64 running sums here,
+    float32 arrays there).
+    """
+
+    def __init__(self, window_days: int = 7):
+        self._buf: Deque[float] = deque(maxlen=window_days)
+        self._sum = 0.0
+        self._sumsq = 0.0
+
+    def update(self, reading: float) -> Dict:
+        """
+        Add today's reading and return the baseline analysis
+        """
+        # A NaN would poison the running sums for good, even after leaving the window
+        if not math.isfinite(reading):
+            return {"error": "No HRV reading for this night"}
+
+        if len(self._buf) == self._buf.maxlen:
+            oldest = self._buf[0]
+            self._sum -= oldest
+            self._sumsq -= oldest * oldest
+        self._buf.append(reading)
+        self._sum += reading
+        self._sumsq += reading * reading
+
+        count = len(self._buf)
+        if count < 3:
+            return {"error": "Insufficient data for baseline calculation"}
+
+        mean = self._sum / count
+        std_dev = math.sqrt(max(0.0, self._sumsq / count - mean * mean))
+        return _interpret_hrv(reading, mean, std_dev, count)
+
 class HealthCalculator:
     """
     Utility class for health and fitness calculations.
@@ -19,6 +199,7 @@ class HealthCalculator:
     """
 
     @staticmethod
+    @functools.lru_cache(maxsize=PROFILE_CACHE_SIZE)
     def calculate_heart_rate_zones(max_hr: int, resting_hr: int, method: str = "karvonen") -> Dict:
         """
         Calculate heart rate training zones
@@ -30,50 +211,26 @@ class HealthCalculator:
         Returns zones 1-5 with intensity descriptions
         """
         if method == "karvonen":
-            hr_reserve = max_hr - resting_hr
+            # All six zone edges in one array operation; consecutive edges bound each zone
+            edges = np.rint(resting_hr + (max_hr - resting_hr) * _KARVONEN_EDGES).astype(int).tolist()
             zones = {
-                "zone1": {
-                    "name": "Active Recovery",
-                    "min_hr": round(resting_hr + (hr_reserve * 0.50)),
-                    "max_hr": round(resting_hr + (hr_reserve * 0.60)),
-                    "intensity": "50-60% HRR",
-                    "description": "Very light intensity, active recovery"
-                },
-                "zone2": {
-                    "name": "Aerobic Base",
-                    "min_hr": round(resting_hr + (hr_reserve * 0.60)),
-                    "max_hr": round(resting_hr + (hr_reserve * 0.70)),
-                    "intensity": "60-70% HRR",
-                    "description": "Light intensity, fat burning"
-                },
-                "zone3": {
-                    "name": "Aerobic",
-                    "min_hr": round(resting_hr + (hr_reserve * 0.70)),
-                    "max_hr": round(resting_hr + (hr_reserve * 0.80)),
-                    "intensity": "70-80% HRR",
-                    "description": "Moderate intensity, aerobic development"
-                },
-                "zone4": {
-                    "name": "Lactate Threshold",
-                    "min_hr": round(resting_hr + (hr_reserve * 0.80)),
-                    "max_hr": round(resting_hr + (hr_reserve * 0.90)),
-                    "intensity": "80-90% HRR",
-                    "description": "Hard intensity, lactate threshold"
-                },
-                "zone5": {
-                    "name": "VO2 Max",
-                    "min_hr": round(resting_hr + (hr_reserve * 0.90)),
-                    "max_hr": max_hr,
-                    "intensity": "90-100% HRR",
-                    "description": "Very hard intensity, VO2 max"
+                f"zone{number}": {
+                    "name": name,
+                    "min_hr": low,
+                    "max_hr": high,
+                    "intensity": intensity,
+                    "description": description
                 }
+                for number, ((name, intensity, description), low, high)
+                in enumerate(zip(_KARVONEN_ZONES, edges, edges[1:]), start=1)
             }
         else:  # percentage method
+            low, high = np.rint(max_hr * _KARVONEN_EDGES[:2]).astype(int).tolist()
             zones = {
                 "zone1": {
                     "name": "Active Recovery",
-                    "min_hr": round(max_hr * 0.50),
-                    "max_hr": round(max_hr * 0.60),
+                    "min_hr": low,
+                    "max_hr": high,
                     "intensity": "50-60% Max HR",
                     "description": "Very light intensity, active recovery"
                 }
@@ -82,6 +239,27 @@ class HealthCalculator:
 
         return zones
 
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def compute_zones(max_hr: int, resting_hr: int,
+                      ftp: Optional[int] = None, lthr: Optional[int] = None) -> TrainingZones:
+        """
+        Heart rate and power zone floors for a profile, cached per zone inputs
+
+        Every input is part of the cache key, so an edited profile simply
+        misses and is computed fresh.
+        """
+        hr_zones = HealthCalculator.calculate_heart_rate_zones(max_hr, resting_hr)
+        hr_floors = tuple(zone["min_hr"] for zone in hr_zones.values())
+        power_floors = tuple(round(ftp * fraction) for fraction in POWER_ZONE_FRACTIONS) if ftp else ()
+
+        prompt_block = ZONE_BLOCK_TEMPLATE.format(
+            hr="/".join(map(str, hr_floors)),
+            power="/".join(map(str, power_floors)) or "n/a",
+            lthr=lthr or "n/a"
+        )
+        return TrainingZones(hr_floors, power_floors, prompt_block)
+
     @staticmethod
     def calculate_training_stress_score(duration_minutes: int, avg_heart_rate: int,
                                       threshold_hr: int, max_hr: int) -> float:
@@ -104,70 +282,93 @@ class HealthCalculator:
         return round(tss, 1)
 
     @staticmethod
-    def calculate_hrv_baseline(hrv_readings: List[float], window_days: int = 7) -> Dict:
+    def calculate_tss_batch(duration_minutes: np.ndarray, avg_heart_rate: np.ndarray, threshold_hr: int) -> np.ndarray:
         """
-        Calculate HRV baseline and deviation analysis
+        calculate_training_stress_score for many activities of one athlete at once
 
-        Returns baseline values and current status relative to baseline
+        Activities with no duration score 0, as in the scalar version
         """
-        if len(hrv_readings) < 3:
-            return {"error": "Insufficient data for baseline calculation"}
+        duration_minutes = np.asarray(duration_minutes, dtype=float)
+        if threshold_hr <= 0:
+            return np.zeros_like(duration_minutes)
 
-        recent_readings = hrv_readings[-window_days:] if len(hrv_readings) >= window_days else hrv_readings
-        baseline = np.mean(recent_readings)
-        std_dev = np.std(recent_readings)
+        tss = _evaluate(
+            "where(duration > 0, duration / 60.0 * where(hr / threshold > 1.15, 1.15, hr / threshold) ** 2 * 100, 0.0)",
+            duration=duration_minutes, hr=np.asarray(avg_heart_rate, dtype=float), threshold=float(threshold_hr)
+        )
+        return np.round(tss, 1)
 
-        current_hrv = hrv_readings[-1] if hrv_readings else baseline
-        z_score = (current_hrv - baseline) / std_dev if std_dev > 0 else 0
+    @staticmethod
+    def calculate_hrv_baseline(hrv_readings: Union[List[float], np.ndarray], window_days: int = 7) -> Dict:
+        """
+        Calculate HRV baseline and deviation analysis
 
-        # Interpret HRV status
-        if z_score > 0.5:
-            status = "above_baseline"
-            interpretation = "Good recovery, ready for training"
-        elif z_score < -0.5:
-            status = "below_baseline"
-            interpretation = "Possible fatigue or stress, consider easier training"
-        else:
-            status = "normal"
-            interpretation = "Normal recovery status"
+        Returns baseline values and current status relative to baseline
+        For a reading-per-day stream use RollingHRVBaseline, which updates in O(1)
+        """
+        # HealthMetrics.hrv (float32) is used in place and the window is a view;
+        # the NaN filter only copies when some night actually lacks a reading
+        readings = np.asarray(hrv_readings, dtype=np.float32)
+        missing = np.isnan(readings)
+        if missing.any():
+            readings = readings[~missing]
+        if len(readings) < 3:
+            return {"error": "Insufficient data for baseline calculation"}
 
-        return {
-            "baseline": round(baseline, 1),
-            "current": round(current_hrv, 1),
-            "z_score": round(z_score, 2),
-            "status": status,
-            "interpretation": interpretation,
-            "confidence": "high" if len(recent_readings) >= 7 else "moderate"
-        }
+        recent_readings = readings[-window_days:]
+        return _interpret_hrv(float(recent_readings[-1]), float(recent_readings.mean()),
+                              float(recent_readings.std()), len(recent_readings))
 
     @staticmethod
-    def estimate_vo2_max(age: int, gender: str, resting_hr: int, activity_level: str) -> float:
+    @functools.lru_cache(maxsize=PROFILE_CACHE_SIZE)
+    def estimate_vo2_max(age: int, gender: Union[str, Gender], resting_hr: int, activity_level: str) -> float:
         """
         Estimate VO2 max using non-exercise prediction equations
 
         Uses the Jackson equation with modifications for activity level
         """
-        if gender.lower() == "male":
+        if Gender.parse(gender) is Gender.MALE:
             base_vo2 = 15.3 * (220 - age) / resting_hr
         else:  # female
             base_vo2 = 15.3 * (220 - age) / resting_hr * 0.85
 
         # Activity level adjustments
-        activity_multiplier = {
-            "sedentary": 0.85,
-            "lightly_active": 0.95,
-            "moderately_active": 1.0,
-            "very_active": 1.1,
-            "extremely_active": 1.2
-        }
-
-        multiplier = activity_multiplier.get(activity_level, 1.0)
+        multiplier = VO2_ACTIVITY_MULTIPLIERS.get(activity_level, 1.0)
         estimated_vo2 = base_vo2 * multiplier
 
         return round(estimated_vo2, 1)
 
     @staticmethod
-    def calculate_caloric_needs(weight_kg: float, height_cm: float, age: int, gender: str,
+    def estimate_vo2_max_batch(age: np.ndarray, resting_hr: np.ndarray, male: np.ndarray,
+                               activity_multiplier=1.0) -> np.ndarray:
+        """
+        estimate_vo2_max for a cohort; male is a boolean mask, activity_multiplier a scalar or array
+        (a Gender array gives the mask as genders == Gender.MALE)
+
+        Map activity levels with VO2_ACTIVITY_MULTIPLIERS to build the multiplier array
+        """
+        vo2 = _evaluate(
+            "15.3 * (220 - age) / resting_hr * where(male, 1.0, 0.85) * multiplier",
+            age=np.asarray(age, dtype=float), resting_hr=np.asarray(resting_hr, dtype=float),
+            male=np.asarray(male, dtype=bool), multiplier=np.asarray(activity_multiplier, dtype=float)
+        )
+        return np.round(vo2, 1)
+
+    @staticmethod
+    def calculate_bmr_batch(weight_kg: np.ndarray, height_cm: np.ndarray, age: np.ndarray,
+                            male: np.ndarray) -> np.ndarray:
+        """
+        Mifflin-St Jeor BMR for a cohort in one fused pass; male is a boolean mask
+        """
+        return _evaluate(
+            "10 * weight + 6.25 * height - 5 * age + where(male, 5.0, -161.0)",
+            weight=np.asarray(weight_kg, dtype=float), height=np.asarray(height_cm, dtype=float),
+            age=np.asarray(age, dtype=float), male=np.asarray(male, dtype=bool)
+        )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=PROFILE_CACHE_SIZE)
+    def calculate_caloric_needs(weight_kg: float, height_cm: float, age: int, gender: Union[str, Gender],
                                activity_level: str, goal: str = "maintain") -> Dict:
         """
         Calculate daily caloric needs using Mifflin-St Jeor equation
@@ -175,41 +376,32 @@ class HealthCalculator:
         Returns BMR, TDEE, and goal-adjusted calories
         """
         # Basal Metabolic Rate (BMR) calculation
-        if gender.lower() == "male":
+        if Gender.parse(gender) is Gender.MALE:
             bmr = (10 * weight_kg) + (6.25 * height_cm) - (5 * age) + 5
         else:  # female
             bmr = (10 * weight_kg) + (6.25 * height_cm) - (5 * age) - 161
 
-        # Activity multipliers for TDEE
-        activity_multipliers = {
-            "sedentary": 1.2,
-            "lightly_active": 1.375,
-            "moderately_active": 1.55,
-            "very_active": 1.725,
-            "extremely_active": 1.9
-        }
-
-        tdee = bmr * activity_multipliers.get(activity_level, 1.55)
+        tdee = bmr * TDEE_ACTIVITY_MULTIPLIERS.get(activity_level, 1.55)
+        goal_calories = tdee + GOAL_CALORIE_ADJUSTMENTS.get(goal, 0)
 
-        # Goal adjustments
-        goal_adjustments = {
-            "lose_weight": -500,  # 1 lb per week deficit
-            "lose_weight_fast": -750,
-            "maintain": 0,
-            "gain_weight": 300,
-            "gain_muscle": 200
-        }
+        # Macros stay unrounded so carbs are derived from exact protein and fat calories
+        protein_g = weight_kg * 1.6  # 1.6g per kg
+        fat_g = goal_calories * 0.25 / 9  # 25% of calories
+        carbs_g = (goal_calories - protein_g * 4 - fat_g * 9) / 4
 
-        goal_calories = tdee + goal_adjustments.get(goal, 0)
+        # Everything is rounded once, at the output
+        bmr, tdee, goal_calories, protein_g, fat_g, carbs_g = np.rint(
+            [bmr, tdee, goal_calories, protein_g, fat_g, carbs_g]
+        ).astype(int).tolist()
 
         return {
-            "bmr": round(bmr),
-            "tdee": round(tdee),
-            "goal_calories": round(goal_calories),
+            "bmr": bmr,
+            "tdee": tdee,
+            "goal_calories": goal_calories,
             "macros": {
-                "protein_g": round(weight_kg * 1.6),  # 1.6g per kg
-                "fat_g": round(goal_calories * 0.25 / 9),  # 25% of calories
-                "carbs_g": round((goal_calories - (weight_kg * 1.6 * 4) - (goal_calories * 0.25)) / 4)
+                "protein_g": protein_g,
+                "fat_g": fat_g,
+                "carbs_g": carbs_g
             }
         }
 
@@ -231,4 +423,16 @@ class HealthCalculator:
 
         total_recovery = base_recovery * age_factor * fitness_factor
 
-        return max(12, min(72, round(total_recovery)))  # Between 12-72 hours
\ No newline at end of file
+        return max(12, min(72, round(total_recovery)))  # Between 12-72 hours
+
+    @staticmethod
+    def assess_recovery_time_batch(training_loads: np.ndarray, fitness_level, age) -> np.ndarray:
+        """
+        assess_recovery_time for many training loads at once
+
+        fitness_level and age may be scalars or arrays matching training_loads
+        """
+        age_factor = 1 + (np.asarray(age, dtype=float) - 25) * 0.01
+        fitness_factor = np.maximum(0.7, 1.2 - np.asarray(fitness_level, dtype=float) / 100)
+        total_recovery = np.asarray(training_loads, dtype=float) * 0.5 * age_factor * fitness_factor
+        return np.clip(np.rint(total_recovery), 12, 72).astype(int)
\ No newline at end of file
@@ -0,0 +1,192 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+try:
+    from numba import njit
+except ImportError:
+    # Fall back to plain Python/NumPy when numba is not installed
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Compact storage types for raw per-second sensor streams. Heart rate (0-250)
+# and stress (0-100) fit in int16; kernels widen locally when they need range.
+SENSOR_DTYPES = {
+    "heart_rate": np.int16,
+    "stress": np.int16,
+    "gps_deltas": np.float32
+}
+
+# Physiologically plausible bounds used to flag corrupted samples
+SENSOR_RANGES = {
+    "heart_rate": (25, 250),
+    "stress": (0, 100)
+}
+
+# Plausible bounds for HealthMetrics daily columns
+DAILY_METRIC_RANGES = {
+    "steps": (0, 100000),
+    "resting_hr": (30, 220),
+    "hrv": (5, 300),
+    "stress": (0, 100),
+    "sleep_seconds": (0, 86400)
+}
+
+def compact_sensor_streams(raw_data: Dict) -> Dict[str, np.ndarray]:
+    """
+    Convert known sensor streams to compact NumPy arrays at ingest
+    """
+    return {
+        name: np.asarray(raw_data[name], dtype=dtype)
+        for name, dtype in SENSOR_DTYPES.items()
+        if raw_data.get(name) is not None
+    }
+
+@njit(cache=True, fastmath=True)
+def rolling_features(values, window, threshold):
+    """
+    Trailing rolling baseline, z-scores and anomaly mask in a single pass
+
+    Running sums are carried through one loop over the samples instead of
+    separate passes for the mean, the deviation and the anomaly test, which
+    keeps long 1 Hz series streaming through memory once.
+    """
+    n = values.shape[0]
+    baseline = np.empty(n, dtype=np.float64)
+    z_scores = np.empty(n, dtype=np.float64)
+    anomalies = np.empty(n, dtype=np.bool_)
+
+    total = 0.0
+    total_sq = 0.0
+    for i in range(n):
+        x = float(values[i])
+        total += x
+        total_sq += x * x
+        if i >= window:
+            old = float(values[i - window])
+            total -= old
+            total_sq -= old * old
+
+        count = min(i + 1, window)
+        mean = total / count
+        var = max(total_sq / count - mean * mean, 0.0)
+        std = np.sqrt(var)
+
+        baseline[i] = mean
+        z_scores[i] = (x - mean) / std if std > 0 else 0.0
+        anomalies[i] = abs(z_scores[i]) > threshold
+
+    return baseline, z_scores, anomalies
+
+def zone_distribution(heart_rate, zone_floors: List[int]) -> np.ndarray:
+    """
+    Count heart rate samples per zone in one vectorized bincount
+
+    `zone_floors` holds the lower bound of each zone in ascending order;
+    bucket 0 collects samples below the first zone.
+    """
+    samples = np.asarray(heart_rate)
+    floors = np.asarray(zone_floors)
+    bins = np.searchsorted(floors, samples, side="right")
+    return np.bincount(bins, minlength=len(floors) + 1)
+
+@dataclass
+class MetricSeries:
+    """
+    Column-oriented (structure-of-arrays) time series for a single metric.
+
+    Samples are stored as contiguous NumPy arrays instead of lists of
+    records, so baselines, deviations and trends are computed with
+    vectorized operations rather than Python loops. Only the resulting
+    summary is passed on to the LLM, which also keeps prompts small.
+    """
+
+    ts: np.ndarray  # int64 unix timestamps (seconds)
+    values: np.ndarray  # float32 metric values
+
+    @classmethod
+    def from_records(cls, records: Sequence, field: str) -> "MetricSeries":
+        """
+        Build a series from records exposing `ts` and the given value field
+        """
+        count = len(records)
+        ts = np.fromiter((r.ts for r in records), dtype=np.int64, count=count)
+        values = np.fromiter((getattr(r, field) for r in records), dtype=np.float32, count=count)
+        order = np.argsort(ts, kind="stable")
+        return cls(ts=ts[order], values=values[order])
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def summarize(self, window: int = 7) -> Dict:
+        """
+        Baseline, latest deviation and trend computed in a few vectorized passes
+        """
+        if len(self) == 0:
+            return {"samples": 0}
+
+        baseline, z_scores, anomalies = rolling_features(self.values, window, 2.0)
+
+        # Slope per day of a least-squares fit over the whole period
+        days = (self.ts - self.ts[0]) / 86400.0
+        slope = float(np.polyfit(days, self.values, 1)[0]) if len(self) >= 2 and days[-1] > 0 else 0.0
+
+        return {
+            "samples": len(self),
+            "latest": round(float(self.values[-1]), 1),
+            "baseline": round(float(baseline[-1]), 1),
+            "latest_z_score": round(float(z_scores[-1]), 2),
+            "min": round(float(self.values.min()), 1),
+            "max": round(float(self.values.max()), 1),
+            "trend_per_day": round(slope, 3),
+            "outlier_count": int(np.count_nonzero(anomalies))
+        }
+
+def _by_date(records: Sequence[Dict], field: str) -> Dict[str, float]:
+    return {r["calendarDate"]: r[field] for r in records if r.get("calendarDate") and r.get(field) is not None}
+
+@dataclass
+class HealthMetrics:
+    """
+    Daily Garmin health metrics as one NumPy column per metric.
+
+    Rows are calendar days in ascending order, aligned across columns.
+    Days without a reading hold NaN (0 for steps), so consumers can take
+    baselines and trends over whole columns without walking per-day dicts.
+    """
+
+    dates: np.ndarray  # datetime64[D]
+    steps: np.ndarray  # int32
+    resting_hr: np.ndarray  # float32 bpm
+    hrv: np.ndarray  # float32 nightly average RMSSD (ms)
+    stress: np.ndarray  # float32 average stress level (0-100)
+    sleep_seconds: np.ndarray  # float32
+
+    @classmethod
+    def from_garmin(cls, daily_summaries: Sequence[Dict], hrv: Optional[Sequence[Dict]] = None,
+                    sleep: Optional[Sequence[Dict]] = None) -> "HealthMetrics":
+        """
+        Build the columns from Garmin Health API dailies, HRV and sleep summaries
+        """
+        days = sorted({d["calendarDate"] for d in daily_summaries if d.get("calendarDate")})
+        count = len(days)
+        dailies = {d["calendarDate"]: d for d in daily_summaries if d.get("calendarDate")}
+        hrv_by_day = _by_date(hrv or [], "lastNightAvg")
+        sleep_by_day = _by_date(sleep or [], "durationInSeconds")
+
+        def column(values, dtype=np.float32):
+            return np.fromiter((np.nan if v is None else v for v in values), dtype=dtype, count=count)
+
+        return cls(
+            dates=np.array(days, dtype="datetime64[D]"),
+            steps=column((dailies[d].get("steps") or 0 for d in days), np.int32),
+            resting_hr=column(dailies[d].get("restingHeartRateInBeatsPerMinute") for d in days),
+            hrv=column(hrv_by_day.get(d) for d in days),
+            stress=column(dailies[d].get("averageStressLevel") for d in days),
+            sleep_seconds=column(sleep_by_day.get(d) for d in days)
+        )
+
+    def __len__(self) -> int:
+        return self.dates.shape[0]
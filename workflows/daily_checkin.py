@@ -1,10 +1,10 @@
-from agno.workflow import Workflow, Step
+from typing import Optional
+
+from agno.workflow import Workflow, Step, Parallel
 from agno.models.openai import OpenAIChat
 
 from teams.analysis_team import AnalysisTeam
-from agents.specialized.data_sync import DataSyncAgent
-from agents.specialized.health_analyzer import HealthAnalyzerAgent
-from agents.specialized.recovery import RecoveryAgent
+from agents.core.agent_registry import AgentRegistry
 
 class DailyCheckinWorkflow:
     """
@@ -19,6 +19,7 @@ class DailyCheckinWorkflow:
     1. Data Synchronization: Get latest device data
     2. Health Analysis: Evaluate wellness metrics
     3. Recovery Assessment: Determine readiness for training
+       (runs concurrently with step 2; both only need the synced data)
     4. Recommendation Generation: Provide daily guidance
     5. Alert Processing: Flag any health concerns
 
@@ -36,11 +37,12 @@ class DailyCheckinWorkflow:
     - Progress towards goals summary
     """
 
-    def __init__(self, knowledge_base=None):
-        self.analysis_team = AnalysisTeam(knowledge_base)
-        self.data_sync = DataSyncAgent()
-        self.health_analyzer = HealthAnalyzerAgent()
-        self.recovery = RecoveryAgent()
+    def __init__(self, knowledge_base=None, registry: Optional[AgentRegistry] = None):
+        registry = registry or AgentRegistry.build(knowledge_base)
+        self.analysis_team = AnalysisTeam(knowledge_base, registry)
+        self.data_sync = registry.data_sync
+        self.health_analyzer = registry.health_analyzer
+        self.recovery = registry.recovery
 
         # Define workflow steps
         self.sync_data_step = Step(
@@ -103,8 +105,13 @@ class DailyCheckinWorkflow:
             description="Automated daily analysis and recommendation workflow",
             steps=[
                 self.sync_data_step,
-                self.analyze_health_step,
-                self.assess_recovery_step,
+                # Health and recovery both read only the sync output, so their
+                # model calls overlap and the summary joins on both results
+                Parallel(
+                    self.analyze_health_step,
+                    self.assess_recovery_step,
+                    name="health_and_recovery"
+                ),
                 self.summary_step
             ],
             add_datetime_to_context=True
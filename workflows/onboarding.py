@@ -1,4 +1,4 @@
-from agno.workflow import Workflow, Step, Condition, Loop
+from agno.workflow import Workflow, Step, Steps, Condition, Loop, Parallel
 from agno.models.openai import OpenAIChat
 
 from agents.specialized.onboarding import OnboardingAgent
@@ -20,7 +20,7 @@ class OnboardingWorkflow:
     1. Welcome and Introduction
     2. Health & Fitness Assessment
     3. Goal Setting and Prioritization
-    4. Device Setup and Data Integration
+    4. Device Setup and Data Integration (runs alongside 3 and 5)
     5. Initial Plan Creation
     6. System Orientation and Next Steps
 
@@ -148,9 +148,13 @@ class OnboardingWorkflow:
             steps=[
                 self.welcome_step,
                 self.assessment_loop,
-                self.goal_setting_step,
-                self.device_setup_step,
-                self.create_plan_step,
+                # Device pairing needs only the profile, so it overlaps the
+                # goals -> plan chain; follow-up joins on both branches
+                Parallel(
+                    self.device_setup_step,
+                    Steps(name="goals_and_plan", steps=[self.goal_setting_step, self.create_plan_step]),
+                    name="setup_and_planning"
+                ),
                 self.follow_up_step
             ],
             add_datetime_to_context=True